@@ -0,0 +1,189 @@
+import math
+import random
+import threading
+
+from evaluation import MAX_SCORE
+from question_bank import DEFAULT_DIFFICULTY, MAX_DIFFICULTY, MIN_DIFFICULTY
+
+# How far one turn moves the ability estimate, in difficulty levels, at most
+ABILITY_STEP = 1.5
+# Steepness of the expected score curve around ability == difficulty
+SCORE_SLOPE = 1.2
+# Past sessions on the track used for the starting estimate
+PRIOR_SESSIONS = 5
+# Random draws per difficulty level before scanning it for an unasked question
+MAX_DRAWS_PER_LEVEL = 8
+
+
+def expected_score(ability, difficulty):
+    """
+    Score a candidate of the given ability is expected to get on a question.
+
+    Args:
+        ability (float): Ability on the difficulty scale
+        difficulty (int): Question difficulty
+
+    Returns:
+        float: Expected score, 0 to MAX_SCORE; MAX_SCORE / 2 when they are equal
+    """
+    return MAX_SCORE / (1 + math.exp(-SCORE_SLOPE * (ability - difficulty)))
+
+
+def ability_from_score(score):
+    """Map an overall 0-10 score onto the difficulty scale."""
+    return MIN_DIFFICULTY + (MAX_DIFFICULTY - MIN_DIFFICULTY) * min(max(score, 0), MAX_SCORE) / MAX_SCORE
+
+
+class AdaptiveQuestionPicker:
+    """
+    Chooses each next question to match the candidate's running ability estimate.
+
+    The estimate starts from the candidate's past sessions on the track and
+    moves after every scored turn, Elo style: up when a score beats what was
+    expected at that question's difficulty, down when it falls short. The
+    next question comes from the difficulty closest to the estimate, drawn
+    from the bank's per-difficulty postings and skipping questions the
+    candidate was already given, so a choice costs a few dictionary lookups
+    however large the bank is. No model is called.
+
+    Scores arrive from background evaluation, so a choice uses the turns
+    scored so far; a turn still being scored counts once its score lands.
+    """
+
+    def __init__(self, bank, track, length, ability=DEFAULT_DIFFICULTY, exclude=(), username=None, store=None,
+                 rng=None):
+        """
+        Initialize the picker.
+
+        Args:
+            bank (QuestionBank): Bank to choose from
+            track (str): Interview track
+            length (int): Questions in the interview
+            ability (float): Starting ability estimate on the difficulty scale
+            exclude (iterable, optional): Question ids to avoid, e.g. asked in earlier interviews
+            username (str, optional): Candidate whose asked questions are recorded in the store
+            store (SessionStore, optional): Where asked questions are recorded
+            rng (random.Random, optional): Source of randomness
+        """
+        self.bank = bank
+        self.track = track
+        self.length = length
+        self.ability = float(ability)
+        self.username = username
+        self.store = store
+        self.rng = rng or random.Random()
+        self.history = []
+        self._exclude = set(exclude)
+        self._chosen = {}
+        self._observed = set()
+        # Turns before this one in the transcript are all observed
+        self._settled = 0
+        self._exhausted = set()
+        self._lock = threading.Lock()
+        # Index the track now, not between turns
+        self._index = bank.index(track)
+
+    @classmethod
+    def for_candidate(cls, bank, track, length, username, store, rng=None):
+        """
+        Create a picker seeded with the candidate's history from the session store.
+
+        The starting estimate is the mean overall score of the candidate's
+        last few sessions on the track, and questions they were already
+        given are avoided.
+
+        Returns:
+            AdaptiveQuestionPicker: The picker
+        """
+        sessions, _ = store.list_sessions(username=username, track=track, limit=PRIOR_SESSIONS)
+        scores = [session["overall_score"] for session in sessions if session["overall_score"] is not None]
+        ability = ability_from_score(sum(scores) / len(scores)) if scores else DEFAULT_DIFFICULTY
+        return cls(bank, track, length, ability, store.asked_questions(username, track), username, store, rng)
+
+    @property
+    def target_difficulty(self):
+        return min(max(int(round(self.ability)), MIN_DIFFICULTY), MAX_DIFFICULTY)
+
+    def observe(self, question, score):
+        """
+        Update the ability estimate with one scored question.
+
+        Args:
+            question (Question): The question that was asked
+            score (int): Its score, 0 to MAX_SCORE
+        """
+        expected = expected_score(self.ability, question.difficulty)
+        self.ability += ABILITY_STEP * (score - expected) / MAX_SCORE
+        self.ability = min(max(self.ability, MIN_DIFFICULTY), MAX_DIFFICULTY)
+        self.history.append((question.id, question.difficulty, score, self.ability))
+
+    def update(self, transcript):
+        """Observe the scores of turns that were scored since the last update."""
+        settled = True
+        for entry in transcript[self._settled:]:
+            if entry.question_id not in self._observed:
+                if entry.is_scored and entry.question in self._chosen:
+                    self._observed.add(entry.question_id)
+                    self.observe(self._chosen[entry.question], entry.score)
+                elif entry.question in self._chosen:
+                    # Still being scored; look again next time
+                    settled = False
+            if settled:
+                self._settled += 1
+
+    def _draw(self, level):
+        postings = self._index.by_difficulty.get(level)
+        if not postings or level in self._exhausted:
+            return None
+        ids = self._index.ids
+        for _ in range(MAX_DRAWS_PER_LEVEL):
+            question_id = ids[postings[self.rng.randrange(len(postings))]]
+            if question_id not in self._exclude:
+                return question_id
+        # Mostly asked: walk on from a random position to the next unasked question
+        start = self.rng.randrange(len(postings))
+        for offset in range(len(postings)):
+            question_id = ids[postings[(start + offset) % len(postings)]]
+            if question_id not in self._exclude:
+                return question_id
+        self._exhausted.add(level)
+        return None
+
+    def _levels(self):
+        # Target difficulty first, then alternately one easier and one harder, moving outwards
+        target = self.target_difficulty
+        yield target
+        for distance in range(1, MAX_DIFFICULTY - MIN_DIFFICULTY + 1):
+            for level in (target - distance, target + distance):
+                if MIN_DIFFICULTY <= level <= MAX_DIFFICULTY:
+                    yield level
+
+    def next_question(self, transcript=()):
+        """
+        Choose the next question.
+
+        Args:
+            transcript (list, optional): The interview's TranscriptEntry objects so far
+
+        Returns:
+            Question: The question, at the difficulty nearest the ability estimate
+                with an unasked question left; a repeat only once the track is exhausted
+        """
+        with self._lock:
+            self.update(transcript)
+            question_id = None
+            for level in self._levels():
+                question_id = self._draw(level)
+                if question_id is not None:
+                    break
+            if question_id is None:
+                # Every question was asked before; repeat one, but not within this interview
+                chosen = {question.id for question in self._chosen.values()}
+                repeats = [question_id for question_id in self._index.ids if question_id not in chosen]
+                question_id = self.rng.choice(repeats or self._index.ids)
+            question = self.bank.get(question_id)
+            self._exclude.add(question.id)
+            self._chosen[question.text] = question
+        if self.store is not None and self.username is not None:
+            self.store.record_asked(self.username, self.track, [question.id])
+        return question
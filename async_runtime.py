@@ -0,0 +1,111 @@
+import asyncio
+import threading
+
+_shared_loop = None
+_loop_lock = threading.Lock()
+_STREAM_DONE = object()
+
+
+def get_shared_loop():
+    """
+    Get the process-wide event loop, starting it on a daemon thread on first use.
+
+    Async provider clients and their connection pools are bound to this loop,
+    so every Streamlit session shares them regardless of which loop it awaits from.
+
+    Returns:
+        asyncio.AbstractEventLoop: The shared event loop
+    """
+    global _shared_loop
+    with _loop_lock:
+        if _shared_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="shared-event-loop", daemon=True).start()
+            _shared_loop = loop
+        return _shared_loop
+
+
+def _current_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+async def run_on_shared_loop(coro):
+    """
+    Await a coroutine on the shared loop from any event loop.
+
+    Cancelling the caller cancels the coroutine on the shared loop as well.
+
+    Args:
+        coro (coroutine): Coroutine to run
+
+    Returns:
+        object: The coroutine's result
+    """
+    loop = get_shared_loop()
+    if _current_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def run_sync(coro):
+    """
+    Run a coroutine on the shared loop and block until it finishes.
+
+    Args:
+        coro (coroutine): Coroutine to run
+
+    Returns:
+        object: The coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_shared_loop()).result()
+
+
+async def iter_on_shared_loop(agen):
+    """
+    Iterate an async generator on the shared loop, relaying items to the caller's loop.
+
+    Args:
+        agen (async generator): Source generator, e.g. a model response stream
+
+    Yields:
+        object: Items produced by the source generator
+    """
+    loop = get_shared_loop()
+    caller_loop = _current_loop()
+    if caller_loop is loop:
+        async for item in agen:
+            yield item
+        return
+
+    items = asyncio.Queue()
+
+    def relay(item, error=None):
+        try:
+            caller_loop.call_soon_threadsafe(items.put_nowait, (item, error))
+        except RuntimeError:
+            # The caller's loop has already been closed
+            pass
+
+    async def pump():
+        try:
+            async for item in agen:
+                relay(item)
+        except Exception as e:
+            relay(_STREAM_DONE, e)
+        else:
+            relay(_STREAM_DONE)
+
+    future = asyncio.run_coroutine_threadsafe(pump(), loop)
+    try:
+        while True:
+            item, error = await items.get()
+            if error is not None:
+                raise error
+            if item is _STREAM_DONE:
+                return
+            yield item
+    finally:
+        future.cancel()
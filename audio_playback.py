@@ -0,0 +1,157 @@
+import queue
+import threading
+from concurrent.futures import Future
+from io import BytesIO
+
+
+class AudioPlaybackService:
+    """
+    Plays queued utterances through a single, long-lived pygame mixer.
+
+    The mixer is initialized once by a worker thread. Utterances are decoded
+    from in-memory buffers and played in order. Each call to enqueue returns
+    a Future that completes when its utterance has finished, so callers wait
+    on an event instead of polling the mixer.
+
+    Utterances are tagged with the session that queued them. One mixer serves
+    every session in the process, so stop() takes a session and only cancels
+    that session's utterances.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._interrupt = threading.Event()
+        self._worker = None
+        self._lock = threading.Lock()
+        # Session key to the futures of its queued utterances, and the session now playing
+        self._pending = {}
+        self._playing = None
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="audio-playback", daemon=True)
+                self._worker.start()
+
+    def enqueue(self, audio, session=None):
+        """
+        Queue an utterance for playback.
+
+        Args:
+            audio (bytes or str): Encoded audio (MP3 or WAV), or the path of an audio file
+            session (str, optional): Key of the session queuing it, for stop()
+
+        Returns:
+            Future: Resolves when playback ends; raises if the audio could not be played
+        """
+        self._ensure_worker()
+        played = Future()
+        with self._lock:
+            self._pending.setdefault(session, set()).add(played)
+        played.add_done_callback(lambda future: self._forget(session, future))
+        self._queue.put((audio, played, session))
+        return played
+
+    def _forget(self, session, played):
+        with self._lock:
+            pending = self._pending.get(session)
+            if pending is not None:
+                pending.discard(played)
+                if not pending:
+                    del self._pending[session]
+
+    def play(self, audio, timeout=None, session=None):
+        """
+        Play an utterance and block until it has finished.
+
+        Args:
+            audio (bytes or str): Encoded audio (MP3 or WAV), or the path of an audio file
+            timeout (float, optional): Maximum seconds to wait
+            session (str, optional): Key of the session playing it, for stop()
+        """
+        self.enqueue(audio, session).result(timeout)
+
+    def stop(self, session=None):
+        """
+        Stop a session's current utterance and drop its queued ones.
+
+        Args:
+            session (str, optional): Session key given to enqueue; None stops every session
+        """
+        with self._lock:
+            if session is None:
+                pending = [played for futures in self._pending.values() for played in futures]
+            else:
+                pending = list(self._pending.get(session, ()))
+            interrupt = session is None or self._playing == session
+        # Cancelled entries stay queued and are skipped by the worker
+        for played in pending:
+            played.cancel()
+        if interrupt:
+            self._interrupt.set()
+
+    def _run(self):
+        import pygame
+
+        pygame.mixer.init()
+        try:
+            while True:
+                audio, played, session = self._queue.get()
+                if audio is None:
+                    return
+                # Cleared before the cancel check: a stop() after it either cancels this utterance or interrupts it
+                self._interrupt.clear()
+                # Under the lock, so stop() sees this utterance either still cancellable or playing
+                with self._lock:
+                    if not played.set_running_or_notify_cancel():
+                        continue
+                    self._playing = session
+                try:
+                    self._play_one(pygame, audio)
+                except Exception as e:
+                    played.set_exception(e)
+                else:
+                    played.set_result(None)
+                finally:
+                    with self._lock:
+                        self._playing = None
+        finally:
+            pygame.mixer.quit()
+
+    def _play_one(self, pygame, audio):
+        if isinstance(audio, (bytes, bytearray, memoryview)):
+            audio = BytesIO(audio)
+        sound = pygame.mixer.Sound(file=audio)
+        channel = sound.play()
+        # Wake up when the utterance ends or stop() is called, without polling
+        if self._interrupt.wait(sound.get_length()):
+            channel.stop()
+
+    def close(self):
+        """Stop playback and shut down the mixer."""
+        self.stop()
+        with self._lock:
+            worker = self._worker
+        if worker is not None and worker.is_alive():
+            self._queue.put((None, None, None))
+            worker.join()
+
+
+_playback_service = None
+_playback_service_lock = threading.Lock()
+
+
+def get_playback_service():
+    """
+    Get the process-wide playback service.
+
+    pygame's mixer is global to the process, so a single service owns it.
+
+    Returns:
+        AudioPlaybackService: The shared playback service
+    """
+    global _playback_service
+    with _playback_service_lock:
+        if _playback_service is None:
+            _playback_service = AudioPlaybackService()
+        return _playback_service
@@ -0,0 +1,206 @@
+"""
+Headless batch evaluation of completed interview transcripts.
+
+Input is a JSONL file with one interview per line:
+
+    {"id": "candidate-42", "transcript": [{"question_id": 1, "question": "...", "answer": "...",
+                                           "followup": "...", "followup_answer": "..."}]}
+
+Transcript items may also be blocks in the legacy text format
+("Q1: ...\\n🗨 You: ...\\n🔄 Follow-Up: ...\\n🗨 You: ...").
+
+An optional "model" field overrides the evaluator for that interview.
+Results are appended to the output JSONL as soon as each evaluation
+finishes; rerunning with the same output file skips interviews that
+already have a result, so a killed run resumes where it stopped.
+
+Usage:
+    python batch_evaluate.py transcripts.jsonl results.jsonl --model Gemini --concurrency 16 --rate 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from dotenv import load_dotenv
+
+from evaluation import aevaluate_transcript
+from model_interface import initialize_models
+from rate_limit import TokenBucket
+from transcript import load_transcript
+
+
+def load_completed_ids(output_path):
+    """
+    Read ids that already have a successful result.
+
+    A partially written last line (from a killed run) is ignored.
+
+    Args:
+        output_path (str): Output JSONL path
+
+    Returns:
+        set: Completed interview ids
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "error" not in result:
+                completed.add(result["id"])
+    return completed
+
+
+def iter_interviews(input_path, completed):
+    """
+    Stream interviews from the input file, skipping completed ones.
+
+    A line that is not a JSON object is yielded as a record with an "error"
+    instead of stopping the run, so it is reported in the output.
+
+    Yields:
+        dict: Interview records with "id" and "transcript", or "id" and "error"
+    """
+    with open(input_path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                interview = json.loads(line)
+            except json.JSONDecodeError as e:
+                interview = {"id": str(line_number), "error": f"Invalid JSON on line {line_number}: {e}"}
+            if not isinstance(interview, dict):
+                interview = {"id": str(line_number), "error": f"Line {line_number} is not a JSON object"}
+            interview.setdefault("id", str(line_number))
+            if interview["id"] not in completed:
+                yield interview
+
+
+class BatchEvaluator:
+    """Evaluates interviews with bounded concurrency and per-model rate limits."""
+
+    def __init__(self, registry, model_name=None, concurrency=8, rate=None, hedge_delay=None):
+        """
+        Initialize the evaluator.
+
+        Args:
+            registry (ModelRegistry): Registry providing the evaluator models
+            model_name (str, optional): Default evaluator, defaults to the registry's default model
+            concurrency (int): Maximum evaluations in flight
+            rate (float, optional): Maximum requests per second for each model
+            hedge_delay (float, optional): Seconds after which each evaluation is also sent to the
+                next model of the evaluator's tier; None disables hedging
+        """
+        self.registry = registry
+        self.model_name = model_name or registry.default_model
+        self.concurrency = concurrency
+        self.rate = rate
+        self.hedge_delay = hedge_delay
+        self._limiters = {}
+
+    def _get_limiter(self, model_name):
+        if self.rate is None:
+            return None
+        if model_name not in self._limiters:
+            self._limiters[model_name] = TokenBucket(self.rate)
+        return self._limiters[model_name]
+
+    async def evaluate(self, interview):
+        """
+        Evaluate one interview.
+
+        Returns:
+            dict: Result record for the output file
+        """
+        model_name = interview.get("model") or self.model_name
+        if "error" in interview:
+            # Unreadable input line; recorded as failed without calling a model
+            return {"id": interview["id"], "error": interview["error"], "latency": 0.0}
+        start = time.perf_counter()
+        try:
+            limiter = self._get_limiter(model_name)
+            if limiter is not None:
+                await limiter.acquire_async()
+            transcript = load_transcript(interview["transcript"])
+            model = self.registry.get_model(model_name)
+            if self.hedge_delay is not None:
+                model = self.registry.hedged(model_name, self.hedge_delay)
+            evaluation, scores = await aevaluate_transcript(model, transcript)
+            return {"id": interview["id"], "model": model_name, "evaluation": evaluation, "scores": scores,
+                    "feedback": [entry.feedback for entry in transcript], "latency": time.perf_counter() - start}
+        except Exception as e:
+            return {"id": interview["id"], "model": model_name, "error": str(e),
+                    "latency": time.perf_counter() - start}
+
+    async def run(self, interviews, output_file):
+        """
+        Evaluate interviews, writing each result as soon as it is ready.
+
+        Only `concurrency` interviews are read ahead, so memory stays flat
+        regardless of the input size.
+
+        Args:
+            interviews (iterable): Interview records
+            output_file (file): Open text file the JSONL results are appended to
+
+        Returns:
+            dict: Counts of succeeded and failed evaluations
+        """
+        counts = {"succeeded": 0, "failed": 0}
+        queue = asyncio.Queue(maxsize=self.concurrency)
+
+        async def worker():
+            while True:
+                interview = await queue.get()
+                if interview is None:
+                    return
+                result = await self.evaluate(interview)
+                output_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output_file.flush()
+                counts["failed" if "error" in result else "succeeded"] += 1
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        for interview in interviews:
+            await queue.put(interview)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+        return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate completed interview transcripts in bulk.")
+    parser.add_argument("input", help="Input JSONL with one interview per line")
+    parser.add_argument("output", help="Output JSONL; existing results are kept and skipped")
+    parser.add_argument("--model", help="Evaluator model name (e.g. GPT-4, Gemini)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum evaluations in flight")
+    parser.add_argument("--rate", type=float, help="Maximum requests per second for each model")
+    parser.add_argument("--hedge-delay", type=float,
+                        help="Also ask the next model of the same tier after this many seconds")
+    args = parser.parse_args()
+
+    load_dotenv()
+    evaluator = BatchEvaluator(initialize_models(), args.model, args.concurrency, args.rate, args.hedge_delay)
+    completed = load_completed_ids(args.output)
+
+    start = time.perf_counter()
+    with open(args.output, "a+", encoding="utf-8") as output_file:
+        # Terminate a line left half-written by a killed run
+        if output_file.tell() > 0:
+            output_file.seek(output_file.tell() - 1)
+            if output_file.read(1) != "\n":
+                output_file.write("\n")
+        counts = asyncio.run(evaluator.run(iter_interviews(args.input, completed), output_file))
+    elapsed = time.perf_counter() - start
+    print(f"Evaluated {counts['succeeded']} interviews ({counts['failed']} failed, "
+          f"{len(completed)} already done) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
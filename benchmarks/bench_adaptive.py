@@ -0,0 +1,149 @@
+"""
+Measure how long the adaptive picker takes to choose a question, and how well it tracks ability.
+
+Latency: next_question() over a large in-memory bank, for candidates with
+no history and with a long history of asked questions, compared with
+filtering the whole track for unasked questions at the target difficulty
+on every turn. The run fails if the picker's p99 reaches a millisecond.
+
+Tracking: simulated candidates of known ability answer long interviews,
+each score drawn around what their ability predicts. The table shows how
+far the picker's estimate ends up from the true ability.
+
+Built-in tracks: the run also fails if, on the questions shipped in
+interview_data.py, a top score on the first question does not lead to a
+harder second question than a zero.
+
+Usage:
+    python benchmarks/bench_adaptive.py --questions 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adaptive_difficulty import AdaptiveQuestionPicker, expected_score  # noqa: E402
+from evaluation import MAX_SCORE  # noqa: E402
+from interview_data import interview_tracks, question_difficulty  # noqa: E402
+from question_bank import MAX_DIFFICULTY, MIN_DIFFICULTY, MemoryQuestionBank, Question  # noqa: E402
+from transcript import TranscriptEntry  # noqa: E402
+
+TRACK = "Benchmark"
+
+
+def build_bank(questions, rng):
+    return MemoryQuestionBank(
+        Question(number, TRACK, f"Question {number}?", rng.randint(MIN_DIFFICULTY, MAX_DIFFICULTY))
+        for number in range(questions)
+    )
+
+
+def percentiles(latencies):
+    ordered = sorted(latencies)
+    return {pct: ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] for pct in (50, 99, 100)}
+
+
+def naive_next(bank, picker):
+    """Scan the whole track for an unasked question at the target difficulty."""
+    index = bank.index(TRACK)
+    matching = [question_id for position, question_id in enumerate(index.ids)
+                if index.difficulties[position] == picker.target_difficulty and question_id not in picker._exclude]
+    return bank.get(picker.rng.choice(matching))
+
+
+def bench_latency(bank, choose, asked, turns, rng):
+    """
+    Time one choice per turn, feeding back a random score after each.
+
+    Returns:
+        dict: Latency percentiles in seconds
+    """
+    picker = AdaptiveQuestionPicker(bank, TRACK, turns, exclude=asked, rng=random.Random(1))
+    transcript, latencies = [], []
+    for number in range(1, turns + 1):
+        start = time.perf_counter()
+        picker.update(transcript)
+        question = choose(picker)
+        latencies.append(time.perf_counter() - start)
+        picker._exclude.add(question.id)
+        picker._chosen[question.text] = question
+        transcript.append(TranscriptEntry(number, question.text, score=rng.randint(0, MAX_SCORE)))
+    return percentiles(latencies)
+
+
+def simulate(bank, ability, turns, rng):
+    """
+    Run one interview for a candidate of known ability.
+
+    Returns:
+        float: The picker's final ability estimate
+    """
+    picker = AdaptiveQuestionPicker(bank, TRACK, turns, rng=rng)
+    transcript = []
+    for number in range(1, turns + 1):
+        question = picker.next_question(transcript)
+        score = round(min(max(rng.gauss(expected_score(ability, question.difficulty), 1.5), 0), MAX_SCORE))
+        transcript.append(TranscriptEntry(number, question.text, score=score))
+    picker.update(transcript)
+    return picker.ability
+
+
+def second_question(bank, track, first_score):
+    """
+    Score the first question of an interview and choose the second.
+
+    Returns:
+        tuple: Difficulties of the first and second questions
+    """
+    picker = AdaptiveQuestionPicker(bank, track, 2, rng=random.Random(0))
+    first = picker.next_question()
+    second = picker.next_question([TranscriptEntry(1, first.text, score=first_score)])
+    return first.difficulty, second.difficulty
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=200000, help="Questions in the bank")
+    parser.add_argument("--turns", type=int, default=2000, help="Choices timed per scenario")
+    parser.add_argument("--interviews", type=int, default=200, help="Simulated interviews per ability")
+    parser.add_argument("--length", type=int, default=10, help="Questions per simulated interview")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    bank = build_bank(args.questions, rng)
+    start = time.perf_counter()
+    bank.index(TRACK)
+    print(f"indexed {args.questions} questions in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    all_ids = list(bank.index(TRACK).ids)
+    print(f"\n{'picker':<8} {'history':<16} {'p50 us':>9} {'p99 us':>9} {'max us':>9}")
+    for share in (0, 0.5, 0.9):
+        asked = set(rng.sample(all_ids, int(len(all_ids) * share)))
+        for label, choose, turns in (("adaptive", lambda picker: picker.next_question(), args.turns),
+                                     ("naive", lambda picker: naive_next(bank, picker), min(args.turns, 50))):
+            p = bench_latency(bank, choose, asked, turns, rng)
+            print(f"{label:<8} {f'{share:.0%} asked':<16} {p[50] * 1e6:9.1f} {p[99] * 1e6:9.1f} {p[100] * 1e6:9.1f}")
+            if label == "adaptive":
+                assert p[99] < 1e-3, "choosing a question took a millisecond or more"
+
+    builtin = MemoryQuestionBank.from_tracks(interview_tracks, difficulties=question_difficulty)
+    print(f"\n{'built-in track':<18} {'first':>5} {'after 0':>8} {f'after {MAX_SCORE}':>9}")
+    for track in builtin.tracks():
+        first, after_low = second_question(builtin, track, 0)
+        _, after_high = second_question(builtin, track, MAX_SCORE)
+        print(f"{track:<18} {first:5d} {after_low:8d} {after_high:9d}")
+        assert after_low < first < after_high, f"{track}: the second question ignores the first score"
+
+    print(f"\n{'true ability':>12} {'mean estimate':>14} {'mean abs error':>15}")
+    for ability in (1.5, 2.5, 3.0, 3.5, 4.5):
+        estimates = [simulate(bank, ability, args.length, rng) for _ in range(args.interviews)]
+        mean = sum(estimates) / len(estimates)
+        error = sum(abs(estimate - ability) for estimate in estimates) / len(estimates)
+        print(f"{ability:12.1f} {mean:14.2f} {error:15.2f}")
+
+
+if __name__ == "__main__":
+    main()
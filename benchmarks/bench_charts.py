@@ -0,0 +1,151 @@
+"""
+Check that repeated evaluations do not grow the server's memory.
+
+Runs many evaluations in one process and draws their charts two ways:
+"pyplot" is how the app drew them before (plt.subplots never closed, the
+gauge steps rebuilt with a colour function per step); "charts" uses the
+charts module (figures built off pyplot, colour ramp precomputed, output
+memoized on the scores). Each mode runs once with a fresh score vector per
+evaluation and once replaying a few vectors, as reruns of the same report do.
+
+Python heap growth comes from tracemalloc; resident set growth is Linux only.
+The run fails if the charts module leaves pyplot figures open or keeps
+growing after its cache is full.
+
+Usage:
+    python benchmarks/bench_charts.py --evaluations 200
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+# The pyplot mode leaks figures on purpose
+matplotlib.rcParams["figure.max_open_warning"] = 0
+
+import matplotlib.pyplot as plt  # noqa: E402
+import plotly.graph_objects as go  # noqa: E402
+
+import charts  # noqa: E402
+from bench_sessions import resident_bytes  # noqa: E402
+
+
+def pyplot_charts(scores):
+    """The app's previous chart code, minus the Streamlit calls."""
+    overall_score = sum(scores) / len(scores)
+
+    def get_color(value):
+        if value <= 5:
+            t = value / 5
+            r = 255
+            g = int(0 + 255 * t)
+            b = 0
+        else:
+            t = (value - 5) / 5
+            r = int(255 - 255 * t)
+            g = 255
+            b = 0
+        return f"#{r:02X}{g:02X}{b:02X}"
+
+    steps = []
+    delta = overall_score / 50
+    start_val = 0
+    while start_val < overall_score:
+        end_val = min(start_val + delta, overall_score)
+        steps.append({"range": [start_val, end_val], "color": get_color((start_val + end_val) / 2)})
+        start_val = end_val
+    steps.append({"range": [overall_score, 10], "color": "rgba(0,0,0,0)"})
+    go.Figure(go.Indicator(mode="gauge+number", value=overall_score, gauge={"steps": steps}))
+
+    fig, ax = plt.subplots(figsize=(5, 3))
+    ax.bar([f"Q{i + 1}" for i in range(len(scores))], scores, color="#8F00FF")
+    ax.set_ylim([0, 10])
+    plt.tight_layout()
+    # st.pyplot rendered the figure to PNG and left it open
+    fig.savefig(os.devnull, format="png")
+
+
+def module_charts(scores):
+    charts.gauge_figure(sum(scores) / len(scores))
+    charts.score_chart_png(tuple(scores))
+
+
+def score_vectors(evaluations, distinct, seed=0):
+    rng = random.Random(seed)
+    pool = [tuple(rng.randint(1, 10) for _ in range(3)) for _ in range(distinct)]
+    return [pool[i % distinct] for i in range(evaluations)]
+
+
+def measure(draw, vectors):
+    """
+    Draw charts for every score vector and report what stays allocated.
+
+    Returns:
+        tuple: (seconds per evaluation, heap bytes retained, resident bytes retained)
+    """
+    plt.close("all")
+    charts.gauge_figure.cache_clear()
+    charts.score_chart_png.cache_clear()
+    gc.collect()
+    rss_before = resident_bytes()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for scores in vectors:
+        draw(scores)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed / len(vectors), retained, resident_bytes() - rss_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--evaluations", type=int, default=200, help="Evaluations per run")
+    parser.add_argument("--repeated", type=int, default=5, help="Distinct score vectors in the rerun scenario")
+    args = parser.parse_args()
+
+    # More distinct vectors than the cache holds, so the bound is exercised
+    scenarios = {
+        "distinct": score_vectors(args.evaluations, args.evaluations),
+        "reruns": score_vectors(args.evaluations, args.repeated),
+    }
+    print(f"{'mode':<8} {'scenario':<9} {'ms/eval':>8} {'heap MiB':>9} {'RSS MiB':>8} {'open figs':>10}")
+    for mode, draw in (("pyplot", pyplot_charts), ("charts", module_charts)):
+        for scenario, vectors in scenarios.items():
+            per_eval, heap, rss = measure(draw, vectors)
+            open_figures = len(plt.get_fignums())
+            print(f"{mode:<8} {scenario:<9} {per_eval * 1000:8.2f} {heap / 2 ** 20:9.2f} {rss / 2 ** 20:8.1f} "
+                  f"{open_figures:10d}")
+            if mode == "charts":
+                assert open_figures == 0, "charts left pyplot figures open"
+    plt.close("all")
+
+    # Once the caches are full, more evaluations must not add memory
+    count = max(args.evaluations, charts.CHART_CACHE_SIZE) * 2
+    vectors = score_vectors(count, count, seed=1)
+    tracemalloc.start()
+    for scores in vectors[:charts.CHART_CACHE_SIZE]:
+        module_charts(scores)
+    gc.collect()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for scores in vectors[charts.CHART_CACHE_SIZE:]:
+        module_charts(scores)
+    gc.collect()
+    growth = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    print(f"charts growth past a full cache: {growth / 1024:.1f} KiB over "
+          f"{len(vectors) - charts.CHART_CACHE_SIZE} evaluations")
+    assert growth < 1024 * 1024, "chart memory keeps growing past the cache bound"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark per-call latency of GPT4Model with and without the shared client pool.
+
+A local stub HTTP server mimics the OpenAI chat completions endpoint, so the
+numbers reflect client construction and connection setup rather than model
+latency.
+
+Usage:
+    python benchmarks/bench_client_pool.py --calls 200
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_interface import GPT4Model, get_client_pool  # noqa: E402
+
+
+STUB_COMPLETION = {
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "Can you give an example from a recent project?"},
+        "finish_reason": "stop"
+    }],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20}
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every POST with a fixed chat completion over a keep-alive connection."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(STUB_COMPLETION).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server():
+    """
+    Start the stub server on a free local port.
+
+    Returns:
+        ThreadingHTTPServer: The running server
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def call_unpooled(prompt):
+    """Reproduce the previous behaviour: a fresh client for every call."""
+    from openai import OpenAI
+
+    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    response = client.chat.completions.create(
+        model="gpt-4",
+        messages=[
+            {"role": "system", "content": "You are a professional interviewer."},
+            {"role": "user", "content": prompt}
+        ]
+    )
+    client.close()
+    return response.choices[0].message.content.strip()
+
+
+def measure(fn, calls):
+    """
+    Time fn over a number of calls.
+
+    Returns:
+        list: Per-call latencies in milliseconds
+    """
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        fn(f"Answer number {i}")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(label, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<10} mean={statistics.mean(latencies):7.2f} ms  "
+          f"p50={statistics.median(latencies):7.2f} ms  p95={p95:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200, help="Calls per mode")
+    args = parser.parse_args()
+
+    server = start_stub_server()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "stub-key")
+
+    model = GPT4Model()
+    # Warm up imports so neither mode pays the one-off import cost
+    call_unpooled("warm-up")
+    model.generate_response("warm-up")
+
+    summarize("before", measure(call_unpooled, args.calls))
+    summarize("after", measure(model.generate_response, args.calls))
+    print("pool stats:", get_client_pool().get_stats())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
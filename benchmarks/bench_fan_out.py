@@ -0,0 +1,112 @@
+"""
+Measure scoring tail latency with and without hedged fan-out.
+
+BatchEvaluator scores one-question transcripts against stub models whose
+latency has a long tail: most calls are fast, a few stall. Three runs are
+compared:
+
+- single: every evaluation goes to the primary model only
+- hedged: after --hedge-delay seconds the evaluation is also sent to the
+  other model of the tier, and the first answer wins
+- fan-out: both models of the tier are asked at once
+
+A corporate-tier model is registered too; the run fails if any personal-tier
+fan-out reaches it, or if hedging does not lower p95 latency.
+
+Usage:
+    python benchmarks/bench_fan_out.py --interviews 400 --slow-rate 0.1
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_evaluate import BatchEvaluator  # noqa: E402
+from model_interface import AIModelInterface, ModelRegistry  # noqa: E402
+
+STUB_EVALUATION = '{"questions": [{"number": 1, "score": 7, "feedback": "Clear answer."}], "overall_feedback": "Good."}'
+
+
+class TailLatencyModel(AIModelInterface):
+    """Stub evaluator: fast most of the time, occasionally stalls."""
+
+    def __init__(self, name, tier, fast, slow, slow_rate, seed):
+        super().__init__(name=name, description="Stub evaluator", tier=tier)
+        self.fast = fast
+        self.slow = slow
+        self.slow_rate = slow_rate
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    async def _agenerate_response(self, prompt, system_message=None):
+        with self._lock:
+            self.calls += 1
+            stalled = self.rng.random() < self.slow_rate
+            delay = self.fast * self.rng.uniform(0.5, 1.5)
+        await asyncio.sleep(self.slow if stalled else delay)
+        return STUB_EVALUATION
+
+
+def build_registry(args):
+    registry = ModelRegistry()
+    for name, seed in (("Primary", 1), ("Backup", 2)):
+        registry.register_model(TailLatencyModel(name, "personal", args.fast, args.slow, args.slow_rate, seed))
+    registry.register_model(TailLatencyModel("Corporate", "corporate", args.fast, args.slow, args.slow_rate, 3))
+    return registry
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def run(args, hedge_delay):
+    """
+    Score every interview once.
+
+    Returns:
+        tuple: (sorted latencies in seconds, calls per model name, failed evaluations)
+    """
+    registry = build_registry(args)
+    evaluator = BatchEvaluator(registry, "Primary", args.concurrency, hedge_delay=hedge_delay)
+    interviews = [{"id": str(number), "transcript": [{"question_id": 1, "question": "Explain overfitting.",
+                                                      "answer": f"Answer {number}"}]}
+                  for number in range(args.interviews)]
+    output = io.StringIO()
+    counts = asyncio.run(evaluator.run(interviews, output))
+    latencies = sorted(json.loads(line)["latency"] for line in output.getvalue().splitlines())
+    return latencies, {name: model.calls for name, model in registry.models.items()}, counts["failed"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interviews", type=int, default=400, help="Evaluations per run")
+    parser.add_argument("--concurrency", type=int, default=32, help="Evaluations in flight")
+    parser.add_argument("--fast", type=float, default=0.05, help="Typical seconds per evaluation")
+    parser.add_argument("--slow", type=float, default=1.0, help="Seconds for a stalled evaluation")
+    parser.add_argument("--slow-rate", type=float, default=0.1, help="Share of evaluations that stall")
+    parser.add_argument("--hedge-delay", type=float, default=0.1, help="Seconds before the backup is asked")
+    args = parser.parse_args()
+
+    print(f"{'run':<8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'calls/eval':>11} {'failed':>7}")
+    p95 = {}
+    for label, hedge_delay in (("single", None), ("hedged", args.hedge_delay), ("fan-out", 0.0)):
+        latencies, calls, failed = run(args, hedge_delay)
+        p95[label] = percentile(latencies, 95)
+        print(f"{label:<8} {percentile(latencies, 50) * 1000:8.1f} {p95[label] * 1000:8.1f} "
+              f"{percentile(latencies, 99) * 1000:8.1f} {sum(calls.values()) / args.interviews:11.2f} {failed:7d}")
+        assert calls["Corporate"] == 0, "fan-out left the personal tier"
+        assert failed == 0, f"{failed} evaluations failed"
+    assert p95["hedged"] < p95["single"], "hedging did not lower p95 latency"
+
+
+if __name__ == "__main__":
+    main()
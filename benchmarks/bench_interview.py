@@ -0,0 +1,469 @@
+"""
+Load-test the full interview turn and report where the time goes.
+
+N synthetic candidates run concurrently through InterviewSession, wired the
+way the app wires it. Only the outermost calls are stubbed, each with
+injected latency:
+- gTTS: a GTTSBackend whose synthesize() sleeps, behind the real AudioCache
+- the speech recognizer: a backend whose final recognition sleeps, fed by
+  the real StreamingSpeechInput endpointer from synthetic PCM audio
+- the provider APIs: the GPT-4 and Gemini classes' request methods, so calls
+  still go through initialize_models(), the response cache, the shared rate
+  limiter, retries and failover
+
+Playback is simulated from the clip length. Latencies are a base value with
+uniform jitter, seeded for repeatability. Every latency is multiplied by
+--time-scale, and so is the shared rate limit, so a scaled run keeps the
+limiter's relative pressure. Speculative follow-ups wait for a wall-clock
+pause in partials, so they only start at --time-scale 1.
+
+Stages reported (seconds, p50/p95/p99):
+    tts                 preparing one line (cache lookup, synthesis on a miss)
+    playback            playing one line
+    answer              candidate speaking, until the endpointer hears the end of speech
+    stt                 end of speech until the transcript is ready
+    llm_first_token     streamed follow-up request until its first chunk
+    llm_followup        follow-up request (streamed or speculative draft) until complete
+    llm_evaluation      one background scoring call
+    response_gap        transcript ready until the next line (follow-up or question) starts playing
+    turn                question start until the turn is recorded
+    session             whole interview
+
+Results are written as JSON (with the git commit) so runs can be diffed.
+
+Usage:
+    python benchmarks/bench_interview.py --candidates 100 --json results.json
+    python benchmarks/bench_interview.py --model Gemini --llm-first-token 0.3 --time-scale 0.1
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interview_data import interview_tracks  # noqa: E402
+from interview_engine import (  # noqa: E402
+    AudioInputPort, AudioOutputPort, InterviewListener, InterviewSession, run_sessions
+)
+from model_interface import GeminiModel, GPT4Model, initialize_models  # noqa: E402
+from resilience import DEFAULT_BURST, DEFAULT_RATE, get_rate_limiter  # noqa: E402
+from speech_input import DEFAULT_SAMPLE_RATE, OfflineRecognizerBackend, PCMSource, StreamingSpeechInput  # noqa: E402
+from tts_backends import GTTSBackend  # noqa: E402
+from tts_cache import AudioCache  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAGES = ("tts", "playback", "answer", "stt", "llm_first_token", "llm_followup", "llm_evaluation",
+          "response_gap", "turn", "session")
+STUB_FOLLOWUPS = [
+    "That is a solid approach. How would you test it under load?",
+    "Good point about trade-offs. What would you change if traffic doubled?",
+    "Thanks, that is clear. Can you walk me through a failure you debugged?",
+]
+STUB_ANSWER = ("I would start by profiling the hot path, then cache the expensive lookups and batch the writes "
+               "so the database sees fewer round trips")
+STUB_EVALUATION = '{"score": 7, "feedback": "Structured answer with a concrete plan."}'
+# Synthetic microphone audio: quiet room, then speech loud enough for the endpointer
+SILENCE_AMPLITUDE = 20
+SPEECH_AMPLITUDE = 3000
+LEADING_SILENCE = 0.4
+TRAILING_SILENCE = 1.2
+
+
+class StageRecorder:
+    """Collects stage durations from any thread."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def summary(self):
+        """
+        Summarize every stage.
+
+        Returns:
+            dict: Stage name to count, mean, p50, p95, p99 and max in seconds
+        """
+        result = {}
+        for stage in STAGES:
+            values = sorted(self.samples.get(stage, []))
+            if not values:
+                continue
+            result[stage] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": values[-1],
+            }
+        return result
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class Latency:
+    """Base latency with uniform jitter, scaled for faster runs."""
+
+    def __init__(self, base, jitter, scale, rng):
+        self.base = base
+        self.jitter = jitter
+        self.scale = scale
+        self.rng = rng
+
+    def sample(self):
+        return max(0.0, self.base * (1 + self.rng.uniform(-self.jitter, self.jitter))) * self.scale
+
+
+class StubGTTSBackend(GTTSBackend):
+    """gTTS with the network request replaced by a sleep; returns bytes sized like gTTS's MP3."""
+
+    def __init__(self, latency, seconds_per_word):
+        self.latency = latency
+        self.seconds_per_word = seconds_per_word
+
+    def synthesize(self, text, lang, voice):
+        time.sleep(self.latency.sample())
+        return b"\0" * int(len(text.split()) * self.seconds_per_word * self.BITRATE / 8)
+
+
+class BenchAudioOutput(AudioOutputPort):
+    """Speaks through the real audio cache; playback lasts the clip's length, scaled."""
+
+    def __init__(self, cache, time_scale, recorder, turn_clock):
+        self.cache = cache
+        self.time_scale = time_scale
+        self.recorder = recorder
+        self.turn_clock = turn_clock
+
+    async def prepare(self, text):
+        start = time.perf_counter()
+        audio = await asyncio.to_thread(self.cache.get_or_synthesize, text)
+        self.recorder.record("tts", time.perf_counter() - start)
+        return audio
+
+    async def speak(self, text, audio=None):
+        if audio is None:
+            audio = await self.prepare(text)
+        if self.turn_clock.get("answered") is not None:
+            self.recorder.record("response_gap", time.perf_counter() - self.turn_clock.pop("answered"))
+        start = time.perf_counter()
+        await asyncio.sleep(self.cache.backend.estimate_duration(audio) * self.time_scale)
+        self.recorder.record("playback", time.perf_counter() - start)
+
+
+class ScaledPCMSource(PCMSource):
+    """Replays PCM at the microphone's pace multiplied by time_scale."""
+
+    def __init__(self, pcm, time_scale):
+        super().__init__(pcm)
+        self.time_scale = time_scale
+
+    def frames(self):
+        frame_seconds = self.chunk_size / self.sample_rate * self.time_scale
+        for frame in super().frames():
+            time.sleep(frame_seconds)
+            yield frame
+
+
+class StubRecognizerBackend(OfflineRecognizerBackend):
+    """Streaming partials as words are spoken; the final recognition request is a sleep."""
+
+    def __init__(self, transcript, speaking_seconds, latency):
+        super().__init__(transcript, words_per_second=len(transcript.split()) / speaking_seconds)
+        self.latency = latency
+
+    def finish(self):
+        time.sleep(self.latency.sample())
+        return super().finish()
+
+
+def synthetic_pcm(speaking_seconds):
+    def samples(seconds, amplitude):
+        return array("h", [amplitude, -amplitude]) * int(seconds * DEFAULT_SAMPLE_RATE / 2)
+
+    return (samples(LEADING_SILENCE, SILENCE_AMPLITUDE) + samples(speaking_seconds, SPEECH_AMPLITUDE)
+            + samples(TRAILING_SILENCE, SILENCE_AMPLITUDE)).tobytes()
+
+
+class BenchAudioInput(AudioInputPort):
+    """A candidate speaking into the real capture pipeline, then a recognizer finishing."""
+
+    def __init__(self, answer, answer_latency, stt_latency, time_scale, recorder, turn_clock):
+        self.answer = answer
+        self.answer_latency = answer_latency
+        self.stt_latency = stt_latency
+        self.time_scale = time_scale
+        self.recorder = recorder
+        self.turn_clock = turn_clock
+
+    def _listen(self, on_partial):
+        # Audio seconds, before scaling; the endpointer counts frames, not wall time
+        speaking = self.answer_latency.sample() / self.time_scale
+        speech = StreamingSpeechInput(
+            source_factory=lambda: ScaledPCMSource(synthetic_pcm(speaking), self.time_scale),
+            backend_factory=lambda: StubRecognizerBackend(self.answer, speaking, self.stt_latency),
+            start_timeout=LEADING_SILENCE + 1, max_speech_seconds=speaking + TRAILING_SILENCE + 1
+        )
+        start = time.perf_counter()
+        ended = {}
+
+        def speech_end():
+            ended["at"] = time.perf_counter()
+            self.recorder.record("answer", ended["at"] - start)
+
+        text = speech.listen(on_partial=on_partial, on_speech_end=speech_end)
+        self.recorder.record("stt", time.perf_counter() - ended.get("at", start))
+        return text
+
+    async def listen(self, on_partial=None):
+        # The app runs capture on a worker thread, calling on_partial from it
+        text = await asyncio.to_thread(self._listen, on_partial)
+        self.turn_clock["answered"] = time.perf_counter()
+        return text
+
+
+class StubProvider:
+    """
+    Provider API stand-in with a first-token delay and a per-chunk delay.
+
+    install() replaces a model class's request methods, so everything above
+    them (registry, cache, rate limiter, retries) runs as in the app.
+    """
+
+    def __init__(self, first_token, per_chunk, evaluation, recorder, rng):
+        self.first_token = first_token
+        self.per_chunk = per_chunk
+        self.evaluation = evaluation
+        self.recorder = recorder
+        self.rng = rng
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def _followup(self):
+        # Unique text, as real follow-ups are, so the TTS cache does not flatter the numbers
+        with self._lock:
+            self._counter += 1
+            return f"{self.rng.choice(STUB_FOLLOWUPS)} ({self._counter})"
+
+    async def respond(self, prompt):
+        start = time.perf_counter()
+        if "Respond with JSON" in prompt:
+            await asyncio.sleep(self.evaluation.sample())
+            self.recorder.record("llm_evaluation", time.perf_counter() - start)
+            return STUB_EVALUATION
+        # Speculative drafts are whole follow-ups generated without streaming
+        followup = self._followup()
+        await asyncio.sleep(self.first_token.sample() + self.per_chunk.sample() * len(followup.split()))
+        self.recorder.record("llm_followup", time.perf_counter() - start)
+        return followup
+
+    def respond_sync(self, prompt):
+        start = time.perf_counter()
+        if "Respond with JSON" in prompt:
+            time.sleep(self.evaluation.sample())
+            self.recorder.record("llm_evaluation", time.perf_counter() - start)
+            return STUB_EVALUATION
+        followup = self._followup()
+        time.sleep(self.first_token.sample() + self.per_chunk.sample() * len(followup.split()))
+        self.recorder.record("llm_followup", time.perf_counter() - start)
+        return followup
+
+    async def stream(self, prompt):
+        start = time.perf_counter()
+        await asyncio.sleep(self.first_token.sample())
+        self.recorder.record("llm_first_token", time.perf_counter() - start)
+        for word in self._followup().split(" "):
+            yield word + " "
+            await asyncio.sleep(self.per_chunk.sample())
+        self.recorder.record("llm_followup", time.perf_counter() - start)
+
+    def stream_sync(self, prompt):
+        start = time.perf_counter()
+        time.sleep(self.first_token.sample())
+        self.recorder.record("llm_first_token", time.perf_counter() - start)
+        for word in self._followup().split(" "):
+            yield word + " "
+            time.sleep(self.per_chunk.sample())
+        self.recorder.record("llm_followup", time.perf_counter() - start)
+
+    def install(self, model_class):
+        provider = self
+
+        async def _agenerate_response(model, prompt, system_message=None):
+            return await provider.respond(prompt)
+
+        async def _agenerate_response_stream(model, prompt, system_message=None):
+            async for chunk in provider.stream(prompt):
+                yield chunk
+
+        def generate_response(model, prompt, system_message=None):
+            return provider.respond_sync(prompt)
+
+        def generate_response_stream(model, prompt, system_message=None):
+            yield from provider.stream_sync(prompt)
+
+        model_class._agenerate_response = _agenerate_response
+        model_class._agenerate_response_stream = _agenerate_response_stream
+        model_class.generate_response = generate_response
+        model_class.generate_response_stream = generate_response_stream
+
+
+class TurnTimer(InterviewListener):
+    def __init__(self, recorder):
+        self.recorder = recorder
+        self.started = None
+        self.session_started = None
+
+    def greeting(self, text):
+        self.session_started = time.perf_counter()
+
+    def farewell(self, text):
+        self.recorder.record("session", time.perf_counter() - self.session_started)
+
+    def question_started(self, index, total):
+        self.started = time.perf_counter()
+
+    def turn_completed(self, entry):
+        self.recorder.record("turn", time.perf_counter() - self.started)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(args, cache_dir):
+    """
+    Run every candidate and gather the stage timings.
+
+    Returns:
+        tuple: (StageRecorder with the samples, list of exceptions from failed sessions, AudioCache)
+    """
+    rng = random.Random(args.seed)
+    recorder = StageRecorder()
+    # Each Streamlit session runs blocking work on its own threads; do not make candidates queue for a small pool
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=args.candidates * 2 + 8))
+
+    def latency(base):
+        return Latency(base, args.jitter, args.time_scale, rng)
+
+    StubProvider(latency(args.llm_first_token), latency(args.llm_per_chunk), latency(args.eval_latency),
+                 recorder, rng).install(GPT4Model)
+    StubProvider(latency(args.llm_first_token * 0.6), latency(args.llm_per_chunk * 0.5),
+                 latency(args.eval_latency * 0.6), recorder, rng).install(GeminiModel)
+    # The shared per-model buckets, created before the registry asks for them, with the rate scaled like time
+    for name in ("GPT-4", "Gemini"):
+        get_rate_limiter(name, args.rate_limit / args.time_scale, args.rate_burst)
+    model = initialize_models().get_model(args.model)
+    cache = AudioCache(cache_dir, backend=StubGTTSBackend(latency(args.tts_latency), args.playback_per_word))
+    questions = interview_tracks[args.track][:args.questions]
+    sessions = []
+
+    def new_session(number):
+        turn_clock = {}
+        # A distinct answer per candidate, so the response cache only hits where the app's would
+        answer = f"{STUB_ANSWER} at company number {number}"
+        session = InterviewSession(
+            f"candidate-{number}", args.track, questions, model,
+            BenchAudioInput(answer, latency(args.answer_seconds), latency(args.stt_latency), args.time_scale,
+                            recorder, turn_clock),
+            BenchAudioOutput(cache, args.time_scale, recorder, turn_clock),
+            TurnTimer(recorder), speculative=not args.no_speculation
+        )
+        sessions.append(session)
+        return session
+
+    candidates = [lambda number=number: new_session(number) for number in range(args.candidates)]
+    results = await run_sessions(candidates, args.concurrency or args.candidates)
+    failures = [result for result in results if isinstance(result, BaseException)]
+    # Background scoring finishes after the interviews; wait so its latency is counted
+    for session in sessions:
+        for evaluation in session.evaluations:
+            try:
+                await asyncio.wrap_future(evaluation)
+            except Exception:
+                pass
+    return recorder, failures, cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=50, help="Concurrent synthetic candidates")
+    parser.add_argument("--concurrency", type=int, default=0,
+                        help="Sessions in progress at once (default: all candidates)")
+    parser.add_argument("--questions", type=int, default=3, help="Questions per interview")
+    parser.add_argument("--track", default=next(iter(interview_tracks)), choices=list(interview_tracks))
+    parser.add_argument("--model", default="GPT-4", choices=["GPT-4", "Gemini"], help="Model to interview with")
+    parser.add_argument("--tts-latency", type=float, default=0.6, help="Seconds per synthesis")
+    parser.add_argument("--playback-per-word", type=float, default=0.35, help="Playback seconds per word")
+    parser.add_argument("--answer-seconds", type=float, default=8.0, help="Seconds each answer is spoken")
+    parser.add_argument("--stt-latency", type=float, default=0.5, help="End of speech to transcript")
+    parser.add_argument("--llm-first-token", type=float, default=0.8, help="Follow-up time to first chunk")
+    parser.add_argument("--llm-per-chunk", type=float, default=0.03, help="Seconds between streamed chunks")
+    parser.add_argument("--eval-latency", type=float, default=1.5, help="Seconds per scoring call")
+    parser.add_argument("--rate-limit", type=float, default=DEFAULT_RATE,
+                        help="Requests/s per model through the shared limiter (MODEL_RATE_LIMIT)")
+    parser.add_argument("--rate-burst", type=float, default=DEFAULT_BURST,
+                        help="Shared limiter burst per model (MODEL_RATE_BURST)")
+    parser.add_argument("--jitter", type=float, default=0.3, help="Uniform jitter as a fraction of each latency")
+    parser.add_argument("--time-scale", type=float, default=0.1,
+                        help="Multiply every injected latency, e.g. 1.0 for real time")
+    parser.add_argument("--no-speculation", action="store_true", help="Disable speculative follow-ups")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for jitter")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        recorder, failures, cache = asyncio.run(run_benchmark(args, cache_dir))
+    elapsed = time.perf_counter() - start
+    summary = recorder.summary()
+
+    print(f"{args.candidates} candidates x {args.questions} questions on {args.model} (stub provider), "
+          f"time scale {args.time_scale}, {len(failures)} failed, {elapsed:.1f} s wall")
+    tts_stats = cache.get_stats()
+    print(f"{'stage':<16} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for stage, stats in summary.items():
+        print(f"{stage:<16} {stats['count']:6d} {stats['p50'] * 1000:9.1f} {stats['p95'] * 1000:9.1f} "
+              f"{stats['p99'] * 1000:9.1f} {stats['max'] * 1000:9.1f}")
+    print(f"tts cache: {tts_stats}")
+    if failures:
+        print(f"first failure: {failures[0]!r}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "config": vars(args),
+                "wall_seconds": elapsed,
+                "failures": len(failures),
+                "stages": summary,
+                "tts_cache": tts_stats,
+            }, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Measure question bank load time, memory and sampling latency.
+
+Writes a synthetic bank (JSONL, then converted to SQLite) and compares each
+bank type with the naive approach of json-loading every question into a
+list and filtering it on every interview. Sampling runs with a growing set
+of already-asked questions, as a returning candidate's history grows.
+
+Usage:
+    python benchmarks/bench_question_bank.py --questions 20000 --tracks 5
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import JSONLQuestionBank, Question, SQLiteQuestionBank  # noqa: E402
+
+TAGS = ("python", "sql", "statistics", "ml", "system-design", "behavioural", "testing", "cloud")
+
+
+def write_bank(path, questions, tracks, rng):
+    with open(path, "w", encoding="utf-8") as f:
+        for number in range(questions):
+            record = {"track": f"Track {number % tracks}", "text": f"Question {number}: " + "describe a case " * 8,
+                      "difficulty": rng.randint(1, 5), "tags": rng.sample(TAGS, 2)}
+            f.write(json.dumps(record) + "\n")
+
+
+class NaiveBank:
+    """Every question parsed into memory, filtered on each request."""
+
+    def __init__(self, path):
+        with open(path, encoding="utf-8") as f:
+            self.questions = [Question(number, **json.loads(line)) for number, line in enumerate(f)]
+
+    def sample(self, track, k, difficulty=None, tags=None, exclude=(), rng=None):
+        matching = [question for question in self.questions
+                    if question.track == track and (difficulty is None or question.difficulty == difficulty)
+                    and all(tag in question.tags for tag in tags or ()) and question.id not in exclude]
+        return rng.sample(matching, min(k, len(matching)))
+
+
+def percentiles(latencies):
+    ordered = sorted(latencies)
+    return {pct: ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] for pct in (50, 99)}
+
+
+def load(factory, path, track):
+    tracemalloc.start()
+    start = time.perf_counter()
+    bank = factory(path)
+    # Banks index lazily; the first sample pays for it
+    bank.sample(track, 1, rng=random.Random(0))
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return bank, elapsed, retained
+
+
+def bench_sample(bank, track, k, asked, samples, rng, **filters):
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        questions = bank.sample(track, k, exclude=asked, rng=rng, **filters)
+        latencies.append(time.perf_counter() - start)
+        assert not asked & {question.id for question in questions}, "sampled an asked question"
+    return percentiles(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=20000, help="Questions in the bank")
+    parser.add_argument("--tracks", type=int, default=5, help="Tracks the questions are spread over")
+    parser.add_argument("--samples", type=int, default=500, help="Interviews sampled per scenario")
+    parser.add_argument("--k", type=int, default=3, help="Questions per interview")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        jsonl_path, sqlite_path = os.path.join(temp_dir, "bank.jsonl"), os.path.join(temp_dir, "bank.db")
+        write_bank(jsonl_path, args.questions, args.tracks, rng)
+        source = JSONLQuestionBank(jsonl_path)
+        SQLiteQuestionBank.build(sqlite_path, (source.get(question_id) for question_id in range(args.questions)))
+        track = "Track 0"
+
+        print(f"{'bank':<8} {'load ms':>8} {'heap KiB':>9}")
+        banks = {}
+        for label, factory, path in (("naive", NaiveBank, jsonl_path), ("jsonl", JSONLQuestionBank, jsonl_path),
+                                     ("sqlite", SQLiteQuestionBank, sqlite_path)):
+            banks[label], elapsed, retained = load(factory, path, track)
+            print(f"{label:<8} {elapsed * 1000:8.1f} {retained / 1024:9.0f}")
+
+        track_ids = list(banks["jsonl"].index(track).ids)
+        print(f"\n{'bank':<8} {'scenario':<22} {'p50 us':>9} {'p99 us':>9}")
+        for asked_share in (0, 0.1, 0.6):
+            asked = set(rng.sample(track_ids, int(len(track_ids) * asked_share)))
+            for label, bank in banks.items():
+                p = bench_sample(bank, track, args.k, asked, args.samples, random.Random(1))
+                print(f"{label:<8} {f'{asked_share:.0%} asked':<22} {p[50] * 1e6:9.1f} {p[99] * 1e6:9.1f}")
+        for label, bank in banks.items():
+            p = bench_sample(bank, track, args.k, set(), args.samples, random.Random(1), difficulty=4, tags=["sql"])
+            print(f"{label:<8} {'difficulty 4 + tag':<22} {p[50] * 1e6:9.1f} {p[99] * 1e6:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Exercise ResilientModel against a local fake OpenAI provider.
+
+The fake provider answers chat completions like the real API, but can be
+told to rate-limit (429 with Retry-After), fail (503) or hang. Three
+scenarios are run against GPT4Model wrapped in ResilientModel:
+
+- rate-limited: every third request gets a 429; all calls must succeed and
+  every retry must wait at least as long as Retry-After asked.
+- outage: the provider always returns 503; calls must fail over to another
+  model in the same tier, and once the circuit opens they must skip the
+  provider entirely.
+- hang: the provider never answers in time; calls must fail over after the
+  attempt timeout instead of waiting for the provider.
+- cancelled trial: the half-open trial call is cancelled, as speculative
+  drafts and fan-out losers are; the breaker must let the next call try
+  again, and an already-expired deadline must not count as a failure.
+
+Usage:
+    python benchmarks/bench_resilience.py --calls 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_interface import AIModelInterface, GPT4Model  # noqa: E402
+from rate_limit import TokenBucket  # noqa: E402
+from resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, DeadlineExceededError, ResilientModel  # noqa: E402
+
+STUB_COMPLETION = {
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "Can you give an example from a recent project?"},
+        "finish_reason": "stop"
+    }],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20}
+}
+RETRY_AFTER = 0.2
+
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    """Chat completions endpoint whose failure mode is set on the server."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            number = server.requests
+        mode = server.mode
+        if mode == "rate-limited" and number % 3 == 0:
+            server.events.append(("429", time.monotonic()))
+            self._send(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                       {"Retry-After": str(RETRY_AFTER)})
+            return
+        if mode == "outage":
+            self._send(503, {"error": {"message": "Service unavailable", "type": "server_error"}})
+            return
+        if mode == "hang":
+            time.sleep(5)
+        server.events.append(("200", time.monotonic()))
+        self._send(200, STUB_COMPLETION)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_provider():
+    """
+    Start the fake provider on a free local port.
+
+    Returns:
+        ThreadingHTTPServer: The running server; set .mode to change its behaviour
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeProviderHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.mode = "ok"
+    server.requests = 0
+    server.events = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class BackupModel(AIModelInterface):
+    """In-process model of the same tier, used as the failover target."""
+
+    def __init__(self):
+        super().__init__(name="Backup", description="Local failover model", tier="corporate")
+
+    def generate_response(self, prompt, system_message=None):
+        return "What trade-offs did you consider?"
+
+
+class SlowModel(AIModelInterface):
+    """In-process model that takes a while to answer, so calls to it can be cancelled."""
+
+    def __init__(self, delay=0.2):
+        super().__init__(name="Slow", description="Local slow model", tier="corporate")
+        self.delay = delay
+
+    def generate_response(self, prompt, system_message=None):
+        time.sleep(self.delay)
+        return "Can you walk me through it?"
+
+    async def agenerate_response(self, prompt, system_message=None):
+        await asyncio.sleep(self.delay)
+        return "Can you walk me through it?"
+
+
+def build_models(deadline, attempt_timeout=5.0):
+    """
+    Wrap GPT4Model and a backup model with fresh limiters and breakers.
+
+    Returns:
+        tuple: (primary ResilientModel, backup ResilientModel)
+    """
+    backup = ResilientModel(BackupModel(), limiter=TokenBucket(1000, 1000), breaker=CircuitBreaker())
+    primary = ResilientModel(GPT4Model(), fallbacks=lambda: [backup], limiter=TokenBucket(1000, 1000),
+                             breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60),
+                             deadline=deadline, attempt_timeout=attempt_timeout, base_delay=0.05, max_delay=0.5)
+    return primary, backup
+
+
+def run_calls(model, calls):
+    """
+    Call the model repeatedly.
+
+    Returns:
+        tuple: (latencies in ms, responses)
+    """
+    latencies, responses = [], []
+    for i in range(calls):
+        start = time.perf_counter()
+        responses.append(model.generate_response(f"Answer number {i}"))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, responses
+
+
+def summarize(label, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{label:<14} calls={len(latencies):3d}  p50={statistics.median(ordered):8.1f} ms  "
+          f"p95={p95:8.1f} ms  max={ordered[-1]:8.1f} ms")
+
+
+def scenario_rate_limited(server, calls):
+    server.mode, server.requests, server.events = "rate-limited", 0, []
+    primary, _ = build_models(deadline=10)
+    latencies, responses = run_calls(primary, calls)
+    summarize("rate-limited", latencies)
+    # Each 429 must be followed by a retry no sooner than Retry-After
+    gaps = [later[1] - event[1] for event, later in zip(server.events, server.events[1:]) if event[0] == "429"]
+    limited = sum(1 for event in server.events if event[0] == "429")
+    print(f"  429s={limited}  shortest retry gap={min(gaps) * 1000 if gaps else 0:.0f} ms "
+          f"(Retry-After {RETRY_AFTER * 1000:.0f} ms)")
+    assert all(response == STUB_COMPLETION["choices"][0]["message"]["content"] for response in responses)
+    assert all(gap >= RETRY_AFTER for gap in gaps), "retried before Retry-After elapsed"
+
+
+def scenario_outage(server, calls):
+    server.mode, server.requests, server.events = "outage", 0, []
+    primary, _ = build_models(deadline=10)
+    latencies, responses = run_calls(primary, calls)
+    summarize("outage", latencies)
+    print(f"  provider requests={server.requests}  breaker={primary.get_stats()}  "
+          f"first call {latencies[0]:.1f} ms, last call {latencies[-1]:.2f} ms")
+    assert all(response == BackupModel().generate_response("") for response in responses)
+    assert primary.get_stats()["state"] == OPEN
+    # Requests stop once the breaker opens, instead of growing with the number of calls
+    assert server.requests <= primary.max_attempts * 3
+
+
+def scenario_hang(server, calls, attempt_timeout=0.5):
+    server.mode, server.requests, server.events = "hang", 0, []
+    primary, _ = build_models(deadline=10, attempt_timeout=attempt_timeout)
+    latencies, responses = run_calls(primary, calls)
+    summarize("hang", latencies)
+    print(f"  provider requests={server.requests}  breaker={primary.get_stats()}")
+    assert all(response == BackupModel().generate_response("") for response in responses)
+    assert max(latencies) < (attempt_timeout + 0.5) * 1000, "call waited past its attempt timeout"
+
+
+def scenario_cancelled_trial(reset_timeout=0.05):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=reset_timeout)
+    model = ResilientModel(SlowModel(), fallbacks=lambda: [], limiter=TokenBucket(1000, 1000), breaker=breaker)
+
+    async def cancel_trial():
+        trial = asyncio.create_task(model.agenerate_response("Question"))
+        await asyncio.sleep(model.model.delay / 4)
+        assert breaker.get_stats()["state"] == HALF_OPEN
+        trial.cancel()
+        try:
+            await trial
+        except asyncio.CancelledError:
+            pass
+
+    breaker.record_failure()
+    time.sleep(reset_timeout)
+    asyncio.run(cancel_trial())
+    # The call runs on the shared loop, which sees the cancellation a moment later
+    give_up_at = time.monotonic() + 1
+    while breaker.get_stats()["state"] == HALF_OPEN and time.monotonic() < give_up_at:
+        time.sleep(0.005)
+    after_cancel = breaker.get_stats()
+    # The next call is the new trial, and a healthy model closes the breaker
+    response = model.generate_response("Question")
+    print(f"cancelled trial  breaker after cancel={after_cancel}  after next call={breaker.get_stats()}")
+    assert after_cancel["state"] != HALF_OPEN, "cancelled trial left the breaker half-open"
+    assert response == SlowModel().generate_response("") and breaker.get_stats()["state"] == CLOSED
+
+    failures = breaker.get_stats()["failures"]
+    try:
+        asyncio.run(model._acall("Question", None, time.monotonic() - 1))
+    except DeadlineExceededError:
+        pass
+    assert breaker.get_stats() == {"state": CLOSED, "failures": failures}, "expired deadline counted on the breaker"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=30, help="Calls per scenario")
+    args = parser.parse_args()
+
+    server = start_fake_provider()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "stub-key")
+
+    scenario_rate_limited(server, args.calls)
+    scenario_outage(server, args.calls)
+    scenario_hang(server, min(args.calls, 5))
+    scenario_cancelled_trial()
+    print("all scenarios passed")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Check the response cache's counters, expiry and size bound, and time hits against misses.
+
+Each check runs on the in-memory and the SQLite backend:
+- counters: hits and misses counted per lookup
+- TTL: a response is served until its TTL passes and fetched again after
+- max bytes: least recently used responses are evicted once the total
+  passes the limit, and a response larger than the limit is never stored
+- scope: with the default "evaluation" scope, scoring prompts are cached
+  and follow-up prompts always reach the model
+
+The run fails on the first check that does not hold, then prints per-call
+latency of hits and misses against a stub model with --model-latency.
+
+Usage:
+    python benchmarks/bench_response_cache.py --calls 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_interface import AIModelInterface  # noqa: E402
+from prompt_budget import PromptBuilder  # noqa: E402
+from response_cache import (  # noqa: E402
+    CACHE_SCOPES, CachedModel, MemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+)
+
+EVALUATION = '{"score": 7, "feedback": "Clear answer."}'
+
+
+class CountingModel(AIModelInterface):
+    """Stub model that counts calls and answers after a fixed delay."""
+
+    def __init__(self, latency=0.0):
+        super().__init__(name="Stub", description="Counting stub", tier="personal")
+        self.latency = latency
+        self.calls = 0
+
+    def generate_response(self, prompt, system_message=None):
+        self.calls += 1
+        time.sleep(self.latency)
+        return f"{EVALUATION} #{self.calls}"
+
+
+def check_counters(backend):
+    cache = ResponseCache(backend, ttl=None)
+    assert cache.get("Stub", None, "a") is None
+    cache.set("Stub", None, "a", "answer")
+    assert cache.get("Stub", None, "a") == "answer"
+    assert cache.get("Stub", "other system message", "a") is None
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1), stats
+
+
+def check_ttl(backend, ttl=0.2):
+    cache = ResponseCache(backend, ttl=ttl)
+    cache.set("Stub", None, "a", "answer")
+    assert cache.get("Stub", None, "a") == "answer", "expired before its TTL"
+    time.sleep(ttl * 1.5)
+    assert cache.get("Stub", None, "a") is None, "served after its TTL"
+    assert cache.get_stats()["entries"] == 0, "expired entry kept"
+
+
+def check_max_bytes(backend):
+    # The backend was created with max_bytes=100
+    cache = ResponseCache(backend, ttl=None)
+    for key in "abcd":
+        cache.set("Stub", None, key, key * 30)
+        # Touch "a" so it is the most recently used, not the oldest
+        cache.get("Stub", None, "a")
+    stats = cache.get_stats()
+    assert stats["bytes"] <= 100, stats
+    assert cache.get("Stub", None, "a") is not None, "recently used entry evicted"
+    assert cache.get("Stub", None, "b") is None, "least recently used entry kept"
+    cache.set("Stub", None, "huge", "x" * 101)
+    assert cache.get("Stub", None, "huge") is None, "response larger than max_bytes stored"
+
+
+def check_scope(backend):
+    model = CountingModel()
+    cached = CachedModel(model, ResponseCache(backend, ttl=None), CACHE_SCOPES["evaluation"])
+    builder = PromptBuilder.for_model(cached)
+    evaluation = builder.question_evaluation_prompt("Explain overfitting.", "")
+    followup = builder.followup_prompt("")
+    assert cached.generate_response(evaluation) == cached.generate_response(evaluation), "scoring not cached"
+    assert cached.generate_response(followup) != cached.generate_response(followup), "follow-up cached"
+    assert model.calls == 3, model.calls
+
+
+def time_calls(backend, calls, latency):
+    """
+    Time the same prompt repeated: the first call misses, the rest hit.
+
+    Returns:
+        tuple: (miss seconds, mean hit seconds)
+    """
+    cached = CachedModel(CountingModel(latency), ResponseCache(backend, ttl=None))
+    start = time.perf_counter()
+    cached.generate_response("prompt")
+    miss = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(calls):
+        cached.generate_response("prompt")
+    return miss, (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000, help="Cache hits timed per backend")
+    parser.add_argument("--model-latency", type=float, default=0.5, help="Seconds per stub model call")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        def backends(max_bytes=1024 * 1024):
+            path = os.path.join(directory, f"cache-{time.perf_counter_ns()}.sqlite3")
+            return {"memory": MemoryCacheBackend(max_bytes), "sqlite": SQLiteCacheBackend(path, max_bytes)}
+
+        for check in (check_counters, check_ttl, check_scope):
+            for label, backend in backends().items():
+                check(backend)
+                print(f"{label:<7} {check.__name__[6:]:<10} ok")
+        for label, backend in backends(max_bytes=100).items():
+            check_max_bytes(backend)
+            print(f"{label:<7} {'max_bytes':<10} ok")
+
+        print(f"\n{'backend':<8} {'miss ms':>9} {'hit us':>9}")
+        for label, backend in backends().items():
+            miss, hit = time_calls(backend, args.calls, args.model_latency)
+            print(f"{label:<8} {miss * 1000:9.1f} {hit * 1e6:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Measure session store write latency and history query cost.
+
+Writes: every turn of N synthetic sessions is recorded through
+SQLiteSessionStore (queued, group-committed by a writer thread, WAL) and,
+for comparison, with a synchronous INSERT and COMMIT per turn in SQLite's
+default journal mode. The caller-side latency is what an interview turn
+waits for.
+
+Reads: first and deep pages of a filtered listing (keyset pagination),
+and streaming every session versus fetching them all at once, with the
+Python heap peak of each.
+
+Usage:
+    python benchmarks/bench_session_store.py --sessions 20000
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_store import SCHEMA, SQLiteSessionStore  # noqa: E402
+from transcript import TranscriptEntry  # noqa: E402
+
+TRACKS = ("Software Engineering", "Data Science", "Product Management")
+MODELS = ("GPT-4", "Gemini")
+
+
+def percentiles(latencies):
+    ordered = sorted(latencies)
+    return {pct: ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] for pct in (50, 99)}
+
+
+def synthetic_turns(sessions, questions, rng):
+    start = time.time() - sessions * 60
+    for number in range(sessions):
+        session = {"id": f"session-{number:08d}", "username": f"user-{rng.randrange(sessions // 10 or 1)}",
+                   "track": rng.choice(TRACKS), "model": rng.choice(MODELS), "started_at": start + number * 60}
+        entries = [TranscriptEntry(question_id, f"Question {question_id}", "An answer " * 30, "A follow-up?",
+                                   "Another answer " * 20, {"answer": 12.0}, rng.randint(1, 10), "Feedback.")
+                   for question_id in range(1, questions + 1)]
+        yield session, entries
+
+
+def bench_store(path, sessions, questions):
+    store = SQLiteSessionStore(path)
+    latencies = []
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for session, entries in synthetic_turns(sessions, questions, rng):
+        store.start_session(session["id"], session["username"], session["track"], session["model"],
+                            session["started_at"])
+        for entry in entries:
+            begin = time.perf_counter()
+            store.record_turn(session["id"], entry)
+            latencies.append(time.perf_counter() - begin)
+            store.record_evaluation(session["id"], entry)
+        store.finish_session(session["id"], session["started_at"] + 600)
+    store.flush()
+    elapsed = time.perf_counter() - start
+    assert store.write_errors == 0, store.last_error
+    return store, latencies, elapsed
+
+
+def bench_synchronous(path, sessions, questions):
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    latencies = []
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for session, entries in synthetic_turns(sessions, questions, rng):
+        connection.execute("INSERT INTO sessions (id, username, track, model, started_at) VALUES (?, ?, ?, ?, ?)",
+                           (session["id"], session["username"], session["track"], session["model"],
+                            session["started_at"]))
+        connection.commit()
+        for entry in entries:
+            begin = time.perf_counter()
+            connection.execute("INSERT INTO turns VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               (session["id"], entry.question_id, entry.question, entry.answer, entry.followup,
+                                entry.followup_answer, json.dumps(entry.timings), entry.score, entry.feedback,
+                                time.time()))
+            connection.commit()
+            latencies.append(time.perf_counter() - begin)
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return latencies, elapsed
+
+
+def timed(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=20000, help="Synthetic sessions to write")
+    parser.add_argument("--questions", type=int, default=3, help="Turns per session")
+    parser.add_argument("--sync-sessions", type=int, default=500,
+                        help="Sessions written with a commit per turn (slow, so fewer)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store, latencies, elapsed = bench_store(os.path.join(temp_dir, "store.db"), args.sessions, args.questions)
+        sync_latencies, sync_elapsed = bench_synchronous(os.path.join(temp_dir, "sync.db"), args.sync_sessions,
+                                                         args.questions)
+        turns, sync_turns = len(latencies), len(sync_latencies)
+        print(f"{'writes':<22} {'turns':>7} {'p50 us':>9} {'p99 us':>9} {'turns/s':>9}")
+        for label, values, total in (("store (queued, WAL)", latencies, elapsed),
+                                     ("commit per turn", sync_latencies, sync_elapsed)):
+            p = percentiles(values)
+            print(f"{label:<22} {len(values):7d} {p[50] * 1e6:9.1f} {p[99] * 1e6:9.1f} {len(values) / total:9.0f}")
+
+        user = store.list_sessions(limit=1)[0][0]["username"]
+        print(f"\n{'query':<34} {'ms':>8} {'rows':>7} {'peak KiB':>9}")
+        queries = {
+            f"first page, user={user}": lambda: store.list_sessions(username=user)[0],
+            "first page, track": lambda: store.list_sessions(track=TRACKS[0])[0],
+            "first page, model + last day": lambda: store.list_sessions(model=MODELS[0],
+                                                                         since=time.time() - 86400)[0],
+            "pages 1-100, no filter": lambda: deep_page(store, 100),
+            "stream all (iter_sessions)": lambda: sum(1 for _ in store.iter_sessions()),
+            "fetch all at once": lambda: len(store._reader().execute("SELECT * FROM sessions").fetchall()),
+        }
+        for label, query in queries.items():
+            result, query_elapsed, peak = timed(query)
+            rows = result if isinstance(result, int) else len(result)
+            print(f"{label:<34} {query_elapsed * 1000:8.2f} {rows:7d} {peak / 1024:9.0f}")
+
+        plan = store._reader().execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM sessions WHERE username = ? ORDER BY started_at DESC, id DESC LIMIT 51",
+            (user,)
+        ).fetchall()
+        print("\nuser listing plan:", "; ".join(row["detail"] for row in plan))
+        store.close()
+        print(f"\n{turns} queued turns vs {sync_turns} committed turns")
+
+
+def deep_page(store, pages):
+    cursor = None
+    for _ in range(pages):
+        page, cursor = store.list_sessions(cursor=cursor)
+    return page
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Measure the memory each additional Streamlit session costs for model state.
+
+"per-session" builds a registry for every session, as the app did when the
+registry lived in st.session_state; "per-session + clients" also gives each
+session its own OpenAI client and connection pool, which is what a
+per-session registry costs without the process-wide client pool. "shared"
+builds one registry for the process and stores only the selected model name
+per session. Provider SDKs are imported before measuring, so the numbers
+show what each session adds on top.
+
+Python heap growth comes from tracemalloc. Resident set growth (Linux only)
+also counts native memory such as the TLS context every HTTP client loads.
+
+Usage:
+    python benchmarks/bench_sessions.py --sessions 200
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_interface import initialize_models  # noqa: E402
+
+
+def warm_up():
+    """Import the provider SDKs and build the pooled clients once."""
+    os.environ.setdefault("OPENAI_API_KEY", "stub-key")
+    registry = initialize_models()
+    for model in registry.get_all_models():
+        inner = model
+        while hasattr(inner, "model"):
+            inner = inner.model
+        try:
+            inner._get_client()
+        except ImportError:
+            pass
+    return registry
+
+
+def resident_bytes():
+    """
+    Current resident set size of this process.
+
+    Returns:
+        int: Bytes, or 0 where /proc is not available
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+def measure(build_session, sessions):
+    """
+    Allocate state for a number of sessions and report the memory they hold.
+
+    Returns:
+        tuple: (Python heap bytes, resident bytes) retained per session
+    """
+    gc.collect()
+    rss_before = resident_bytes()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    states = [build_session(i) for i in range(sessions)]
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    rss_after = resident_bytes()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del states
+    return retained / sessions, (rss_after - rss_before) / sessions
+
+
+def session_with_clients():
+    """Per-session registry that owns its clients instead of using the shared pool."""
+    import httpx
+    from openai import OpenAI
+
+    http_client = httpx.Client()
+    return {"model_registry": initialize_models(),
+            "clients": [OpenAI(api_key=os.environ["OPENAI_API_KEY"], http_client=http_client)]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=200, help="Simulated sessions")
+    args = parser.parse_args()
+
+    shared = warm_up()
+    results = {
+        "per-session": measure(lambda i: {"model_registry": initialize_models()}, args.sessions),
+        "per-session + clients": measure(lambda i: session_with_clients(), args.sessions),
+        "shared": measure(lambda i: {"selected_model": shared.default_model}, args.sessions),
+    }
+    print(f"{'mode':<22} {'heap KiB/session':>17} {'RSS KiB/session':>16}")
+    for mode, (heap, rss) in results.items():
+        print(f"{mode:<22} {heap / 1024:17.2f} {rss / 1024:16.2f}")
+    shared_heap, shared_rss = results["shared"]
+    for mode in ("per-session", "per-session + clients"):
+        heap, rss = results[mode]
+        print(f"sharing vs {mode}: saves {(heap - shared_heap) / 1024:.2f} KiB heap and "
+              f"{(rss - shared_rss) / 1024:.0f} KiB RSS per session "
+              f"({(rss - shared_rss) * args.sessions / 1024 / 1024:.1f} MiB RSS for {args.sessions} sessions)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Measure cold-start cost of the app: import time per module and time to first render.
+
+The import report runs `python -X importtime` in a fresh interpreter and lists
+the slowest imports by cumulative time. The first-render timer runs the whole
+script once with Streamlit's AppTest harness, also in a fresh interpreter, so
+every run starts cold.
+
+Usage:
+    python benchmarks/bench_startup.py --top 15 --runs 3 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPT = os.path.join(REPO_ROOT, "updated_Mock_AI.py")
+
+FIRST_RENDER_CODE = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({script!r}, default_timeout=120)
+app.run()
+print(time.perf_counter() - start)
+"""
+
+
+def import_times(modules):
+    """
+    Run `python -X importtime` for the given modules.
+
+    Args:
+        modules (list): Module names to import
+
+    Returns:
+        list: (module, self_us, cumulative_us) tuples in import order
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "; ".join(f"import {module}" for module in modules)],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def first_render_time():
+    """
+    Time one cold run of the app script up to the end of its first render.
+
+    Returns:
+        float: Seconds from interpreter start-up of the harness to render completion
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_RENDER_CODE.format(script=APP_SCRIPT)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report app import and first-render times.")
+    parser.add_argument("--modules", nargs="+",
+                        default=["model_interface", "ui_components", "tts_cache", "evaluation", "transcript"],
+                        help="Modules to profile with -X importtime")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument("--runs", type=int, default=3, help="Cold first-render runs")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    rows = import_times(args.modules)
+    total_us = sum(self_us for _, self_us, _ in rows)
+    print(f"Total import time: {total_us / 1000:.1f} ms over {len(rows)} modules")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+
+    render_times = []
+    if args.runs:
+        render_times = [first_render_time() for _ in range(args.runs)]
+        print(f"First render: median {statistics.median(render_times):.2f} s over {len(render_times)} runs "
+              f"(min {min(render_times):.2f} s, max {max(render_times):.2f} s)")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "import_total_ms": total_us / 1000,
+                "imports": [{"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000}
+                            for name, self_us, cumulative_us in rows],
+                "first_render_s": render_times
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
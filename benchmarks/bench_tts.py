@@ -0,0 +1,81 @@
+"""
+Compare per-utterance synthesis cost of the old temp-file path and the in-memory path.
+
+"before" reproduces the previous flow: synthesize, save to temp_speech_<uuid>
+on disk, read it back for playback, delete it. "after" synthesizes straight
+into memory. Disk traffic is read from /proc/self/io where available (Linux).
+
+Usage:
+    python benchmarks/bench_tts.py --backend offline --utterances 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interview_data import interview_tracks  # noqa: E402
+from tts_backends import TTS_BACKENDS, create_tts_backend  # noqa: E402
+
+
+def read_io_counters():
+    """
+    Read this process's I/O counters.
+
+    Returns:
+        dict: Counter values, empty when /proc/self/io is unavailable
+    """
+    try:
+        with open("/proc/self/io") as f:
+            return {name: int(value) for name, value in (line.split(": ") for line in f)}
+    except OSError:
+        return {}
+
+
+def synthesize_via_temp_file(backend, text):
+    temp_audio_file = f"temp_speech_{uuid4().hex}.mp3"
+    with open(temp_audio_file, "wb") as f:
+        f.write(backend.synthesize(text, "en", "com"))
+    with open(temp_audio_file, "rb") as f:
+        audio = f.read()
+    os.remove(temp_audio_file)
+    return audio
+
+
+def synthesize_in_memory(backend, text):
+    return backend.synthesize(text, "en", "com")
+
+
+def measure(label, fn, backend, texts):
+    before = read_io_counters()
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        fn(backend, text)
+        latencies.append((time.perf_counter() - start) * 1000)
+    after = read_io_counters()
+    io = {name: after[name] - before[name] for name in ("wchar", "rchar", "syscw", "syscr") if name in after}
+    per_utterance = {name: value / len(texts) for name, value in io.items()}
+    print(f"{label:<7} mean={statistics.mean(latencies):7.3f} ms  p50={statistics.median(latencies):7.3f} ms  "
+          f"io/utterance={ {name: round(value) for name, value in per_utterance.items()} }")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark temp-file vs in-memory speech synthesis.")
+    parser.add_argument("--backend", choices=sorted(TTS_BACKENDS), default="offline", help="TTS engine")
+    parser.add_argument("--utterances", type=int, default=200, help="Utterances per mode")
+    args = parser.parse_args()
+
+    backend = create_tts_backend(args.backend)
+    questions = [question for track in interview_tracks.values() for question in track]
+    texts = [questions[i % len(questions)] for i in range(args.utterances)]
+
+    measure("before", synthesize_via_temp_file, backend, texts)
+    measure("after", synthesize_in_memory, backend, texts)
+
+
+if __name__ == "__main__":
+    main()
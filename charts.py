@@ -0,0 +1,124 @@
+import io
+from functools import lru_cache
+
+from evaluation import MAX_SCORE
+
+# Colour ramp resolution: one entry per hundredth of a point
+RAMP_STEPS_PER_POINT = 100
+GAUGE_SEGMENTS = 50
+BAR_COLOR = "#8F00FF"
+# Distinct score vectors whose charts are kept
+CHART_CACHE_SIZE = 256
+
+
+def _score_color(value):
+    # Red at 0, yellow at 5, green at 10
+    if value <= 5:
+        t = value / 5
+        r, g = 255, int(0 + 255 * t)
+    else:
+        t = (value - 5) / 5
+        r, g = int(255 - 255 * t), 255
+    return f"#{r:02X}{g:02X}00"
+
+
+SCORE_COLOR_RAMP = tuple(_score_color(i / RAMP_STEPS_PER_POINT)
+                         for i in range(MAX_SCORE * RAMP_STEPS_PER_POINT + 1))
+
+
+def score_color(value):
+    """
+    Look up the gauge colour for a score.
+
+    Args:
+        value (float): Score between 0 and 10
+
+    Returns:
+        str: Hex colour from the precomputed ramp
+    """
+    value = min(max(value, 0), MAX_SCORE)
+    return SCORE_COLOR_RAMP[int(round(value * RAMP_STEPS_PER_POINT))]
+
+
+def gauge_steps(overall_score, segments=GAUGE_SEGMENTS):
+    """
+    Build the coloured bands filling the gauge up to the score.
+
+    Args:
+        overall_score (float): Score between 0 and 10
+        segments (int): Bands used for the gradient
+
+    Returns:
+        list: Plotly gauge step dicts
+    """
+    steps = []
+    if overall_score > 0:
+        delta = overall_score / segments
+        for index in range(segments):
+            start, end = index * delta, overall_score if index == segments - 1 else (index + 1) * delta
+            steps.append({"range": [start, end], "color": score_color((start + end) / 2)})
+    steps.append({"range": [overall_score, MAX_SCORE], "color": "rgba(0,0,0,0)"})
+    return steps
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def gauge_figure(overall_score):
+    """
+    Build the overall-score gauge, memoized on the score.
+
+    The returned figure is shared between callers and must not be modified.
+
+    Args:
+        overall_score (float): Average score between 0 and 10
+
+    Returns:
+        plotly.graph_objects.Figure: The gauge
+    """
+    import plotly.graph_objects as go
+
+    figure = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=overall_score,
+        gauge={
+            "axis": {"range": [0, MAX_SCORE], "tickmode": "array", "tickvals": [1.5, 5.5, 8.5],
+                     "ticktext": ["Bad", "Average", "Good"]},
+            "bar": {"color": "rgba(0,0,0,0)"},
+            "steps": gauge_steps(overall_score),
+            "bgcolor": "rgba(128, 128, 128, 1)",
+            "borderwidth": 0,
+            "bordercolor": "rgba(0,0,0,0)"
+        }
+    ))
+    figure.update_layout(width=300, height=250, margin=dict(l=20, r=20, t=50, b=20))
+    return figure
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def score_chart_png(scores):
+    """
+    Render the per-question bar chart to PNG, memoized on the scores.
+
+    The figure is built without pyplot, so it is not registered globally
+    and is freed as soon as it has been rendered.
+
+    Args:
+        scores (tuple): Score per question, 0 to 10
+
+    Returns:
+        bytes: PNG image
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(5, 3))
+    FigureCanvasAgg(figure)
+    ax = figure.subplots()
+    ax.bar([f"Q{i + 1}" for i in range(len(scores))], scores, color=BAR_COLOR)
+    ax.set_title("Interview Evaluation Scores", fontsize=14)
+    ax.set_xlabel("Questions", fontsize=12)
+    ax.set_ylabel("Score (out of 10)", fontsize=12)
+    ax.set_ylim([0, MAX_SCORE])
+    figure.tight_layout()
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png")
+    return buffer.getvalue()
@@ -0,0 +1,206 @@
+import json
+import re
+
+from prompt_budget import PromptBuilder
+from prompts import INTERVIEWER_SYSTEM_MESSAGE
+from telemetry import get_tracer
+
+# Models sometimes wrap JSON in prose or code fences; take the outermost object
+JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+MAX_SCORE = 10
+
+
+class EvaluationParseError(ValueError):
+    """Raised when a model's evaluation is not valid structured output."""
+
+
+def _load_json_object(evaluation):
+    match = JSON_OBJECT.search(evaluation)
+    if not match:
+        raise EvaluationParseError("Evaluation does not contain a JSON object")
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError as e:
+        raise EvaluationParseError(f"Evaluation is not valid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise EvaluationParseError("Evaluation JSON must be an object")
+    return data
+
+
+def _validate_result(data):
+    score = data.get("score")
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0 <= score <= MAX_SCORE:
+        raise EvaluationParseError(f"Score must be a number between 0 and {MAX_SCORE}, got {score!r}")
+    feedback = data.get("feedback")
+    if not isinstance(feedback, str) or not feedback.strip():
+        raise EvaluationParseError("Feedback must be a non-empty string")
+    return {"score": int(round(score)), "feedback": feedback.strip()}
+
+
+def parse_question_evaluation(evaluation):
+    """
+    Parse and validate the structured evaluation of a single answer.
+
+    Args:
+        evaluation (str): Model output
+
+    Returns:
+        dict: Validated "score" and "feedback"
+
+    Raises:
+        EvaluationParseError: If the output is not valid structured scoring
+    """
+    return _validate_result(_load_json_object(evaluation))
+
+
+def parse_transcript_evaluation(evaluation, count):
+    """
+    Parse and validate the structured evaluation of a whole transcript.
+
+    Args:
+        evaluation (str): Model output
+        count (int): Number of questions that were evaluated
+
+    Returns:
+        tuple: (list of validated results in question order, overall feedback)
+
+    Raises:
+        EvaluationParseError: If the output is invalid or misses a question
+    """
+    data = _load_json_object(evaluation)
+    questions = data.get("questions")
+    if not isinstance(questions, list):
+        raise EvaluationParseError('Evaluation JSON must contain a "questions" list')
+    results = {}
+    for item in questions:
+        if not isinstance(item, dict):
+            raise EvaluationParseError("Each question evaluation must be an object")
+        number = item.get("number")
+        if isinstance(number, bool) or not isinstance(number, int) or not 1 <= number <= count:
+            raise EvaluationParseError(f"Question number must be between 1 and {count}, got {number!r}")
+        results[number] = _validate_result(item)
+    missing = [number for number in range(1, count + 1) if number not in results]
+    if missing:
+        raise EvaluationParseError(f"Evaluation is missing questions {missing}")
+    overall = data.get("overall_feedback")
+    return [results[number] for number in range(1, count + 1)], overall if isinstance(overall, str) else ""
+
+
+def _discard_and_raise(model, prompt, error):
+    # Keep a malformed answer out of any response cache so a retry asks again
+    model.discard_response(prompt, INTERVIEWER_SYSTEM_MESSAGE)
+    raise error
+
+
+def evaluate_entry(model, entry):
+    """
+    Score a single transcript entry, storing the result on it.
+
+    Args:
+        model (AIModelInterface): Model used as the evaluator
+        entry (TranscriptEntry): Entry to score
+
+    Returns:
+        TranscriptEntry: The scored entry
+
+    Raises:
+        EvaluationParseError: If the model does not return valid scoring
+    """
+    prompt = PromptBuilder.for_model(model).question_evaluation_prompt(entry.question, entry.combined_answer)
+    with get_tracer().span("evaluation", model=model.name, question_id=entry.question_id):
+        try:
+            result = parse_question_evaluation(model.generate_response(prompt, INTERVIEWER_SYSTEM_MESSAGE))
+        except EvaluationParseError as e:
+            _discard_and_raise(model, prompt, e)
+    entry.score, entry.feedback = result["score"], result["feedback"]
+    return entry
+
+
+async def aevaluate_entry(model, entry):
+    """
+    Async variant of evaluate_entry.
+    """
+    prompt = PromptBuilder.for_model(model).question_evaluation_prompt(entry.question, entry.combined_answer)
+    with get_tracer().span("evaluation", model=model.name, question_id=entry.question_id):
+        try:
+            result = parse_question_evaluation(await model.agenerate_response(prompt, INTERVIEWER_SYSTEM_MESSAGE))
+        except EvaluationParseError as e:
+            _discard_and_raise(model, prompt, e)
+    entry.score, entry.feedback = result["score"], result["feedback"]
+    return entry
+
+
+def _apply_transcript_evaluation(model, prompt, transcript, evaluation):
+    try:
+        results, overall = parse_transcript_evaluation(evaluation, len(transcript))
+    except EvaluationParseError as e:
+        _discard_and_raise(model, prompt, e)
+    for entry, result in zip(transcript, results):
+        entry.score, entry.feedback = result["score"], result["feedback"]
+    return aggregate_evaluations(transcript, overall)
+
+
+def evaluate_transcript(model, transcript):
+    """
+    Evaluate a whole transcript in one model call, storing scores on the entries.
+
+    Args:
+        model (AIModelInterface): Model used as the evaluator
+        transcript (list): TranscriptEntry objects
+
+    Returns:
+        tuple: (evaluation report, scores)
+
+    Raises:
+        EvaluationParseError: If the model does not return valid scoring
+    """
+    prompt = PromptBuilder.for_model(model).evaluation_prompt([(i + 1, entry.question, entry.combined_answer)
+                                                               for i, entry in enumerate(transcript)])
+    evaluation = model.generate_response(prompt, INTERVIEWER_SYSTEM_MESSAGE)
+    return _apply_transcript_evaluation(model, prompt, transcript, evaluation)
+
+
+async def aevaluate_transcript(model, transcript):
+    """
+    Async variant of evaluate_transcript.
+    """
+    prompt = PromptBuilder.for_model(model).evaluation_prompt([(i + 1, entry.question, entry.combined_answer)
+                                                               for i, entry in enumerate(transcript)])
+    evaluation = await model.agenerate_response(prompt, INTERVIEWER_SYSTEM_MESSAGE)
+    return _apply_transcript_evaluation(model, prompt, transcript, evaluation)
+
+
+def aggregate_evaluations(transcript, overall_feedback=None):
+    """
+    Build the evaluation report from scored entries without another model call.
+
+    Entries that could not be scored are listed as such and left out of the scores.
+
+    Args:
+        transcript (list): TranscriptEntry objects in question order
+        overall_feedback (str, optional): Summary written by the evaluator; a
+            local summary is used when omitted
+
+    Returns:
+        tuple: (evaluation report, scores of the scored entries)
+    """
+    scored = [entry for entry in transcript if entry.is_scored]
+    scores = [entry.score for entry in scored]
+    lines = []
+    for i, entry in enumerate(transcript):
+        lines.append(
+            f"{i + 1}. Question: {entry.question}\n"
+            f"   Answer: {entry.combined_answer}\n"
+            f"   Score: {entry.score if entry.is_scored else 'not available'}\n"
+            f"   Feedback: {entry.feedback or 'Evaluation failed.'}\n"
+        )
+    if not overall_feedback and scored:
+        best = max(scored, key=lambda entry: entry.score)
+        worst = min(scored, key=lambda entry: entry.score)
+        overall_feedback = (f"Average score {sum(scores) / len(scores):.1f}/{MAX_SCORE}. "
+                            f"Strongest answer: Q{best.question_id}.")
+        if worst.score < best.score:
+            overall_feedback += f" Most room to improve: Q{worst.question_id}."
+    if overall_feedback:
+        lines.append(f"Overall Feedback: {overall_feedback}")
+    return "\n".join(lines), scores
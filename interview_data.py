@@ -0,0 +1,30 @@
+interview_tracks = {
+    "Data Scientist": [
+        "Explain overfitting in machine learning.",
+        "What is the difference between supervised and unsupervised learning?",
+        "How do you handle imbalanced datasets?",
+        "What is feature engineering?",
+        "Explain the bias-variance tradeoff."
+    ],
+    "Software Engineer": [
+        "What is your approach to debugging code?",
+        "Explain multithreading vs multiprocessing.",
+        "What is the concept of clean code?",
+        "How do you ensure code security?",
+        "Explain RESTful APIs."
+    ],
+}
+
+# Difficulty of each built-in question, 1 (easiest) to 5 (hardest), so adaptive interviews have levels to move between
+question_difficulty = {
+    "What is the difference between supervised and unsupervised learning?": 1,
+    "Explain overfitting in machine learning.": 2,
+    "What is feature engineering?": 3,
+    "Explain the bias-variance tradeoff.": 4,
+    "How do you handle imbalanced datasets?": 5,
+    "What is the concept of clean code?": 1,
+    "Explain RESTful APIs.": 2,
+    "What is your approach to debugging code?": 3,
+    "Explain multithreading vs multiprocessing.": 4,
+    "How do you ensure code security?": 5,
+}
@@ -1,6 +1,190 @@
 
+import asyncio
+import os
+import threading
+
+from async_runtime import get_shared_loop, iter_on_shared_loop, run_on_shared_loop, run_sync
+from telemetry import get_tracer
+
+
+# Fan-out policies for ModelRegistry.fan_out
+FIRST_SUCCESS = "first_success"
+COLLECT_ALL = "collect_all"
+# Seconds before each backup model is asked, when scoring is hedged
+DEFAULT_HEDGE_DELAY = float(os.getenv("EVALUATION_HEDGE_DELAY", 2.0))
+
+# Connection limits shared by every provider client in the process
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+
+class ClientPool:
+    """
+    Process-wide cache of provider clients.
+
+    Each provider client is created once and reused by every Streamlit
+    session. HTTP based clients share a single bounded keep-alive
+    connection pool so follow-ups and evaluations reuse open connections
+    instead of paying a new TCP/TLS handshake per call.
+    """
+
+    def __init__(self, max_connections=DEFAULT_MAX_CONNECTIONS,
+                 max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY):
+        """
+        Initialize the client pool.
+
+        Args:
+            max_connections (int): Maximum number of open connections
+            max_keepalive_connections (int): Maximum number of idle connections kept alive
+            keepalive_expiry (float): Seconds an idle connection is kept open
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._http_client = None
+        self._async_http_client = None
+        self._created = 0
+        self._reused = 0
+
+    def get_http_client(self):
+        """
+        Get the shared HTTP client, creating it on first use.
+
+        Returns:
+            httpx.Client: HTTP client with a bounded keep-alive pool
+        """
+        with self._lock:
+            if self._http_client is None:
+                import httpx
+
+                self._http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive_connections,
+                        keepalive_expiry=self.keepalive_expiry
+                    ),
+                    timeout=httpx.Timeout(60.0, connect=10.0)
+                )
+            return self._http_client
+
+    def get_async_http_client(self):
+        """
+        Get the shared async HTTP client, creating it on first use.
+
+        The client must only be used from the shared event loop
+        (see async_runtime.get_shared_loop).
+
+        Returns:
+            httpx.AsyncClient: Async HTTP client with a bounded keep-alive pool
+        """
+        with self._lock:
+            if self._async_http_client is None:
+                import httpx
+
+                self._async_http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive_connections,
+                        keepalive_expiry=self.keepalive_expiry
+                    ),
+                    timeout=httpx.Timeout(60.0, connect=10.0)
+                )
+            return self._async_http_client
+
+    def get_client(self, key, factory):
+        """
+        Get the client stored under key, building it with factory on first use.
+
+        Args:
+            key (str): Identifier of the client (e.g. provider name)
+            factory (callable): Zero-argument callable that builds the client
+
+        Returns:
+            object: The cached client
+        """
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._reused += 1
+                return client
+
+        # Build outside the lock so a slow import does not block other providers
+        client = factory()
+        with self._lock:
+            if key in self._clients:
+                self._reused += 1
+                return self._clients[key]
+            self._clients[key] = client
+            self._created += 1
+            return client
+
+    def get_stats(self):
+        """
+        Get usage statistics for the pool.
+
+        Returns:
+            dict: Client counts, reuse counters and connection limits
+        """
+        with self._lock:
+            return {
+                "clients": sorted(self._clients),
+                "created": self._created,
+                "reused": self._reused,
+                "http_client_open": self._http_client is not None and not self._http_client.is_closed,
+                "async_http_client_open": (self._async_http_client is not None
+                                           and not self._async_http_client.is_closed),
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "keepalive_expiry": self.keepalive_expiry
+            }
+
+    def close(self):
+        """Close the shared HTTP client and drop all cached clients."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            if self._async_http_client is not None:
+                asyncio.run_coroutine_threadsafe(self._async_http_client.aclose(), get_shared_loop())
+            self._http_client = None
+            self._async_http_client = None
+            self._clients = {}
+
+
+_client_pool = ClientPool()
+
+
+def get_client_pool():
+    """
+    Get the process-wide client pool.
+
+    Returns:
+        ClientPool: The shared client pool
+    """
+    return _client_pool
+
+
+def _record_openai_usage(span, usage):
+    # Token counts from an OpenAI response or final stream chunk
+    if usage is not None:
+        span.record_usage(usage.prompt_tokens, usage.completion_tokens)
+
+
+def _record_gemini_usage(span, response):
+    # Token counts from a Gemini response; streamed responses carry them once iterated
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        span.record_usage(usage.prompt_token_count, usage.candidates_token_count)
+
+
 class AIModelInterface:
     """Base interface for all AI models used in the application."""
+
+    # Prompt plus completion tokens the model accepts, used to budget prompts
+    context_window = 8192
     
     def __init__(self, name, description, tier):
         """
@@ -28,6 +212,69 @@ class AIModelInterface:
         """
         raise NotImplementedError("Subclasses must implement this method")
 
+    def generate_response_stream(self, prompt, system_message=None):
+        """
+        Generate a response incrementally, yielding text as it arrives.
+
+        Models without native streaming yield the full response at once.
+
+        Args:
+            prompt (str): The user prompt
+            system_message (str, optional): System message to guide the model
+
+        Yields:
+            str: Consecutive chunks of the generated response
+        """
+        yield self.generate_response(prompt, system_message)
+
+    async def agenerate_response(self, prompt, system_message=None):
+        """
+        Async variant of generate_response.
+
+        The request runs on the shared event loop, so the caller's thread is
+        never held while waiting on the network.
+
+        Args:
+            prompt (str): The user prompt
+            system_message (str, optional): System message to guide the model
+
+        Returns:
+            str: Generated response
+        """
+        return await run_on_shared_loop(self._agenerate_response(prompt, system_message))
+
+    async def agenerate_response_stream(self, prompt, system_message=None):
+        """
+        Async variant of generate_response_stream.
+
+        Args:
+            prompt (str): The user prompt
+            system_message (str, optional): System message to guide the model
+
+        Yields:
+            str: Consecutive chunks of the generated response
+        """
+        async for chunk in iter_on_shared_loop(self._agenerate_response_stream(prompt, system_message)):
+            yield chunk
+
+    async def _agenerate_response(self, prompt, system_message=None):
+        # Models without an async client run the blocking call on a worker thread
+        return await asyncio.to_thread(self.generate_response, prompt, system_message)
+
+    async def _agenerate_response_stream(self, prompt, system_message=None):
+        yield await self._agenerate_response(prompt, system_message)
+
+    def discard_response(self, prompt, system_message=None):
+        """
+        Forget any stored response for this prompt, e.g. after it failed validation.
+
+        Models without a response cache have nothing to discard.
+
+        Args:
+            prompt (str): The user prompt
+            system_message (str, optional): System message used with the prompt
+        """
+
     def get_info(self):
         """
         Get information about the model.
@@ -38,7 +285,8 @@ class AIModelInterface:
         return {
             "name": self.name,
             "description": self.description,
-            "tier": self.tier
+            "tier": self.tier,
+            "context_window": self.context_window
         }
 
 
@@ -52,34 +300,111 @@ class GPT4Model(AIModelInterface):
             tier="corporate"
         )
 
+    def _get_client(self):
+        """
+        Get the shared OpenAI client, creating it once per process.
+
+        Returns:
+            OpenAI: OpenAI client bound to the shared connection pool
+        """
+        pool = get_client_pool()
+
+        def build_client():
+            from openai import OpenAI
+
+            # The API key is read once, when the client is first created. Retries are
+            # left to ResilientModel so they share its rate limit, deadline and breaker.
+            return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=pool.get_http_client(), max_retries=0)
+
+        return pool.get_client("openai", build_client)
+
+    def _get_async_client(self):
+        """
+        Get the shared AsyncOpenAI client, creating it once per process.
+
+        Returns:
+            AsyncOpenAI: Async OpenAI client bound to the shared connection pool
+        """
+        pool = get_client_pool()
+
+        def build_client():
+            from openai import AsyncOpenAI
+
+            return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=pool.get_async_http_client(),
+                               max_retries=0)
+
+        return pool.get_client("openai-async", build_client)
+
+    def _build_messages(self, prompt, system_message=None):
+        return [
+            {"role": "system", "content": system_message or "You are a professional interviewer."},
+            {"role": "user", "content": prompt}
+        ]
+
     def generate_response(self, prompt, system_message=None):
         """
         Generate a response using GPT-4 API.
         """
-        import openai
-        import os
-        from openai import OpenAI
+        client = self._get_client()
+
+        with get_tracer().span("llm", model=self.name, stream=False) as span:
+            # Make the actual API call using the new client interface
+            response = client.chat.completions.create(
+                model="gpt-4",
+                messages=self._build_messages(prompt, system_message)
+            )
+            _record_openai_usage(span, response.usage)
+        return response.choices[0].message.content.strip()
 
-        # Ensure API key is loaded
-        api_key = os.getenv("OPENAI_API_KEY")
-        
-        # Create the OpenAI client
-        client = OpenAI(api_key=api_key)
-
-        # Make the actual API call using the new client interface
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_message or "You are a professional interviewer."},
-                {"role": "user", "content": prompt}
-            ]
-        )
+    def generate_response_stream(self, prompt, system_message=None):
+        """
+        Stream a response from the GPT-4 API, yielding text deltas as they arrive.
+        """
+        client = self._get_client()
+
+        with get_tracer().span("llm", model=self.name, stream=True) as span:
+            stream = client.chat.completions.create(
+                model="gpt-4",
+                messages=self._build_messages(prompt, system_message),
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                # Usage arrives on a final chunk without choices
+                _record_openai_usage(span, chunk.usage)
+
+    async def _agenerate_response(self, prompt, system_message=None):
+        client = self._get_async_client()
+        with get_tracer().span("llm", model=self.name, stream=False) as span:
+            response = await client.chat.completions.create(
+                model="gpt-4",
+                messages=self._build_messages(prompt, system_message)
+            )
+            _record_openai_usage(span, response.usage)
         return response.choices[0].message.content.strip()
 
+    async def _agenerate_response_stream(self, prompt, system_message=None):
+        client = self._get_async_client()
+        with get_tracer().span("llm", model=self.name, stream=True) as span:
+            stream = await client.chat.completions.create(
+                model="gpt-4",
+                messages=self._build_messages(prompt, system_message),
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                _record_openai_usage(span, chunk.usage)
+
 
 class GeminiModel(AIModelInterface):
     """Implementation for Gemini model (Personal tier)."""
 
+    context_window = 1048576
+
     def __init__(self):
         super().__init__(
             name="Gemini",
@@ -87,82 +412,135 @@ class GeminiModel(AIModelInterface):
             tier="personal"
         )
 
-    def generate_response(self, prompt, system_message=None):
+    def _get_client(self):
         """
-        Generate a response using Google's Gemini API.
+        Get the shared Gemini model client, configuring the SDK once per process.
+
+        Returns:
+            GenerativeModel: Gemini 2.0 Flash client
         """
-        import google.generativeai as genai
-        import os
+        def build_client():
+            import google.generativeai as genai
 
-        # Ensure API key is loaded
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+            # Ensure API key is loaded
+            genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
-        try:
             # Use Gemini 2.0 Flash model
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            
-            # Format the prompt with system message
-            formatted_prompt = f"{system_message or 'You are a professional interviewer.'}\n\nUser: {prompt}\n\nAssistant:"
+            return genai.GenerativeModel('gemini-2.0-flash')
 
-            # Make the API call
-            response = model.generate_content(formatted_prompt)
+        return get_client_pool().get_client("gemini", build_client)
 
-            # Return the generated text
-            return response.text.strip()
-        except Exception as e:
-            return f"An error occurred: {str(e)}"
+    def _format_prompt(self, prompt, system_message=None):
+        # Format the prompt with system message
+        return f"{system_message or 'You are a professional interviewer.'}\n\nUser: {prompt}\n\nAssistant:"
+
+    def generate_response(self, prompt, system_message=None):
+        """
+        Generate a response using Google's Gemini API.
+        """
+        model = self._get_client()
+
+        with get_tracer().span("llm", model=self.name, stream=False) as span:
+            # Make the API call; failures propagate so callers can retry or fail over
+            response = model.generate_content(self._format_prompt(prompt, system_message))
+            _record_gemini_usage(span, response)
+
+        # Return the generated text
+        return response.text.strip()
+
+    def generate_response_stream(self, prompt, system_message=None):
+        """
+        Stream a response from Google's Gemini API, yielding text as it arrives.
+        """
+        model = self._get_client()
+        with get_tracer().span("llm", model=self.name, stream=True) as span:
+            response = model.generate_content(self._format_prompt(prompt, system_message), stream=True)
+            for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+            _record_gemini_usage(span, response)
+
+    async def _agenerate_response(self, prompt, system_message=None):
+        model = self._get_client()
+        with get_tracer().span("llm", model=self.name, stream=False) as span:
+            response = await model.generate_content_async(self._format_prompt(prompt, system_message))
+            _record_gemini_usage(span, response)
+        return response.text.strip()
+
+    async def _agenerate_response_stream(self, prompt, system_message=None):
+        model = self._get_client()
+        with get_tracer().span("llm", model=self.name, stream=True) as span:
+            response = await model.generate_content_async(self._format_prompt(prompt, system_message), stream=True)
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+            _record_gemini_usage(span, response)
 
 
 # Model registry to store all available models
 class ModelRegistry:
-    """Registry for all available AI models in the application."""
+    """
+    Registry for all available AI models in the application.
+
+    One registry is shared by every session in the process. Models are
+    registered once at start-up and are stateless, so lookups need no lock;
+    which model a session uses is kept by the session, not here.
+    """
 
     def __init__(self):
         self.models = {}
-        self.current_model = None
+        # Model used when a caller does not name one
+        self.default_model = None
+        # Resilience wrappers by model name, used as failover candidates
+        self.resilient_models = {}
+
+    def _failover_candidates(self, name):
+        tier = self.resilient_models[name].tier
+        return [model for other, model in self.resilient_models.items() if other != name and model.tier == tier]
 
-    def register_model(self, model):
+    def register_model(self, model, cache=None, resilient=False, should_cache=None):
         """
         Register a model in the registry.
 
         Args:
             model (AIModelInterface): Model to register
+            cache (ResponseCache, optional): Cache that memoizes the model's responses
+            should_cache (callable, optional): Takes a prompt and returns whether it is cached;
+                None caches every prompt
+            resilient (bool): Add rate limiting, retries, deadlines and failover
+                to other resilient models of the same tier
         """
+        if resilient:
+            from resilience import ResilientModel
+
+            name = model.name
+            model = ResilientModel(model, fallbacks=lambda: self._failover_candidates(name))
+            self.resilient_models[name] = model
+        # Cache outermost, so cache hits do not spend rate-limit tokens
+        if cache is not None:
+            from response_cache import CachedModel
+
+            model = CachedModel(model, cache, should_cache)
         self.models[model.name] = model
 
-        # Set as current model if none is selected
-        if self.current_model is None:
-            self.current_model = model.name
+        # The first model registered is the default
+        if self.default_model is None:
+            self.default_model = model.name
 
     def get_model(self, name=None):
         """
-        Get a model by name or the current model if name is None.
+        Get a model by name or the default model if name is None.
 
         Args:
-            name (str, optional): Name of the model to get
+            name (str, optional): Name of the model to get, e.g. a session's selection
 
         Returns:
             AIModelInterface: The requested model
         """
         if name is None:
-            return self.models[self.current_model]
+            return self.models[self.default_model]
         return self.models[name]
 
-    def set_current_model(self, name):
-        """
-        Set the current model.
-
-        Args:
-            name (str): Name of the model to set as current
-
-        Returns:
-            bool: True if successful, False otherwise
-        """
-        if name in self.models:
-            self.current_model = name
-            return True
-        return False
-
     def get_models_by_tier(self, tier):
         """
         Get all models for a specific tier.
@@ -184,19 +562,194 @@ class ModelRegistry:
         """
         return list(self.models.values())
 
+    def tier_peers(self, name):
+        """
+        Get a model's name followed by the other models of its tier.
+
+        Fan-out never leaves the tier, so a personal-tier session is not
+        billed for a corporate model.
+
+        Args:
+            name (str): Primary model name
+
+        Returns:
+            list: Model names in priority order, the primary first
+        """
+        tier = self.models[name].tier
+        return [name] + [other for other, model in self.models.items() if other != name and model.tier == tier]
+
+    def hedged(self, name, hedge_delay=DEFAULT_HEDGE_DELAY):
+        """
+        Get a model that hedges each request across the named model's tier.
+
+        Args:
+            name (str): Primary model name
+            hedge_delay (float): Seconds to wait before asking each backup model
+
+        Returns:
+            AIModelInterface: A HedgedModel, or the model itself when its tier has no other model
+        """
+        names = self.tier_peers(name)
+        if len(names) == 1:
+            return self.models[name]
+        return HedgedModel(self, names, hedge_delay)
+
+    async def afan_out(self, prompt, system_message=None, names=None, policy=FIRST_SUCCESS,
+                       timeout=None, hedge_delay=0.0, tier=None):
+        """
+        Send a prompt to several models at once.
+
+        With FIRST_SUCCESS the first successful response wins and the other
+        requests are cancelled (hedged requests). With COLLECT_ALL every
+        response that arrives before the timeout is returned.
+
+        Args:
+            prompt (str): The user prompt
+            system_message (str, optional): System message to guide the models
+            names (list, optional): Models to query in priority order, defaults to every model of tier
+            policy (str): FIRST_SUCCESS or COLLECT_ALL
+            timeout (float, optional): Deadline in seconds for the whole fan-out
+            hedge_delay (float): Seconds to wait before starting each backup
+                model, so a fast primary avoids paying for the others
+            tier (str, optional): Tier queried when names is omitted, defaults to the default model's tier
+
+        Returns:
+            dict: Winning model and response, all responses, errors,
+                per-model latencies in seconds and cancelled models
+        """
+        if policy not in (FIRST_SUCCESS, COLLECT_ALL):
+            raise ValueError(f"Unknown fan-out policy: {policy}")
+        if not names:
+            tier = tier or self.models[self.default_model].tier
+            names = [model.name for model in self.get_models_by_tier(tier)]
+        names = list(names)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        latencies = {}
+
+        async def call(index, name):
+            if index and hedge_delay:
+                await asyncio.sleep(index * hedge_delay)
+            try:
+                return await self.models[name].agenerate_response(prompt, system_message)
+            finally:
+                latencies[name] = loop.time() - start
+
+        tasks = {asyncio.create_task(call(index, name)): name for index, name in enumerate(names)}
+        pending = set(tasks)
+        result = {"policy": policy, "model": None, "response": None, "responses": {}, "errors": {},
+                  "latencies": latencies, "cancelled": []}
+        try:
+            while pending:
+                remaining = None if timeout is None else start + timeout - loop.time()
+                if remaining is not None and remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                # Handle completions in priority order when several finish together
+                for task in sorted(done, key=lambda t: names.index(tasks[t])):
+                    name = tasks[task]
+                    if task.exception() is not None:
+                        result["errors"][name] = str(task.exception())
+                        continue
+                    result["responses"][name] = task.result()
+                    if result["model"] is None:
+                        result["model"] = name
+                        result["response"] = task.result()
+                if policy == FIRST_SUCCESS and result["model"] is not None:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        result["cancelled"] = [name for task, name in tasks.items() if task in pending]
+        for name in result["cancelled"]:
+            # Only report latencies of requests that actually finished
+            latencies.pop(name, None)
+        return result
+
+    def fan_out(self, prompt, system_message=None, names=None, policy=FIRST_SUCCESS,
+                timeout=None, hedge_delay=0.0, tier=None):
+        """
+        Blocking variant of afan_out; see afan_out for arguments and result.
+        """
+        return run_sync(self.afan_out(prompt, system_message, names, policy, timeout, hedge_delay, tier))
+
+
+class HedgedModel(AIModelInterface):
+    """
+    Sends each request to a primary model and, if it is slow, to backups of the same tier.
+
+    The first successful response wins and the other requests are cancelled,
+    which cuts tail latency at the cost of the occasional duplicate call.
+    Used for background scoring, where any model of the tier may answer.
+    """
+
+    def __init__(self, registry, names, hedge_delay=DEFAULT_HEDGE_DELAY):
+        """
+        Initialize the hedged model.
+
+        Args:
+            registry (ModelRegistry): Registry the models are looked up in
+            names (list): Model names in priority order, the primary first
+            hedge_delay (float): Seconds to wait before asking each backup model
+        """
+        primary = registry.get_model(names[0])
+        super().__init__(name=primary.name, description=primary.description, tier=primary.tier)
+        self.registry = registry
+        self.names = list(names)
+        self.hedge_delay = hedge_delay
+        # Prompts are built for the model with the smallest window, so any of them can answer
+        self.context_window = min(registry.get_model(name).context_window for name in self.names)
+
+    def generate_response(self, prompt, system_message=None):
+        return run_sync(self.agenerate_response(prompt, system_message))
+
+    async def _agenerate_response(self, prompt, system_message=None):
+        result = await self.registry.afan_out(prompt, system_message, self.names, FIRST_SUCCESS,
+                                              hedge_delay=self.hedge_delay)
+        if result["model"] is None:
+            raise RuntimeError(f"Every hedged model failed: {result['errors']}")
+        return result["response"]
+
+    def discard_response(self, prompt, system_message=None):
+        for name in self.names:
+            self.registry.get_model(name).discard_response(prompt, system_message)
+
+
+# Models whose responses may be memoized; RESPONSE_CACHE_SCOPE picks which prompts are
+DEFAULT_CACHED_MODELS = ("GPT-4", "Gemini")
+
 
 # Initialize the model registry with available models
-def initialize_models():
+def initialize_models(cached_models=DEFAULT_CACHED_MODELS, resilient=True, cache_scope=None):
     """
     Initialize and register all available models.
 
+    Args:
+        cached_models (iterable, optional): Names of models whose responses
+            are served from the shared response cache; empty disables caching
+        resilient (bool): Wrap every model with rate limiting, retries and failover
+        cache_scope (str, optional): Prompts to cache: "evaluation" (scoring
+            only), "all" or "off"; defaults to RESPONSE_CACHE_SCOPE
+
     Returns:
         ModelRegistry: Initialized model registry
     """
+    from response_cache import CACHE_SCOPES, DEFAULT_SCOPE, get_response_cache
+
+    cache_scope = cache_scope or DEFAULT_SCOPE
+    if cache_scope != "off" and cache_scope not in CACHE_SCOPES:
+        raise ValueError(f"Unknown response cache scope: {cache_scope}")
     registry = ModelRegistry()
+    cache = get_response_cache() if cached_models and cache_scope != "off" else None
 
     # Register models
-    registry.register_model(GPT4Model())
-    registry.register_model(GeminiModel())
-    
+    for model in [GPT4Model(), GeminiModel()]:
+        registry.register_model(model, cache=cache if model.name in cached_models else None, resilient=resilient,
+                                should_cache=CACHE_SCOPES.get(cache_scope))
+
     return registry
\ No newline at end of file
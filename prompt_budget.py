@@ -0,0 +1,215 @@
+import os
+import re
+from functools import lru_cache
+
+from prompts import build_evaluation_prompt, build_followup_prompt, build_question_evaluation_prompt
+
+# Upper bound on prompt size regardless of the model's window, to cap latency and cost
+DEFAULT_MAX_PROMPT_TOKENS = int(os.getenv("PROMPT_MAX_TOKENS", 6000))
+# Tokens kept free in the context window for the model's reply
+DEFAULT_RESERVED_OUTPUT_TOKENS = 1024
+# Share of the prompt budget given to earlier turns when asking for a follow-up
+DEFAULT_HISTORY_TOKENS = int(os.getenv("PROMPT_HISTORY_TOKENS", 1200))
+# Latest turns quoted in full; older ones are condensed
+DEFAULT_RECENT_TURNS = 2
+SUMMARY_ANSWER_TOKENS = 40
+MIN_ANSWER_TOKENS = 20
+ELLIPSIS = " …"
+
+# Words, numbers and individual punctuation marks each cost at least one token
+TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=4096)
+def estimate_tokens(text):
+    """
+    Estimate the token count of text without calling a tokenizer.
+
+    BPE tokenizers average about four characters per token on English, and
+    never produce fewer tokens than words plus punctuation marks; the larger
+    of the two keeps the estimate on the safe side.
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Estimated tokens
+    """
+    return max(len(text) // 4, len(TOKEN_PIECES.findall(text)))
+
+
+def truncate_to_tokens(text, max_tokens):
+    """
+    Cut text to at most max_tokens estimated tokens, on a word boundary.
+
+    Args:
+        text (str): Text to shorten
+        max_tokens (int): Token limit
+
+    Returns:
+        str: The text, or its head followed by an ellipsis
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    words = text.split()
+    low, high = 0, len(words)
+    # Longest prefix of words that fits together with the ellipsis
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(" ".join(words[:middle]) + ELLIPSIS) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return " ".join(words[:low]) + ELLIPSIS
+
+
+class ContextBudget:
+    """Prompt token budget for one model."""
+
+    def __init__(self, context_window, reserved_output_tokens=DEFAULT_RESERVED_OUTPUT_TOKENS,
+                 max_prompt_tokens=DEFAULT_MAX_PROMPT_TOKENS):
+        """
+        Initialize the budget.
+
+        Args:
+            context_window (int): Tokens the model accepts in total
+            reserved_output_tokens (int): Tokens left free for the reply
+            max_prompt_tokens (int): Cap on prompt size even for large windows
+        """
+        self.context_window = context_window
+        self.reserved_output_tokens = reserved_output_tokens
+        self.max_prompt_tokens = max_prompt_tokens
+
+    @property
+    def prompt_tokens(self):
+        return min(self.context_window - self.reserved_output_tokens, self.max_prompt_tokens)
+
+    @classmethod
+    def for_model(cls, model, **kwargs):
+        """
+        Build the budget from a model's context window.
+
+        Args:
+            model (AIModelInterface): The model prompts are sent to
+
+        Returns:
+            ContextBudget: The budget
+        """
+        return cls(model.context_window, **kwargs)
+
+
+class PromptBuilder:
+    """
+    Builds prompts that fit a model's context budget.
+
+    Follow-up prompts carry earlier turns: the latest ones in full, older
+    ones condensed to one line each. A condensed line never changes once a
+    turn has aged out of the recent window, so successive prompts share a
+    prefix that provider-side prompt caches can reuse. Evaluation prompts
+    keep every question and shorten the longest answers first.
+    """
+
+    def __init__(self, budget, history_tokens=DEFAULT_HISTORY_TOKENS, recent_turns=DEFAULT_RECENT_TURNS):
+        """
+        Initialize the builder.
+
+        Args:
+            budget (ContextBudget): Token budget of the target model
+            history_tokens (int): Tokens available for earlier turns in follow-up prompts
+            recent_turns (int): Number of latest turns quoted in full
+        """
+        self.budget = budget
+        self.history_tokens = history_tokens
+        self.recent_turns = recent_turns
+
+    @classmethod
+    def for_model(cls, model, **kwargs):
+        return cls(ContextBudget.for_model(model), **kwargs)
+
+    @staticmethod
+    def _condense_turn(entry):
+        return (f"Q{entry.question_id}: {entry.question} "
+                f"A: {truncate_to_tokens(entry.combined_answer, SUMMARY_ANSWER_TOKENS)}")
+
+    @staticmethod
+    def _quote_turn(entry):
+        return entry.to_text()
+
+    def _render_history(self, history):
+        recent = history[-self.recent_turns:] if self.recent_turns else []
+        older = history[:len(history) - len(recent)]
+        budget = self.history_tokens
+        recent_lines = []
+        for entry in reversed(recent):
+            text = self._quote_turn(entry)
+            if estimate_tokens(text) > budget:
+                text = self._condense_turn(entry)
+                if estimate_tokens(text) > budget:
+                    break
+            recent_lines.insert(0, text)
+            budget -= estimate_tokens(text)
+        older_lines = [self._condense_turn(entry) for entry in older]
+        # Drop the oldest condensed turns first when they do not all fit
+        while older_lines and sum(estimate_tokens(line) for line in older_lines) > budget:
+            older_lines.pop(0)
+        omitted = len(older) - len(older_lines)
+        lines = ([f"({omitted} earlier questions omitted)"] if omitted else []) + older_lines + recent_lines
+        return "\n".join(lines)
+
+    def followup_prompt(self, user_response, history=()):
+        """
+        Build the follow-up prompt for an answer, with bounded interview context.
+
+        Args:
+            user_response (str): The candidate's answer
+            history (list): Earlier TranscriptEntry objects, oldest first
+
+        Returns:
+            str: The follow-up prompt
+        """
+        context = self._render_history(list(history)) if history else None
+        overhead = estimate_tokens(build_followup_prompt("", context))
+        answer = truncate_to_tokens(user_response, max(MIN_ANSWER_TOKENS, self.budget.prompt_tokens - overhead))
+        return build_followup_prompt(answer, context)
+
+    def question_evaluation_prompt(self, question, answer):
+        """
+        Build the single-answer evaluation prompt, shortening the answer if needed.
+
+        Returns:
+            str: The evaluation prompt
+        """
+        overhead = estimate_tokens(build_question_evaluation_prompt(question, ""))
+        answer = truncate_to_tokens(answer, max(MIN_ANSWER_TOKENS, self.budget.prompt_tokens - overhead))
+        return build_question_evaluation_prompt(question, answer)
+
+    def evaluation_prompt(self, question_answers):
+        """
+        Build the transcript evaluation prompt within the budget.
+
+        Every question stays in the prompt so it can be scored. When the
+        answers do not fit, they share the remaining budget: short answers
+        are kept whole and the longest are cut to an equal allowance.
+
+        Args:
+            question_answers (list): (number, question, answer) tuples
+
+        Returns:
+            str: The evaluation prompt
+        """
+        question_answers = list(question_answers)
+        fixed = estimate_tokens(build_evaluation_prompt([(number, question, "")
+                                                         for number, question, _ in question_answers]))
+        available = self.budget.prompt_tokens - fixed
+        sizes = sorted(estimate_tokens(answer) for _, _, answer in question_answers)
+        if sum(sizes) <= available:
+            return build_evaluation_prompt(question_answers)
+        # Largest per-answer allowance that keeps the total within budget
+        allowance = MIN_ANSWER_TOKENS
+        for i, size in enumerate(sizes):
+            share = (available - sum(sizes[:i])) // (len(sizes) - i)
+            if size > share:
+                allowance = max(MIN_ANSWER_TOKENS, share)
+                break
+        return build_evaluation_prompt([(number, question, truncate_to_tokens(answer, allowance))
+                                        for number, question, answer in question_answers])
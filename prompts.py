@@ -0,0 +1,86 @@
+INTERVIEWER_SYSTEM_MESSAGE = "You are a professional interviewer. Avoid greetings and keep it focused."
+
+EVALUATION_INSTRUCTIONS = """
+    Evaluate the following interview transcript. Respond with JSON only, in exactly this shape:
+
+    {"questions": [{"number": <question number>, "score": <integer score out of 10>,
+                    "feedback": "<brief one-line feedback>"}],
+     "overall_feedback": "<summary of overall performance>"}
+
+    Include one entry in "questions" for every question below.
+    """
+
+QUESTION_EVALUATION_INSTRUCTIONS = """
+    Evaluate the following interview answer. Respond with JSON only, in exactly this shape:
+
+    {"score": <integer score out of 10>, "feedback": "<brief one-line feedback>"}
+    """
+
+
+FOLLOWUP_INSTRUCTIONS = """
+    Based on the following interview answer, generate a follow-up question with subtle, natural feedback included.
+    Do not explicitly state 'Follow-Up Question:' in your response. Keep it natural and conversational.
+    """
+
+
+def is_evaluation_prompt(prompt):
+    """
+    Tell whether a prompt asks for scoring rather than a follow-up.
+
+    Args:
+        prompt (str): A prompt built by this module
+
+    Returns:
+        bool: True for transcript and single-answer evaluation prompts
+    """
+    return prompt.startswith((EVALUATION_INSTRUCTIONS, QUESTION_EVALUATION_INSTRUCTIONS))
+
+
+def build_followup_prompt(user_response, context=None):
+    """
+    Build the prompt asking for a follow-up question on an answer.
+
+    The instructions come first and earlier turns next, so consecutive
+    prompts in an interview share a growing prefix.
+
+    Args:
+        user_response (str): The candidate's answer
+        context (str, optional): Earlier turns of the interview
+
+    Returns:
+        str: The follow-up prompt
+    """
+    prompt = FOLLOWUP_INSTRUCTIONS
+    if context:
+        prompt += f"Earlier in this interview:\n{context}\n    "
+    return prompt + f"Answer: {user_response}\n    "
+
+
+def build_evaluation_prompt(question_answers):
+    """
+    Build the prompt asking for a scored evaluation of a transcript.
+
+    Args:
+        question_answers (list): (number, question, answer) tuples
+
+    Returns:
+        str: The evaluation prompt
+    """
+    evaluation_prompt = EVALUATION_INSTRUCTIONS
+    for number, question, answer in question_answers:
+        evaluation_prompt += f"\n{number}. Question: {question}\nAnswer: {answer}\n"
+    return evaluation_prompt
+
+
+def build_question_evaluation_prompt(question, answer):
+    """
+    Build the prompt asking for a scored evaluation of a single answer.
+
+    Args:
+        question (str): The interview question
+        answer (str): The candidate's combined answer
+
+    Returns:
+        str: The evaluation prompt
+    """
+    return f"{QUESTION_EVALUATION_INSTRUCTIONS}\nQuestion: {question}\nAnswer: {answer}\n"
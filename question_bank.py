@@ -0,0 +1,451 @@
+import argparse
+import asyncio
+import json
+import mmap
+import os
+import random
+import sqlite3
+import threading
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+
+from async_runtime import get_shared_loop
+
+MIN_DIFFICULTY = 1
+MAX_DIFFICULTY = 5
+DEFAULT_DIFFICULTY = 3
+# Rejection sampling gives up after this many draws per requested question
+MAX_DRAWS_PER_QUESTION = 20
+# Pages SQLite may map into memory instead of reading through its cache
+SQLITE_MMAP_BYTES = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    track TEXT NOT NULL,
+    text TEXT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    tags TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS questions_by_track ON questions (track, difficulty);
+"""
+
+
+@dataclass(frozen=True)
+class Question:
+    """One question of a bank."""
+
+    id: int
+    track: str
+    text: str
+    difficulty: int = DEFAULT_DIFFICULTY
+    tags: tuple = ()
+
+
+class TrackIndex:
+    """
+    Compact index of one track: question ids with their difficulty and tags.
+
+    Positions into `ids` are kept in per-difficulty and per-tag postings, so
+    filtering never touches question text.
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.difficulties = array("b")
+        self.by_difficulty = defaultdict(lambda: array("l"))
+        self.by_tag = defaultdict(lambda: array("l"))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, question_id, difficulty, tags=()):
+        position = len(self.ids)
+        self.ids.append(question_id)
+        self.difficulties.append(difficulty)
+        self.by_difficulty[difficulty].append(position)
+        for tag in tags:
+            self.by_tag[tag].append(position)
+
+    def candidates(self, difficulty=None, tags=None):
+        """
+        Positions of the questions matching the filters.
+
+        Args:
+            difficulty (int or iterable, optional): Accepted difficulty or difficulties
+            tags (iterable, optional): Tags a question must all have
+
+        Returns:
+            sequence: Positions into ids, unfiltered as a range
+        """
+        if difficulty is None and not tags:
+            return range(len(self.ids))
+        postings = []
+        if difficulty is not None:
+            levels = [difficulty] if isinstance(difficulty, int) else list(difficulty)
+            postings.append(sorted(position for level in levels for position in self.by_difficulty.get(level, ())))
+        for tag in tags or ():
+            postings.append(self.by_tag.get(tag, ()))
+        if len(postings) == 1:
+            return postings[0]
+        # Intersect starting from the shortest posting list
+        postings.sort(key=len)
+        matching = set(postings[0])
+        for posting in postings[1:]:
+            matching.intersection_update(posting)
+        return sorted(matching)
+
+
+class QuestionBank:
+    """Base class: builds per-track indexes on first use and samples from them."""
+
+    def __init__(self):
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def tracks(self):
+        """
+        Get the track names.
+
+        Returns:
+            list: Track names in bank order
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def get(self, question_id):
+        """
+        Load one question.
+
+        Returns:
+            Question: The question
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def _build_index(self, track):
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def index(self, track):
+        """
+        Get the track's index, building it on first use.
+
+        Returns:
+            TrackIndex: The index
+
+        Raises:
+            KeyError: If the bank has no such track
+        """
+        index = self._indexes.get(track)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(track)
+                if index is None:
+                    index = self._indexes[track] = self._build_index(track)
+        return index
+
+    def count(self, track, difficulty=None, tags=None):
+        return len(self.index(track).candidates(difficulty, tags))
+
+    def sample(self, track, k, difficulty=None, tags=None, exclude=(), rng=None):
+        """
+        Pick k distinct questions at random, avoiding excluded ids where possible.
+
+        Excluded questions are only used once every other match has been
+        picked, so a candidate hears a question twice only when the bank has
+        run out of new ones.
+
+        Args:
+            track (str): Track to pick from
+            k (int): Number of questions
+            difficulty (int or iterable, optional): Accepted difficulty or difficulties
+            tags (iterable, optional): Tags every question must have
+            exclude (collection, optional): Question ids to avoid, e.g. already asked
+            rng (random.Random, optional): Source of randomness
+
+        Returns:
+            list: Question objects, at most k
+        """
+        rng = rng or random
+        index = self.index(track)
+        pool = index.candidates(difficulty, tags)
+        ids = index.ids
+        exclude = exclude if isinstance(exclude, (set, frozenset)) else set(exclude)
+        chosen = []
+        if len(exclude) < len(pool):
+            # Draw at random and skip repeats; cheap until nearly every match was asked
+            picked = set()
+            for _ in range(k * MAX_DRAWS_PER_QUESTION):
+                if len(chosen) == k:
+                    break
+                question_id = ids[pool[rng.randrange(len(pool))]]
+                if question_id not in exclude and question_id not in picked:
+                    picked.add(question_id)
+                    chosen.append(question_id)
+        if len(chosen) < k:
+            unseen = [ids[position] for position in pool if ids[position] not in exclude]
+            chosen = rng.sample(unseen, min(k, len(unseen)))
+            if len(chosen) < k:
+                seen = [ids[position] for position in pool if ids[position] in exclude]
+                chosen += rng.sample(seen, min(k - len(chosen), len(seen)))
+        return [self.get(question_id) for question_id in chosen]
+
+
+class MemoryQuestionBank(QuestionBank):
+    """Questions held in memory, e.g. the built-in tracks."""
+
+    def __init__(self, questions):
+        """
+        Args:
+            questions (iterable): Question objects
+        """
+        super().__init__()
+        self._questions = {question.id: question for question in questions}
+
+    @classmethod
+    def from_tracks(cls, tracks, difficulty=DEFAULT_DIFFICULTY, difficulties=None):
+        """
+        Build a bank from a {track: [question text]} mapping such as interview_tracks.
+
+        Args:
+            tracks (dict): Track to question texts
+            difficulty (int): Difficulty of questions missing from difficulties
+            difficulties (dict, optional): Question text to difficulty, such as question_difficulty
+
+        Returns:
+            MemoryQuestionBank: The bank
+        """
+        difficulties = difficulties or {}
+        questions = []
+        for track, texts in tracks.items():
+            for text in texts:
+                questions.append(Question(len(questions), track, text, difficulties.get(text, difficulty)))
+        return cls(questions)
+
+    def tracks(self):
+        return list(dict.fromkeys(question.track for question in self._questions.values()))
+
+    def get(self, question_id):
+        return self._questions[question_id]
+
+    def _build_index(self, track):
+        index = TrackIndex()
+        for question in self._questions.values():
+            if question.track == track:
+                index.add(question.id, question.difficulty, question.tags)
+        if not index:
+            raise KeyError(track)
+        return index
+
+
+def _parse_line(line):
+    record = json.loads(line)
+    return record["track"], record["text"], int(record.get("difficulty", DEFAULT_DIFFICULTY)), \
+        tuple(record.get("tags", ()))
+
+
+class JSONLQuestionBank(QuestionBank):
+    """
+    Questions in a JSONL file, read through a shared memory map.
+
+    One question per line:
+    {"track": "Data Scientist", "text": "Explain overfitting.", "difficulty": 2, "tags": ["ml"]}
+
+    A question's id is its line number. The first lookup scans the file once
+    and keeps only line offsets, difficulties and tags; text is parsed from
+    the map when a question is chosen, and the mapped pages are shared by
+    every process reading the same file.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._map = None
+        self._offsets = None
+        self._tracks = None
+
+    def _scan(self):
+        with self._lock:
+            if self._offsets is not None:
+                return
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            offsets, tracks = array("q"), {}
+            position = 0
+            while position < len(self._map):
+                end = self._map.find(b"\n", position)
+                end = len(self._map) if end == -1 else end
+                line = self._map[position:end]
+                if line.strip():
+                    track, _, difficulty, tags = _parse_line(line)
+                    if track not in tracks:
+                        tracks[track] = TrackIndex()
+                    tracks[track].add(len(offsets), difficulty, tags)
+                    offsets.append(position)
+                position = end + 1
+            self._indexes.update(tracks)
+            self._tracks = list(tracks)
+            self._offsets = offsets
+
+    def tracks(self):
+        self._scan()
+        return list(self._tracks)
+
+    def index(self, track):
+        self._scan()
+        return self._indexes[track]
+
+    def get(self, question_id):
+        self._scan()
+        start = self._offsets[question_id]
+        end = self._map.find(b"\n", start)
+        track, text, difficulty, tags = _parse_line(self._map[start:end if end != -1 else len(self._map)])
+        return Question(question_id, track, text, difficulty, tags)
+
+
+class SQLiteQuestionBank(QuestionBank):
+    """
+    Questions in a SQLite database, opened read-only and memory-mapped.
+
+    Indexes are built per track from (id, difficulty, tags) rows, and tag
+    filters run on the index's postings, so tags are stored as a
+    comma-joined column rather than a join table. Text is fetched by primary
+    key when a question is chosen.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            connection.execute(f"PRAGMA mmap_size={SQLITE_MMAP_BYTES}")
+            self._local.connection = connection
+        return connection
+
+    def tracks(self):
+        rows = self._connection().execute("SELECT track FROM questions GROUP BY track ORDER BY MIN(id)")
+        return [track for track, in rows]
+
+    def _build_index(self, track):
+        index = TrackIndex()
+        for question_id, difficulty, tags in self._connection().execute(
+                "SELECT id, difficulty, tags FROM questions WHERE track = ? ORDER BY id", (track,)):
+            index.add(question_id, difficulty, tags.split(",") if tags else ())
+        if not index:
+            raise KeyError(track)
+        return index
+
+    def get(self, question_id):
+        row = self._connection().execute("SELECT id, track, text, difficulty, tags FROM questions WHERE id = ?",
+                                         (question_id,)).fetchone()
+        if row is None:
+            raise KeyError(question_id)
+        question_id, track, text, difficulty, tags = row
+        return Question(question_id, track, text, difficulty, tuple(tags.split(",")) if tags else ())
+
+    @staticmethod
+    def build(path, questions):
+        """
+        Write questions into a new or existing database.
+
+        Args:
+            path (str): Database file
+            questions (iterable): Question objects; ids are assigned by the database
+
+        Returns:
+            int: Number of questions written
+        """
+        connection = sqlite3.connect(path)
+        connection.executescript(SCHEMA)
+        written = 0
+        with connection:
+            for question in questions:
+                connection.execute("INSERT INTO questions (track, text, difficulty, tags) VALUES (?, ?, ?, ?)",
+                                   (question.track, question.text, question.difficulty, ",".join(question.tags)))
+                written += 1
+        connection.close()
+        return written
+
+
+def create_question_bank(path=None):
+    """
+    Open the configured question bank.
+
+    Args:
+        path (str, optional): A .jsonl or SQLite file, defaults to QUESTION_BANK;
+            without one the built-in tracks are used
+
+    Returns:
+        QuestionBank: The bank
+    """
+    path = path or os.getenv("QUESTION_BANK")
+    if not path:
+        from interview_data import interview_tracks, question_difficulty
+
+        return MemoryQuestionBank.from_tracks(interview_tracks, difficulties=question_difficulty)
+    if path.endswith(".jsonl"):
+        return JSONLQuestionBank(path)
+    return SQLiteQuestionBank(path)
+
+
+def warm_questions(questions, cache=None):
+    """
+    Synthesize the questions' audio in the background so they play without waiting.
+
+    Args:
+        questions (iterable): Question objects
+        cache (AudioCache, optional): Cache to fill, defaults to the shared cache
+
+    Returns:
+        concurrent.futures.Future: Resolves to the number of questions synthesized
+    """
+    from tts_cache import warm_up
+
+    texts = [question.text for question in questions]
+    return asyncio.run_coroutine_threadsafe(asyncio.to_thread(warm_up, texts, cache), get_shared_loop())
+
+
+def select_questions(bank, track, k, username=None, store=None, difficulty=None, tags=None, warm=True, rng=None):
+    """
+    Choose an interview's questions, avoiding those the candidate was asked before.
+
+    Args:
+        bank (QuestionBank): Bank to choose from
+        track (str): Interview track
+        k (int): Number of questions
+        username (str, optional): Candidate whose history is excluded and updated
+        store (SessionStore, optional): Where the candidate's asked questions are kept
+        difficulty (int or iterable, optional): Accepted difficulty or difficulties
+        tags (iterable, optional): Tags every question must have
+        warm (bool): Start synthesizing the chosen questions' audio
+        rng (random.Random, optional): Source of randomness
+
+    Returns:
+        list: Question objects
+    """
+    track_history = store is not None and username is not None
+    asked = store.asked_questions(username, track) if track_history else ()
+    questions = bank.sample(track, k, difficulty, tags, asked, rng)
+    if track_history:
+        store.record_asked(username, track, [question.id for question in questions])
+    if warm and questions:
+        warm_questions(questions)
+    return questions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a JSONL question bank to SQLite.")
+    parser.add_argument("source", help="JSONL bank, one question per line")
+    parser.add_argument("target", help="SQLite database to write")
+    args = parser.parse_args()
+
+    bank = JSONLQuestionBank(args.source)
+    questions = (bank.get(question_id) for track in bank.tracks() for question_id in bank.index(track).ids)
+    print(f"Wrote {SQLiteQuestionBank.build(args.target, questions)} questions to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
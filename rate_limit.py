@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket usable from both threads and coroutines.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one token and waits when the bucket is empty.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Initialize the bucket, starting full.
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (float, optional): Maximum burst size, defaults to max(1, rate)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens):
+        """
+        Take tokens, allowing the balance to go negative.
+
+        Returns:
+            float: Seconds the caller must wait before proceeding
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens only if they are available right now.
+
+        Returns:
+            bool: True if the tokens were taken
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """Block until tokens are available."""
+        delay = self._reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens=1):
+        """Wait without blocking the event loop until tokens are available."""
+        delay = self._reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
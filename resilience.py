@@ -0,0 +1,436 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from async_runtime import run_sync
+from model_interface import AIModelInterface
+from rate_limit import TokenBucket
+
+DEFAULT_RATE = float(os.getenv("MODEL_RATE_LIMIT", 5))
+DEFAULT_BURST = float(os.getenv("MODEL_RATE_BURST", 10))
+DEFAULT_DEADLINE = float(os.getenv("MODEL_CALL_DEADLINE", 60))
+DEFAULT_ATTEMPT_TIMEOUT = float(os.getenv("MODEL_ATTEMPT_TIMEOUT", 20))
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 8.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+# Transport failures raised by the provider SDKs, matched by name to avoid importing them
+RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout", "RemoteProtocolError",
+                    "ServiceUnavailable", "DeadlineExceeded", "TooManyRequests", "ResourceExhausted"}
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ModelUnavailableError(Exception):
+    """Raised when a model and every failover candidate have failed."""
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a call runs out of its time budget."""
+
+
+def status_code(error):
+    """
+    Get the HTTP status carried by a provider exception, if any.
+
+    Returns:
+        int: Status code, or None
+    """
+    for attribute in ("status_code", "code"):
+        value = getattr(error, attribute, None)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def is_retryable(error):
+    """
+    Decide whether an error is transient.
+
+    Args:
+        error (Exception): Error raised by a model call
+
+    Returns:
+        bool: True for rate limits, server errors, timeouts and connection failures
+    """
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERRORS:
+        return True
+    return status_code(error) in RETRYABLE_STATUS
+
+
+def retry_after(error):
+    """
+    Read the server's requested delay from a Retry-After (or retry-after-ms) header.
+
+    Args:
+        error (Exception): Error raised by a model call
+
+    Returns:
+        float: Seconds to wait, or None if the server did not say
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing model for a while.
+
+    After failure_threshold consecutive transient failures the breaker opens
+    and calls are refused. Once reset_timeout has passed, a single trial call
+    is let through (half-open); its outcome closes or re-opens the breaker.
+    A trial that ends without an outcome (cancelled, or failed for a reason
+    that says nothing about the provider) must be released, and a trial that
+    is never heard from again is replaced after another reset_timeout.
+    """
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Check whether a call may be made now.
+
+        Returns:
+            bool: False while the breaker is open
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (self.state == OPEN and now - self._opened_at >= self.reset_timeout
+                    or self.state == HALF_OPEN and now - self._trial_started_at >= self.reset_timeout):
+                self.state = HALF_OPEN
+                self._trial_started_at = now
+                return True
+            return self.state == CLOSED
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """Give back a half-open trial that ended without an outcome, so the next call can try again."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = OPEN
+                # Open, but due for a trial right away
+                self._opened_at = time.monotonic() - self.reset_timeout
+
+    def get_stats(self):
+        with self._lock:
+            return {"state": self.state, "failures": self.failures}
+
+
+_limiters = {}
+_breakers = {}
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter(name, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+    """
+    Get the process-wide token bucket for a model, shared by every session.
+
+    Args:
+        name (str): Model name
+        rate (float): Requests per second, from MODEL_RATE_LIMIT by default
+        burst (float): Bucket capacity, from MODEL_RATE_BURST by default
+
+    Returns:
+        TokenBucket: The model's bucket
+    """
+    with _shared_lock:
+        if name not in _limiters:
+            _limiters[name] = TokenBucket(rate, burst)
+        return _limiters[name]
+
+
+def get_circuit_breaker(name):
+    """
+    Get the process-wide circuit breaker for a model.
+
+    Returns:
+        CircuitBreaker: The model's breaker
+    """
+    with _shared_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker()
+        return _breakers[name]
+
+
+class ResilientModel(AIModelInterface):
+    """
+    Wraps any registered model with rate limiting, retries, deadlines and failover.
+
+    Every attempt takes a token from the model's shared bucket. Transient
+    errors are retried with full-jitter exponential backoff, waiting at least
+    as long as the provider's Retry-After asks. Each call has a deadline
+    covering all attempts, and each attempt a shorter timeout. When the model
+    keeps failing, times out, or its breaker is open, the call moves on to
+    the next candidate returned by `fallbacks`. Streams are only retried
+    before their first chunk.
+    """
+
+    def __init__(self, model, fallbacks=None, limiter=None, breaker=None, deadline=DEFAULT_DEADLINE,
+                 attempt_timeout=DEFAULT_ATTEMPT_TIMEOUT, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY):
+        """
+        Initialize the wrapper.
+
+        Args:
+            model (AIModelInterface): Model to wrap
+            fallbacks (callable, optional): Returns the ResilientModels to fail over to, in order
+            limiter (TokenBucket, optional): Rate limiter, defaults to the model's shared bucket
+            breaker (CircuitBreaker, optional): Breaker, defaults to the model's shared breaker
+            deadline (float): Seconds allowed per call, across attempts and failover
+            attempt_timeout (float): Seconds allowed per attempt; a timed-out model is failed over at once
+            max_attempts (int): Attempts per model before failing over
+            base_delay (float): First backoff ceiling in seconds
+            max_delay (float): Largest backoff ceiling in seconds
+        """
+        super().__init__(name=model.name, description=model.description, tier=model.tier)
+        self.model = model
+        self.context_window = model.context_window
+        self.fallbacks = fallbacks or (lambda: [])
+        self.limiter = limiter or get_rate_limiter(model.name)
+        self.breaker = breaker or get_circuit_breaker(model.name)
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def discard_response(self, prompt, system_message=None):
+        self.model.discard_response(prompt, system_message)
+
+    def _candidates(self):
+        return [self] + [fallback for fallback in self.fallbacks() if fallback is not self]
+
+    def _backoff(self, error, attempt, deadline_at):
+        """
+        Decide how long to wait before the next attempt.
+
+        Returns:
+            float: Seconds to sleep, or None to stop retrying this model
+        """
+        if not is_retryable(error) or attempt + 1 >= self.max_attempts:
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        requested = retry_after(error)
+        if requested is not None:
+            delay = max(delay, requested)
+        if time.monotonic() + delay >= deadline_at:
+            # Waiting would overrun the deadline; fail over instead
+            return None
+        return delay
+
+    def _timeout(self, deadline_at):
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceededError("Model call deadline exceeded")
+        return min(remaining, self.attempt_timeout)
+
+    def _record(self, error):
+        if is_retryable(error):
+            self.breaker.record_failure()
+
+    def _unavailable(self, errors):
+        details = "; ".join(f"{name}: {error}" for name, error in errors)
+        return ModelUnavailableError(f"No model in the {self.tier} tier could answer ({details or 'circuit open'})")
+
+    async def _acall(self, prompt, system_message, deadline_at):
+        """Try this model with retries; raises the last error when it gives up."""
+        try:
+            for attempt in range(self.max_attempts):
+                # An expired deadline is the caller's budget running out, not a provider failure
+                timeout = self._timeout(deadline_at)
+                await self.limiter.acquire_async()
+                try:
+                    response = await asyncio.wait_for(self.model.agenerate_response(prompt, system_message), timeout)
+                except asyncio.TimeoutError as e:
+                    # A hung provider is unlikely to answer the next attempt either
+                    self.breaker.record_failure()
+                    raise DeadlineExceededError(f"{self.name} did not answer in time") from e
+                except Exception as e:
+                    self._record(e)
+                    delay = self._backoff(e, attempt, deadline_at)
+                    if delay is None:
+                        raise e
+                    await asyncio.sleep(delay)
+                else:
+                    self.breaker.record_success()
+                    return response
+        finally:
+            # No-op unless this was a half-open trial that ended without an outcome, e.g. cancelled
+            self.breaker.release()
+
+    async def _agenerate_response(self, prompt, system_message=None):
+        deadline_at = time.monotonic() + self.deadline
+        errors = []
+        for candidate in self._candidates():
+            if not candidate.breaker.allow():
+                continue
+            try:
+                return await candidate._acall(prompt, system_message, deadline_at)
+            except Exception as e:
+                errors.append((candidate.name, e))
+                if not is_retryable(e):
+                    raise
+                if time.monotonic() >= deadline_at:
+                    break
+        raise self._unavailable(errors) from (errors[-1][1] if errors else None)
+
+    def generate_response(self, prompt, system_message=None):
+        # Run on the shared loop so the deadline can interrupt a hung call
+        return run_sync(self._agenerate_response(prompt, system_message))
+
+    async def _astream_first(self, prompt, system_message, deadline_at):
+        """
+        Open a stream with retries, returning it with its first chunk.
+
+        Returns:
+            tuple: (async iterator, first chunk or None for an empty stream)
+        """
+        try:
+            for attempt in range(self.max_attempts):
+                timeout = self._timeout(deadline_at)
+                await self.limiter.acquire_async()
+                stream = self.model.agenerate_response_stream(prompt, system_message)
+                try:
+                    first = await asyncio.wait_for(anext(stream, None), timeout)
+                except asyncio.TimeoutError as e:
+                    await stream.aclose()
+                    self.breaker.record_failure()
+                    raise DeadlineExceededError(f"{self.name} did not answer in time") from e
+                except Exception as e:
+                    await stream.aclose()
+                    self._record(e)
+                    delay = self._backoff(e, attempt, deadline_at)
+                    if delay is None:
+                        raise e
+                    await asyncio.sleep(delay)
+                else:
+                    self.breaker.record_success()
+                    return stream, first
+        finally:
+            self.breaker.release()
+
+    async def _agenerate_response_stream(self, prompt, system_message=None):
+        deadline_at = time.monotonic() + self.deadline
+        errors = []
+        for candidate in self._candidates():
+            if not candidate.breaker.allow():
+                continue
+            try:
+                stream, first = await candidate._astream_first(prompt, system_message, deadline_at)
+            except Exception as e:
+                errors.append((candidate.name, e))
+                if not is_retryable(e):
+                    raise
+                if time.monotonic() >= deadline_at:
+                    break
+                continue
+            if first is None:
+                return
+            yield first
+            async for chunk in stream:
+                yield chunk
+            return
+        raise self._unavailable(errors) from (errors[-1][1] if errors else None)
+
+    def _stream_first(self, prompt, system_message, deadline_at):
+        try:
+            for attempt in range(self.max_attempts):
+                self._timeout(deadline_at)
+                self.limiter.acquire()
+                stream = iter(self.model.generate_response_stream(prompt, system_message))
+                try:
+                    first = next(stream, None)
+                except Exception as e:
+                    self._record(e)
+                    delay = self._backoff(e, attempt, deadline_at)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                else:
+                    self.breaker.record_success()
+                    return stream, first
+        finally:
+            self.breaker.release()
+
+    def generate_response_stream(self, prompt, system_message=None):
+        # Blocking streams cannot be interrupted; the deadline is checked between attempts
+        deadline_at = time.monotonic() + self.deadline
+        errors = []
+        for candidate in self._candidates():
+            if not candidate.breaker.allow():
+                continue
+            try:
+                stream, first = candidate._stream_first(prompt, system_message, deadline_at)
+            except Exception as e:
+                errors.append((candidate.name, e))
+                if not is_retryable(e):
+                    raise
+                if time.monotonic() >= deadline_at:
+                    break
+                continue
+            if first is None:
+                return
+            yield first
+            yield from stream
+            return
+        raise self._unavailable(errors) from (errors[-1][1] if errors else None)
+
+    def get_stats(self):
+        """
+        Get the wrapper's breaker state.
+
+        Returns:
+            dict: Breaker state and consecutive failures
+        """
+        return self.breaker.get_stats()
@@ -0,0 +1,377 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from model_interface import AIModelInterface
+from prompts import is_evaluation_prompt
+
+DEFAULT_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 24 * 60 * 60))
+DEFAULT_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+DEFAULT_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+DEFAULT_SQLITE_PATH = os.getenv("RESPONSE_CACHE_PATH", "response_cache.sqlite3")
+# Which prompts registered models cache: "evaluation" (scoring only), "all" or "off"
+DEFAULT_SCOPE = os.getenv("RESPONSE_CACHE_SCOPE", "evaluation")
+# Prompt filter per scope; None caches every prompt
+CACHE_SCOPES = {
+    "evaluation": is_evaluation_prompt,
+    "all": None,
+}
+
+
+class CacheBackend:
+    """Base interface for response cache storage."""
+
+    def get(self, key):
+        """
+        Get a stored value.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            str: The stored value, or None if missing or expired
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value.
+
+        Args:
+            key (str): Cache key
+            value (str): Value to store
+            ttl (float, optional): Seconds until the value expires, None for no expiry
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def delete(self, key):
+        """
+        Remove a stored value if present.
+
+        Args:
+            key (str): Cache key
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def clear(self):
+        """Remove every stored value."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def get_stats(self):
+        """
+        Get storage statistics.
+
+        Returns:
+            dict: Entry count and size in bytes
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU storage bounded by total value size."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, size = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self._total_bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[2]
+            self._entries[key] = (value, expires_at, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def get_stats(self):
+        with self._lock:
+            return {"backend": "memory", "entries": len(self._entries), "bytes": self._total_bytes,
+                    "max_bytes": self.max_bytes}
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """SQLite file storage, shared by every worker process that opens the same file."""
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_response_cache_accessed ON response_cache (accessed_at)"
+            )
+
+    def get(self, key):
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE response_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key, value, ttl=None):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, expires_at, now)
+            )
+            self._conn.execute("DELETE FROM response_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()[0]
+            if total > self.max_bytes:
+                # Drop least recently used rows until the total fits again
+                excess = total - self.max_bytes
+                freed = 0
+                stale = []
+                for row_key, row_size in self._conn.execute(
+                        "SELECT key, size FROM response_cache ORDER BY accessed_at"):
+                    if freed >= excess:
+                        break
+                    stale.append((row_key,))
+                    freed += row_size
+                self._conn.executemany("DELETE FROM response_cache WHERE key = ?", stale)
+
+    def delete(self, key):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM response_cache")
+
+    def get_stats(self):
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response_cache"
+            ).fetchone()
+        return {"backend": "sqlite", "path": self.path, "entries": entries, "bytes": total,
+                "max_bytes": self.max_bytes}
+
+
+class ResponseCache:
+    """Memoizes model responses by model name, system message and prompt."""
+
+    def __init__(self, backend=None, ttl=DEFAULT_TTL):
+        """
+        Initialize the response cache.
+
+        Args:
+            backend (CacheBackend, optional): Storage, defaults to an in-memory LRU
+            ttl (float, optional): Seconds a response stays valid, None for no expiry
+        """
+        self.backend = backend or MemoryCacheBackend()
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_name, system_message, prompt):
+        """
+        Build the cache key for a model call.
+
+        Returns:
+            str: Hex digest identifying the call
+        """
+        raw = "\0".join([model_name, system_message or "", prompt])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, model_name, system_message, prompt):
+        """
+        Look up a cached response.
+
+        Returns:
+            str: The cached response, or None on a miss
+        """
+        value = self.backend.get(self.make_key(model_name, system_message, prompt))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, model_name, system_message, prompt, response):
+        """Store a model response."""
+        self.backend.set(self.make_key(model_name, system_message, prompt), response, self.ttl)
+
+    def delete(self, model_name, system_message, prompt):
+        """Remove a stored model response."""
+        self.backend.delete(self.make_key(model_name, system_message, prompt))
+
+    def get_stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Hit/miss counters merged with backend statistics
+        """
+        with self._lock:
+            stats = {"hits": self.hits, "misses": self.misses, "ttl": self.ttl}
+        stats.update(self.backend.get_stats())
+        return stats
+
+
+class CachedModel(AIModelInterface):
+    """
+    Wraps any registered model and serves repeated prompts from a ResponseCache.
+
+    Only prompts accepted by should_cache are cached. Follow-ups are
+    conversational, so by default only scoring prompts are: two candidates
+    giving the same answer should still hear different follow-ups.
+    """
+
+    def __init__(self, model, cache, should_cache=None):
+        """
+        Initialize the wrapper.
+
+        Args:
+            model (AIModelInterface): Model to wrap
+            cache (ResponseCache): Cache to read from and write to
+            should_cache (callable, optional): Takes a prompt and returns whether it is cached;
+                None caches every prompt
+        """
+        super().__init__(name=model.name, description=model.description, tier=model.tier)
+        self.model = model
+        self.cache = cache
+        self.should_cache = should_cache
+        self.context_window = model.context_window
+
+    def _cached(self, prompt):
+        return self.should_cache is None or self.should_cache(prompt)
+
+    def discard_response(self, prompt, system_message=None):
+        self.cache.delete(self.name, system_message, prompt)
+        self.model.discard_response(prompt, system_message)
+
+    def generate_response(self, prompt, system_message=None):
+        if not self._cached(prompt):
+            return self.model.generate_response(prompt, system_message)
+        cached = self.cache.get(self.name, system_message, prompt)
+        if cached is not None:
+            return cached
+        response = self.model.generate_response(prompt, system_message)
+        self.cache.set(self.name, system_message, prompt, response)
+        return response
+
+    def generate_response_stream(self, prompt, system_message=None):
+        if not self._cached(prompt):
+            yield from self.model.generate_response_stream(prompt, system_message)
+            return
+        cached = self.cache.get(self.name, system_message, prompt)
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
+        for chunk in self.model.generate_response_stream(prompt, system_message):
+            chunks.append(chunk)
+            yield chunk
+        # Only complete streams are stored
+        self.cache.set(self.name, system_message, prompt, "".join(chunks).strip())
+
+    async def _agenerate_response(self, prompt, system_message=None):
+        if not self._cached(prompt):
+            return await self.model.agenerate_response(prompt, system_message)
+        cached = self.cache.get(self.name, system_message, prompt)
+        if cached is not None:
+            return cached
+        response = await self.model.agenerate_response(prompt, system_message)
+        self.cache.set(self.name, system_message, prompt, response)
+        return response
+
+    async def _agenerate_response_stream(self, prompt, system_message=None):
+        if not self._cached(prompt):
+            async for chunk in self.model.agenerate_response_stream(prompt, system_message):
+                yield chunk
+            return
+        cached = self.cache.get(self.name, system_message, prompt)
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
+        async for chunk in self.model.agenerate_response_stream(prompt, system_message):
+            chunks.append(chunk)
+            yield chunk
+        self.cache.set(self.name, system_message, prompt, "".join(chunks).strip())
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Get the process-wide response cache configured from the environment.
+
+    RESPONSE_CACHE_BACKEND selects "memory" (default) or "sqlite";
+    RESPONSE_CACHE_PATH, RESPONSE_CACHE_TTL and RESPONSE_CACHE_MAX_BYTES
+    tune it.
+
+    Returns:
+        ResponseCache: The shared response cache
+    """
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            if DEFAULT_BACKEND == "sqlite":
+                backend = SQLiteCacheBackend()
+            elif DEFAULT_BACKEND == "memory":
+                backend = MemoryCacheBackend()
+            else:
+                raise ValueError(f"Unknown response cache backend: {DEFAULT_BACKEND}")
+            _response_cache = ResponseCache(backend)
+        return _response_cache
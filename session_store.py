@@ -0,0 +1,444 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from transcript import TranscriptEntry
+
+DEFAULT_DB_PATH = os.getenv("SESSION_DB_PATH", "interviews.db")
+DEFAULT_PAGE_SIZE = 50
+# Rows fetched at a time when streaming query results
+DEFAULT_FETCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    track TEXT NOT NULL,
+    model TEXT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    turns INTEGER NOT NULL DEFAULT 0,
+    overall_score REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_user ON sessions (username, started_at, id);
+CREATE INDEX IF NOT EXISTS sessions_by_track ON sessions (track, started_at, id);
+CREATE INDEX IF NOT EXISTS sessions_by_model ON sessions (model, started_at, id);
+CREATE INDEX IF NOT EXISTS sessions_by_date ON sessions (started_at, id);
+CREATE TABLE IF NOT EXISTS turns (
+    session_id TEXT NOT NULL REFERENCES sessions (id),
+    question_id INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT,
+    followup TEXT,
+    followup_answer TEXT,
+    timings TEXT,
+    score INTEGER,
+    feedback TEXT,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (session_id, question_id)
+);
+CREATE TABLE IF NOT EXISTS asked_questions (
+    username TEXT NOT NULL,
+    track TEXT NOT NULL,
+    question_id INTEGER NOT NULL,
+    asked_at REAL NOT NULL,
+    PRIMARY KEY (username, track, question_id)
+) WITHOUT ROWID;
+"""
+
+
+class SessionStore:
+    """
+    Durable record of interview sessions, their turns and their scores.
+
+    Writes are expected on the interview's critical path, so implementations
+    should make them cheap and may apply them asynchronously; flush() waits
+    until every earlier write is stored.
+    """
+
+    def start_session(self, session_id, username, track, model=None, started_at=None):
+        """
+        Record a new session; starting an existing session again is a no-op.
+
+        Args:
+            session_id (str): Unique session identifier
+            username (str): Candidate name
+            track (str): Interview track
+            model (str, optional): Name of the model conducting the interview
+            started_at (float, optional): Unix time, defaults to now
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def record_turn(self, session_id, entry):
+        """
+        Store a completed turn, replacing an earlier copy of the same question.
+
+        Args:
+            session_id (str): Session the turn belongs to
+            entry (TranscriptEntry): The turn
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def record_evaluation(self, session_id, entry):
+        """
+        Store a turn's score and feedback and update the session's overall score.
+
+        Args:
+            session_id (str): Session the turn belongs to
+            entry (TranscriptEntry): A scored turn
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def finish_session(self, session_id, finished_at=None):
+        """Mark a session as complete."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def get_session(self, session_id):
+        """
+        Load one session with its transcript.
+
+        Returns:
+            dict: Session fields plus "transcript" (TranscriptEntry list), or None if unknown
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def list_sessions(self, username=None, track=None, model=None, since=None, until=None,
+                      limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """
+        Get one page of sessions, newest first.
+
+        Args:
+            username (str, optional): Only this candidate's sessions
+            track (str, optional): Only this track
+            model (str, optional): Only sessions run by this model
+            since (float, optional): Started at or after this Unix time
+            until (float, optional): Started before this Unix time
+            limit (int): Page size
+            cursor (tuple, optional): next_cursor from the previous page
+
+        Returns:
+            tuple: (list of session dicts, next_cursor or None on the last page)
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def iter_sessions(self, username=None, track=None, model=None, since=None, until=None):
+        """
+        Stream matching sessions, newest first, without loading them all.
+
+        Yields:
+            dict: Session fields
+        """
+        cursor = None
+        while True:
+            page, cursor = self.list_sessions(username, track, model, since, until, cursor=cursor)
+            yield from page
+            if cursor is None:
+                return
+
+    def record_asked(self, username, track, question_ids):
+        """
+        Remember which bank questions a candidate has been given.
+
+        Args:
+            username (str): Candidate name
+            track (str): Interview track
+            question_ids (iterable): Question bank ids
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def asked_questions(self, username, track):
+        """
+        Get the bank questions a candidate has been given on a track.
+
+        Returns:
+            set: Question bank ids
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def flush(self):
+        """Wait until earlier writes are stored."""
+
+    def close(self):
+        """Store pending writes and release resources."""
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Session store in a SQLite database.
+
+    Writes are queued and applied by one writer thread, which commits
+    everything queued so far in a single transaction, so the caller never
+    waits on the disk and bursts of turns share one commit. The database
+    runs in WAL mode, so dashboards can read while the writer commits.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, fetch_size=DEFAULT_FETCH_SIZE):
+        """
+        Open the database, creating the schema if needed.
+
+        Args:
+            path (str): Database file
+            fetch_size (int): Rows fetched at a time while streaming results
+        """
+        self.path = path
+        self.fetch_size = fetch_size
+        self.write_errors = 0
+        self.last_error = None
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+        self._writer = threading.Thread(target=self._write_loop, name="session-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the database consistent without a sync on every commit
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _reader(self):
+        # One read connection per thread; SQLite connections are not shared safely
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def _write_loop(self):
+        connection = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            # Group-commit everything that queued up while the last batch was written
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            try:
+                with connection:
+                    for statements in batch:
+                        self._apply(connection, statements)
+            except sqlite3.Error:
+                # Apply the writes one by one so a bad one does not take the batch down with it
+                for statements in batch:
+                    try:
+                        with connection:
+                            self._apply(connection, statements)
+                    except sqlite3.Error as e:
+                        self.write_errors += 1
+                        self.last_error = e
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                connection.close()
+                return
+
+    @staticmethod
+    def _apply(connection, statements):
+        for sql, parameters in statements or ():
+            connection.execute(sql, parameters)
+
+    def _write(self, *statements):
+        self._queue.put(statements)
+
+    def start_session(self, session_id, username, track, model=None, started_at=None):
+        self._write(("INSERT OR IGNORE INTO sessions (id, username, track, model, started_at) VALUES (?, ?, ?, ?, ?)",
+                     (session_id, username, track, model, started_at or time.time())))
+
+    def record_turn(self, session_id, entry):
+        self._write(
+            ("INSERT OR REPLACE INTO turns (session_id, question_id, question, answer, followup, followup_answer, "
+             "timings, score, feedback, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+             (session_id, entry.question_id, entry.question, entry.answer, entry.followup, entry.followup_answer,
+              json.dumps(entry.timings), entry.score, entry.feedback, time.time())),
+            ("UPDATE sessions SET turns = (SELECT COUNT(*) FROM turns WHERE session_id = ?) WHERE id = ?",
+             (session_id, session_id))
+        )
+
+    def record_evaluation(self, session_id, entry):
+        self._write(
+            ("UPDATE turns SET score = ?, feedback = ? WHERE session_id = ? AND question_id = ?",
+             (entry.score, entry.feedback, session_id, entry.question_id)),
+            ("UPDATE sessions SET overall_score = (SELECT AVG(score) FROM turns WHERE session_id = ?) WHERE id = ?",
+             (session_id, session_id))
+        )
+
+    def finish_session(self, session_id, finished_at=None):
+        self._write(("UPDATE sessions SET finished_at = ? WHERE id = ?", (finished_at or time.time(), session_id)))
+
+    def record_asked(self, username, track, question_ids):
+        asked_at = time.time()
+        self._write(*(("INSERT OR REPLACE INTO asked_questions VALUES (?, ?, ?, ?)",
+                       (username, track, question_id, asked_at)) for question_id in question_ids))
+
+    def asked_questions(self, username, track):
+        rows = self._reader().execute("SELECT question_id FROM asked_questions WHERE username = ? AND track = ?",
+                                      (username, track))
+        return {question_id for question_id, in rows}
+
+    def get_session(self, session_id):
+        connection = self._reader()
+        row = connection.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        session = dict(row)
+        turns = connection.execute("SELECT * FROM turns WHERE session_id = ? ORDER BY question_id", (session_id,))
+        session["transcript"] = [
+            TranscriptEntry.from_dict(dict(turn, timings=json.loads(turn["timings"] or "{}"))) for turn in turns
+        ]
+        return session
+
+    @staticmethod
+    def _where(username, track, model, since, until):
+        clauses, parameters = [], []
+        for column, value in (("username", username), ("track", track), ("model", model)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                parameters.append(value)
+        if since is not None:
+            clauses.append("started_at >= ?")
+            parameters.append(since)
+        if until is not None:
+            clauses.append("started_at < ?")
+            parameters.append(until)
+        return clauses, parameters
+
+    def list_sessions(self, username=None, track=None, model=None, since=None, until=None,
+                      limit=DEFAULT_PAGE_SIZE, cursor=None):
+        clauses, parameters = self._where(username, track, model, since, until)
+        if cursor is not None:
+            # Keyset pagination: every page is an index range scan, however deep
+            clauses.append("(started_at < ? OR (started_at = ? AND id < ?))")
+            parameters += [cursor[0], cursor[0], cursor[1]]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._reader().execute(
+            f"SELECT * FROM sessions {where} ORDER BY started_at DESC, id DESC LIMIT ?", parameters + [limit + 1]
+        ).fetchall()
+        page = [dict(row) for row in rows[:limit]]
+        next_cursor = (page[-1]["started_at"], page[-1]["id"]) if len(rows) > limit else None
+        return page, next_cursor
+
+    def iter_sessions(self, username=None, track=None, model=None, since=None, until=None):
+        clauses, parameters = self._where(username, track, model, since, until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        # A dedicated connection, so other queries on this thread do not disturb the open cursor
+        connection = self._connect()
+        try:
+            rows = connection.execute(f"SELECT * FROM sessions {where} ORDER BY started_at DESC, id DESC",
+                                      parameters)
+            while True:
+                batch = rows.fetchmany(self.fetch_size)
+                if not batch:
+                    return
+                for row in batch:
+                    yield dict(row)
+        finally:
+            connection.close()
+
+    def flush(self):
+        self._queue.join()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class MemorySessionStore(SessionStore):
+    """In-process session store for tests and load generation; nothing is persisted."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._turns = {}
+        self._asked = {}
+
+    def start_session(self, session_id, username, track, model=None, started_at=None):
+        with self._lock:
+            if session_id not in self._sessions:
+                self._sessions[session_id] = {"id": session_id, "username": username, "track": track, "model": model,
+                                              "started_at": started_at or time.time(), "finished_at": None,
+                                              "turns": 0, "overall_score": None}
+                self._turns[session_id] = {}
+
+    def record_turn(self, session_id, entry):
+        with self._lock:
+            self._turns[session_id][entry.question_id] = TranscriptEntry.from_dict(entry.to_dict())
+            self._sessions[session_id]["turns"] = len(self._turns[session_id])
+
+    def record_evaluation(self, session_id, entry):
+        with self._lock:
+            stored = self._turns[session_id].get(entry.question_id)
+            if stored is None:
+                return
+            stored.score, stored.feedback = entry.score, entry.feedback
+            scores = [turn.score for turn in self._turns[session_id].values() if turn.is_scored]
+            self._sessions[session_id]["overall_score"] = sum(scores) / len(scores)
+
+    def finish_session(self, session_id, finished_at=None):
+        with self._lock:
+            self._sessions[session_id]["finished_at"] = finished_at or time.time()
+
+    def record_asked(self, username, track, question_ids):
+        with self._lock:
+            self._asked.setdefault((username, track), set()).update(question_ids)
+
+    def asked_questions(self, username, track):
+        with self._lock:
+            return set(self._asked.get((username, track), ()))
+
+    def get_session(self, session_id):
+        with self._lock:
+            if session_id not in self._sessions:
+                return None
+            return dict(self._sessions[session_id],
+                        transcript=[self._turns[session_id][key] for key in sorted(self._turns[session_id])])
+
+    def list_sessions(self, username=None, track=None, model=None, since=None, until=None,
+                      limit=DEFAULT_PAGE_SIZE, cursor=None):
+        filters = {"username": username, "track": track, "model": model}
+        with self._lock:
+            matching = sorted(
+                (dict(session) for session in self._sessions.values()
+                 if all(value is None or session[key] == value for key, value in filters.items())
+                 and (since is None or session["started_at"] >= since)
+                 and (until is None or session["started_at"] < until)
+                 and (cursor is None or (session["started_at"], session["id"]) < tuple(cursor))),
+                key=lambda session: (session["started_at"], session["id"]), reverse=True
+            )
+        page = matching[:limit]
+        next_cursor = (page[-1]["started_at"], page[-1]["id"]) if len(matching) > limit else None
+        return page, next_cursor
+
+
+SESSION_STORES = {
+    "sqlite": SQLiteSessionStore,
+    "memory": MemorySessionStore,
+}
+
+
+def create_session_store(name=None):
+    """
+    Create a session store by name.
+
+    Args:
+        name (str, optional): "sqlite" or "memory", defaults to SESSION_STORE or "sqlite"
+
+    Returns:
+        SessionStore: The store
+    """
+    name = name or os.getenv("SESSION_STORE", "sqlite")
+    if name not in SESSION_STORES:
+        raise ValueError(f"Unknown session store: {name}")
+    return SESSION_STORES[name]()
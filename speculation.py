@@ -0,0 +1,225 @@
+import asyncio
+import threading
+import time
+from difflib import SequenceMatcher
+
+from async_runtime import get_shared_loop
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.85
+DEFAULT_MIN_WORDS = 6
+# Every draft is a paid model call and takes a rate limiter token, even when it is cancelled
+DEFAULT_MAX_DRAFTS = 2
+# A replacement draft needs this many more words than the one it replaces
+DEFAULT_MIN_WORD_DELTA = 8
+# Seconds without a new partial before a draft starts; shorter than the endpointer's silence
+DEFAULT_DEBOUNCE = 0.4
+
+
+def text_similarity(a, b):
+    """
+    Word-level similarity of two transcripts, ignoring case and punctuation.
+
+    Returns:
+        float: 0.0 (unrelated) to 1.0 (same words in the same order)
+    """
+    def words(text):
+        return [word.strip(".,!?;:\"'").lower() for word in text.split()]
+
+    return SequenceMatcher(None, words(a), words(b), autojunk=False).ratio()
+
+
+class SpeculationStats:
+    """Hit rate and latency saved by speculative follow-ups."""
+
+    def __init__(self):
+        self.turns = 0
+        self.hits = 0
+        self.drafts_started = 0
+        self.drafts_cancelled = 0
+        # Seconds of generation already done when the final answer arrived, per turn (0.0 on a miss)
+        self.latency_saved = []
+        self._lock = threading.Lock()
+
+    def record_draft(self):
+        with self._lock:
+            self.drafts_started += 1
+
+    def record_cancel(self):
+        with self._lock:
+            self.drafts_cancelled += 1
+
+    def record_turn(self, hit, saved=0.0):
+        with self._lock:
+            self.turns += 1
+            self.hits += int(hit)
+            self.latency_saved.append(saved)
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.turns if self.turns else 0.0
+
+    def get_stats(self):
+        """
+        Get the speculation metrics.
+
+        Returns:
+            dict: Turns, hits, hit rate, drafts started/cancelled and latency saved
+        """
+        with self._lock:
+            saved = list(self.latency_saved)
+            return {
+                "turns": self.turns,
+                "hits": self.hits,
+                "hit_rate": self.hits / self.turns if self.turns else 0.0,
+                "drafts_started": self.drafts_started,
+                "drafts_cancelled": self.drafts_cancelled,
+                "latency_saved_per_turn": saved,
+                "latency_saved_total": sum(saved),
+            }
+
+
+class SpeculativeFollowup:
+    """
+    Drafts the follow-up from partial transcripts while the candidate is still talking.
+
+    Each partial hypothesis is compared with the text the current draft was
+    started from. Drafts start only once partials pause for debounce
+    seconds, as they do when the candidate stops to think or is finishing. A
+    draft is kept while the two texts stay similar. Once they drift apart it
+    is replaced, but only after it has finished, only when the answer has
+    grown by min_word_delta words since, and at most max_drafts drafts are
+    started per turn, so a long answer costs a bounded number of model
+    calls. When the final answer arrives, a draft close enough to it is
+    used as the follow-up; otherwise it is cancelled and the caller
+    generates the follow-up as usual.
+
+    Drafts run on the shared event loop, so update() can be called from the
+    recognizer's thread.
+    """
+
+    def __init__(self, generate, stats=None, similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD,
+                 min_words=DEFAULT_MIN_WORDS, max_drafts=DEFAULT_MAX_DRAFTS, min_word_delta=DEFAULT_MIN_WORD_DELTA,
+                 debounce=DEFAULT_DEBOUNCE):
+        """
+        Initialize the speculator for one turn.
+
+        Args:
+            generate (callable): Coroutine function taking the answer text and returning the follow-up
+            stats (SpeculationStats, optional): Metrics to update
+            similarity_threshold (float): Minimum text_similarity for a draft to be kept
+            min_words (int): Partial transcripts shorter than this do not start a draft
+            max_drafts (int): Drafts started per turn at most
+            min_word_delta (int): Words the answer must have grown by before a draft is replaced
+            debounce (float): Seconds without a new partial before a draft may start
+        """
+        self.generate = generate
+        self.stats = stats or SpeculationStats()
+        self.similarity_threshold = similarity_threshold
+        self.min_words = min_words
+        self.max_drafts = max_drafts
+        self.min_word_delta = min_word_delta
+        self.debounce = debounce
+        self._drafts_started = 0
+        # Latest partial waiting out the debounce, and a counter that invalidates older timers
+        self._pending = None
+        self._pending_seq = 0
+        self._draft = None
+        self._source = None
+        self._started_at = None
+        self._lock = threading.Lock()
+
+    async def _run_draft(self, text):
+        result = await self.generate(text)
+        return result, time.perf_counter()
+
+    def _cancel_draft(self):
+        if self._draft is not None and self._draft.cancel():
+            self.stats.record_cancel()
+        self._draft = None
+        self._source = None
+
+    def update(self, partial):
+        """
+        Note a new partial transcript; a draft may start from it once partials pause.
+
+        Args:
+            partial (str): Latest partial hypothesis
+        """
+        if len(partial.split()) < self.min_words:
+            return
+        with self._lock:
+            if self._drafts_started >= self.max_drafts:
+                return
+            self._pending = partial
+            self._pending_seq += 1
+            seq = self._pending_seq
+        if self.debounce:
+            loop = get_shared_loop()
+            loop.call_soon_threadsafe(loop.call_later, self.debounce, self._settle, seq)
+        else:
+            self._settle(seq)
+
+    def _settle(self, seq):
+        # No newer partial arrived during the debounce; start or replace the draft from this one
+        with self._lock:
+            if seq != self._pending_seq or self._pending is None:
+                return
+            partial, self._pending = self._pending, None
+            words = len(partial.split())
+            if self._drafts_started >= self.max_drafts:
+                return
+            if self._source is not None:
+                if self._draft is not None and not self._draft.done():
+                    # Never pay for two drafts at once; resolve() checks whether this one still fits
+                    return
+                if words - len(self._source.split()) < self.min_word_delta:
+                    return
+                if text_similarity(partial, self._source) >= self.similarity_threshold:
+                    return
+            self._cancel_draft()
+            self._source = partial
+            self._started_at = time.perf_counter()
+            self._draft = asyncio.run_coroutine_threadsafe(self._run_draft(partial), get_shared_loop())
+            self._drafts_started += 1
+            self.stats.record_draft()
+
+    async def resolve(self, final):
+        """
+        Use the draft for the final answer if it still fits.
+
+        Args:
+            final (str): Final transcript
+
+        Returns:
+            str: The drafted follow-up, or None if the caller should generate one
+        """
+        with self._lock:
+            # The final answer supersedes any partial still waiting out the debounce
+            self._pending, self._pending_seq = None, self._pending_seq + 1
+            draft, source, started_at = self._draft, self._source, self._started_at
+            if draft is None or text_similarity(final, source) < self.similarity_threshold:
+                self._cancel_draft()
+                draft = None
+            else:
+                self._draft = None
+                self._source = None
+        if draft is None:
+            self.stats.record_turn(hit=False)
+            return None
+
+        resolved_at = time.perf_counter()
+        try:
+            followup, finished_at = await asyncio.wrap_future(draft)
+        except Exception:
+            self.stats.record_turn(hit=False)
+            return None
+        # Generation time that overlapped the answer instead of following it
+        saved = min(resolved_at, finished_at) - started_at
+        self.stats.record_turn(hit=True, saved=saved)
+        return followup
+
+    def cancel(self):
+        """Cancel any draft in flight, e.g. when the turn is abandoned."""
+        with self._lock:
+            self._pending, self._pending_seq = None, self._pending_seq + 1
+            self._cancel_draft()
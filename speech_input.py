@@ -0,0 +1,466 @@
+import json
+import math
+import os
+import threading
+import time
+from array import array
+from collections import deque
+
+from telemetry import get_tracer
+
+# Endpointer events
+SPEECH_START = "start"
+SPEECH_END = "end"
+SPEECH_TIMEOUT = "timeout"
+
+DEFAULT_SAMPLE_RATE = 16000
+DEFAULT_CHUNK_SIZE = 1024
+
+
+class SpeechTimeoutError(Exception):
+    """Raised when no speech starts before the listening timeout."""
+
+
+class RecognitionError(Exception):
+    """Raised when the recognizer backend fails (e.g. the service is unreachable)."""
+
+
+class MicrophoneSource:
+    """Reads 16-bit mono PCM frames from the default microphone."""
+
+    def __init__(self, sample_rate=DEFAULT_SAMPLE_RATE, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.sample_width = 2
+        self._microphone = None
+
+    def __enter__(self):
+        import speech_recognition as sr
+
+        self._microphone = sr.Microphone(sample_rate=self.sample_rate, chunk_size=self.chunk_size)
+        self._microphone.__enter__()
+        self.sample_width = self._microphone.SAMPLE_WIDTH
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._microphone.__exit__(exc_type, exc_value, traceback)
+        self._microphone = None
+
+    def frames(self):
+        """
+        Yield captured audio frames until the caller stops iterating.
+
+        Yields:
+            bytes: chunk_size samples of PCM audio
+        """
+        while True:
+            yield self._microphone.stream.read(self.chunk_size)
+
+
+class PCMSource:
+    """Replays recorded PCM audio as frames, for tests and load generation."""
+
+    def __init__(self, pcm, sample_rate=DEFAULT_SAMPLE_RATE, sample_width=2, chunk_size=DEFAULT_CHUNK_SIZE,
+                 realtime=False):
+        """
+        Initialize the source.
+
+        Args:
+            pcm (bytes): Mono PCM audio
+            sample_rate (int): Samples per second
+            sample_width (int): Bytes per sample
+            chunk_size (int): Samples per frame
+            realtime (bool): Pace frames at the rate a microphone would deliver them
+        """
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.chunk_size = chunk_size
+        self.realtime = realtime
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+    def frames(self):
+        step = self.chunk_size * self.sample_width
+        for offset in range(0, len(self.pcm), step):
+            if self.realtime:
+                time.sleep(self.chunk_size / self.sample_rate)
+            yield self.pcm[offset:offset + step]
+
+
+class EnergyEndpointer:
+    """
+    Detects the start and end of speech from frame energy.
+
+    The threshold is calibrated from the first frames (ambient noise), like
+    speech_recognition's adjust_for_ambient_noise, but never below min_threshold.
+    """
+
+    def __init__(self, sample_rate, chunk_size, min_threshold=300, noise_multiplier=2.5,
+                 calibration_seconds=0.25, silence_seconds=0.8, start_timeout=5.0, max_speech_seconds=15.0):
+        """
+        Initialize the endpointer.
+
+        Args:
+            sample_rate (int): Samples per second
+            chunk_size (int): Samples per frame
+            min_threshold (float): Lowest RMS energy treated as speech
+            noise_multiplier (float): Threshold as a multiple of the ambient RMS
+            calibration_seconds (float): Leading audio used to measure ambient noise
+            silence_seconds (float): Trailing silence that ends an utterance
+            start_timeout (float): Seconds to wait for speech to start
+            max_speech_seconds (float): Longest utterance before it is cut off
+        """
+        frame_seconds = chunk_size / sample_rate
+        self.threshold = min_threshold
+        self.min_threshold = min_threshold
+        self.noise_multiplier = noise_multiplier
+        self._calibration_frames = max(1, int(calibration_seconds / frame_seconds))
+        self._silence_frames = max(1, int(silence_seconds / frame_seconds))
+        self._timeout_frames = int(start_timeout / frame_seconds)
+        self._max_speech_frames = int(max_speech_seconds / frame_seconds)
+        self._ambient = []
+        self._frames = 0
+        self._speech_frames = 0
+        self._silent_run = 0
+        self.speaking = False
+
+    @staticmethod
+    def rms(frame):
+        """
+        Root-mean-square energy of a 16-bit PCM frame.
+
+        Returns:
+            float: RMS amplitude
+        """
+        samples = array("h", frame[:len(frame) - len(frame) % 2])
+        if not samples:
+            return 0.0
+        return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+    def process(self, frame):
+        """
+        Classify the next frame.
+
+        Args:
+            frame (bytes): 16-bit mono PCM frame
+
+        Returns:
+            str: SPEECH_START, SPEECH_END, SPEECH_TIMEOUT, or None if nothing changed
+        """
+        self._frames += 1
+        energy = self.rms(frame)
+        if not self.speaking and len(self._ambient) < self._calibration_frames:
+            self._ambient.append(energy)
+            ambient = sum(self._ambient) / len(self._ambient)
+            self.threshold = max(self.min_threshold, ambient * self.noise_multiplier)
+        is_speech = energy > self.threshold
+
+        if not self.speaking:
+            if is_speech and len(self._ambient) >= self._calibration_frames:
+                self.speaking = True
+                self._speech_frames = 1
+                return SPEECH_START
+            if self._frames >= self._timeout_frames:
+                return SPEECH_TIMEOUT
+            return None
+
+        self._speech_frames += 1
+        self._silent_run = 0 if is_speech else self._silent_run + 1
+        if self._silent_run >= self._silence_frames or self._speech_frames >= self._max_speech_frames:
+            return SPEECH_END
+        return None
+
+
+class RecognizerBackend:
+    """Base interface for speech recognizers fed with streaming audio frames."""
+
+    # Whether feed() returns partial hypotheses; speculative follow-ups need them
+    provides_partials = False
+
+    def start(self, sample_rate, sample_width):
+        """
+        Prepare for a new utterance.
+
+        Args:
+            sample_rate (int): Samples per second
+            sample_width (int): Bytes per sample
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def feed(self, frame):
+        """
+        Add a frame of speech.
+
+        Args:
+            frame (bytes): PCM audio
+
+        Returns:
+            str: Current partial hypothesis, or None if the backend has none
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def finish(self):
+        """
+        Finalize the utterance.
+
+        Returns:
+            str: Final transcript, empty if nothing was understood
+
+        Raises:
+            RecognitionError: If recognition failed
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+
+class GoogleRecognizerBackend(RecognizerBackend):
+    """
+    Google Web Speech API through speech_recognition.
+
+    The API is not streaming, so frames are buffered and recognized as soon
+    as the endpointer reports the end of speech. Optional partial hypotheses
+    re-recognize the audio so far in the background every partial_interval
+    seconds; they cost one extra request each, so they are off unless
+    STT_PARTIAL_INTERVAL is set.
+    """
+
+    def __init__(self, partial_interval=None):
+        if partial_interval is None and os.getenv("STT_PARTIAL_INTERVAL"):
+            partial_interval = float(os.getenv("STT_PARTIAL_INTERVAL"))
+        self.partial_interval = partial_interval
+        self._recognizer = None
+        self._frames = []
+        self._partial = None
+        self._partial_thread = None
+        self._last_partial_at = 0.0
+
+    @property
+    def provides_partials(self):
+        return self.partial_interval is not None
+
+    def start(self, sample_rate, sample_width):
+        import speech_recognition as sr
+
+        self._recognizer = sr.Recognizer()
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self._frames = []
+        self._partial = None
+        self._last_partial_at = 0.0
+
+    def _audio_data(self):
+        import speech_recognition as sr
+
+        return sr.AudioData(b"".join(self._frames), self.sample_rate, self.sample_width)
+
+    def _recognize_partial(self, audio):
+        try:
+            self._partial = self._recognizer.recognize_google(audio)
+        except Exception:
+            pass
+
+    def feed(self, frame):
+        self._frames.append(frame)
+        if self.partial_interval is not None:
+            seconds = len(self._frames) * len(frame) / self.sample_width / self.sample_rate
+            idle = self._partial_thread is None or not self._partial_thread.is_alive()
+            if idle and seconds - self._last_partial_at >= self.partial_interval:
+                self._last_partial_at = seconds
+                self._partial_thread = threading.Thread(target=self._recognize_partial, args=(self._audio_data(),),
+                                                        daemon=True)
+                self._partial_thread.start()
+        return self._partial
+
+    def finish(self):
+        import speech_recognition as sr
+
+        if not self._frames:
+            return ""
+        try:
+            return self._recognizer.recognize_google(self._audio_data())
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError as e:
+            raise RecognitionError(str(e)) from e
+
+
+_vosk_models = {}
+_vosk_models_lock = threading.Lock()
+
+
+class VoskRecognizerBackend(RecognizerBackend):
+    """
+    Offline streaming recognition with Vosk (optional dependency).
+
+    Produces native partial hypotheses, and the final transcript is ready the
+    moment speech ends. The model directory comes from VOSK_MODEL_PATH.
+    """
+
+    provides_partials = True
+
+    def __init__(self, model_path=None):
+        self.model_path = model_path or os.getenv("VOSK_MODEL_PATH", "vosk-model")
+        self._recognizer = None
+        self._text = []
+
+    def _get_model(self):
+        from vosk import Model
+
+        with _vosk_models_lock:
+            if self.model_path not in _vosk_models:
+                _vosk_models[self.model_path] = Model(self.model_path)
+            return _vosk_models[self.model_path]
+
+    def start(self, sample_rate, sample_width):
+        from vosk import KaldiRecognizer
+
+        self._recognizer = KaldiRecognizer(self._get_model(), sample_rate)
+        self._text = []
+
+    def feed(self, frame):
+        if self._recognizer.AcceptWaveform(frame):
+            self._text.append(json.loads(self._recognizer.Result()).get("text", ""))
+            partial = ""
+        else:
+            partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        return " ".join(part for part in self._text + [partial] if part)
+
+    def finish(self):
+        self._text.append(json.loads(self._recognizer.FinalResult()).get("text", ""))
+        return " ".join(part for part in self._text if part)
+
+
+class OfflineRecognizerBackend(RecognizerBackend):
+    """
+    Scripted recognizer for tests: reveals a known transcript as audio arrives.
+
+    Words are released at words_per_second of audio fed, so partial
+    hypotheses grow the way a streaming engine's would.
+    """
+
+    provides_partials = True
+
+    def __init__(self, transcript, words_per_second=2.5):
+        self.words = transcript.split()
+        self.words_per_second = words_per_second
+        self._seconds = 0.0
+
+    def start(self, sample_rate, sample_width):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self._seconds = 0.0
+
+    def feed(self, frame):
+        self._seconds += len(frame) / self.sample_width / self.sample_rate
+        return " ".join(self.words[:int(self._seconds * self.words_per_second)])
+
+    def finish(self):
+        return " ".join(self.words)
+
+
+RECOGNIZER_BACKENDS = {
+    "google": GoogleRecognizerBackend,
+    "vosk": VoskRecognizerBackend,
+}
+
+
+def create_recognizer_backend(name=None):
+    """
+    Create a recognizer backend by name.
+
+    Args:
+        name (str, optional): Backend name, defaults to the STT_BACKEND environment variable or "google"
+
+    Returns:
+        RecognizerBackend: The backend
+    """
+    name = name or os.getenv("STT_BACKEND", "google")
+    if name not in RECOGNIZER_BACKENDS:
+        raise ValueError(f"Unknown speech recognizer backend: {name}")
+    return RECOGNIZER_BACKENDS[name]()
+
+
+class StreamingSpeechInput:
+    """
+    Captures one answer: streams frames to a recognizer and stops at the end of speech.
+
+    Audio before speech starts is kept in a short pre-roll so the first
+    syllable is not clipped.
+    """
+
+    def __init__(self, source_factory=MicrophoneSource, backend_factory=create_recognizer_backend,
+                 pre_roll_seconds=0.3, **endpointer_options):
+        """
+        Initialize the capture pipeline.
+
+        Args:
+            source_factory (callable): Returns a frame source (context manager with frames())
+            backend_factory (callable): Returns a RecognizerBackend
+            pre_roll_seconds (float): Audio kept from before the detected speech start
+            **endpointer_options: Passed to EnergyEndpointer (timeouts, thresholds)
+        """
+        self.source_factory = source_factory
+        self.backend_factory = backend_factory
+        self.pre_roll_seconds = pre_roll_seconds
+        self.endpointer_options = endpointer_options
+
+    def listen(self, on_partial=None, on_speech_end=None, stop=None):
+        """
+        Capture and recognize one utterance.
+
+        Args:
+            on_partial (callable, optional): Called with each new partial hypothesis
+            on_speech_end (callable, optional): Called as soon as the end of speech is detected
+            stop (threading.Event, optional): Set from another thread to stop capturing; the
+                source is closed within one frame and nothing is recognized
+
+        Returns:
+            str: Final transcript, empty if nothing was understood or capture was stopped
+
+        Raises:
+            SpeechTimeoutError: If no speech started before the timeout
+            RecognitionError: If the recognizer backend failed
+        """
+        backend = self.backend_factory()
+        tracer = get_tracer()
+        with tracer.span("stt.capture", backend=type(backend).__name__) as span, self.source_factory() as source:
+            endpointer = EnergyEndpointer(source.sample_rate, source.chunk_size, **self.endpointer_options)
+            pre_roll = deque(maxlen=max(1, int(self.pre_roll_seconds * source.sample_rate / source.chunk_size)))
+            backend.start(source.sample_rate, source.sample_width)
+            last_partial = None
+            ended = False
+            for frame in source.frames():
+                if stop is not None and stop.is_set():
+                    span.set(stopped=True)
+                    return ""
+                event = endpointer.process(frame)
+                if event == SPEECH_TIMEOUT:
+                    raise SpeechTimeoutError("No speech detected before the timeout")
+                if not endpointer.speaking:
+                    pre_roll.append(frame)
+                    continue
+                if event == SPEECH_START:
+                    for buffered in pre_roll:
+                        backend.feed(buffered)
+                partial = backend.feed(frame)
+                if partial and partial != last_partial and on_partial is not None:
+                    last_partial = partial
+                    on_partial(partial)
+                if event == SPEECH_END:
+                    ended = True
+                    break
+            if not endpointer.speaking:
+                # The source ran dry before anyone spoke
+                raise SpeechTimeoutError("No speech detected before the audio ended")
+            span.set(ended=ended)
+        if ended and on_speech_end is not None:
+            on_speech_end()
+        # Time from the end of speech to the final transcript
+        with tracer.span("stt.transcribe", backend=type(backend).__name__) as span:
+            text = backend.finish()
+            span.set(words=len(text.split()))
+        return text
@@ -0,0 +1,57 @@
+import re
+
+# A sentence ends at ., ! or ? followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+class SentenceAssembler:
+    """Accumulates streamed text and releases it one complete sentence at a time."""
+
+    def __init__(self, min_length=20):
+        """
+        Initialize the assembler.
+
+        Args:
+            min_length (int): Minimum characters per released chunk, so very
+                short sentences ("Great.") are spoken together with the next one
+        """
+        self.min_length = min_length
+        self.text = ""
+        self._pending = ""
+
+    def feed(self, chunk):
+        """
+        Add a streamed chunk of text.
+
+        Args:
+            chunk (str): Newly received text
+
+        Returns:
+            list: Complete sentences ready to be spoken
+        """
+        self.text += chunk
+        self._pending += chunk
+        parts = SENTENCE_BOUNDARY.split(self._pending)
+
+        # The last part is still being written
+        sentences = []
+        current = ""
+        for part in parts[:-1]:
+            current = f"{current} {part}" if current else part
+            if len(current) >= self.min_length:
+                sentences.append(current)
+                current = ""
+        self._pending = f"{current} {parts[-1]}" if current else parts[-1]
+        return sentences
+
+    def flush(self):
+        """
+        Release whatever text is left once the stream has ended.
+
+        Returns:
+            list: The remaining sentence, if any
+        """
+        remainder = self._pending.strip()
+        self._pending = ""
+        return [remainder] if remainder else []
+
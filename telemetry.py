@@ -0,0 +1,416 @@
+import atexit
+import contextlib
+import contextvars
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict, deque
+
+# Comma-separated exporters: "log", "prometheus", "otel"; empty disables telemetry
+TELEMETRY_EXPORTERS = os.getenv("TELEMETRY_EXPORTERS", "")
+# Keep per-session timelines in memory and show them in the app's debug panel
+TELEMETRY_DEBUG = os.getenv("TELEMETRY_DEBUG", "0") == "1"
+DEFAULT_PROMETHEUS_PATH = os.getenv("TELEMETRY_PROMETHEUS_PATH", "mock_ai.prom")
+DEFAULT_PROMETHEUS_INTERVAL = 10.0
+DEFAULT_TIMELINE_SPANS = 500
+DEFAULT_TIMELINES = 100
+
+# USD per million tokens (prompt, completion), keyed by model name
+MODEL_PRICES = {
+    "GPT-4": (30.0, 60.0),
+    "Gemini": (0.10, 0.40),
+}
+
+# Upper bounds in seconds of the Prometheus duration histogram
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current_trace = contextvars.ContextVar("telemetry_trace", default=None)
+logger = logging.getLogger(__name__)
+
+
+def new_trace_id():
+    """
+    Create a random trace identifier.
+
+    Returns:
+        str: 32 hex characters, the width OpenTelemetry uses
+    """
+    return uuid.uuid4().hex
+
+
+def cost_usd(model, prompt_tokens, completion_tokens):
+    """
+    Estimate the price of one model call.
+
+    Returns:
+        float: Cost in USD, 0.0 for models without a known price
+    """
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class Span:
+    """
+    One timed stage: a model call, a synthesis, a capture.
+
+    Used as a context manager; the span is handed to the exporters when it
+    exits. Exceptions are recorded and re-raised.
+    """
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "attributes", "start_time", "duration", "_start")
+
+    def __init__(self, tracer, name, trace_id, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.attributes = attributes
+        self.start_time = None
+        self.duration = None
+        self._start = None
+
+    def __enter__(self):
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            # Cancellation and generator shutdown are not failures of the stage
+            if issubclass(exc_type, Exception):
+                self.attributes["error"] = exc_type.__name__
+            else:
+                self.attributes["cancelled"] = True
+        self.tracer._finish(self)
+        return False
+
+    @property
+    def end_time(self):
+        return self.start_time + self.duration
+
+    def set(self, **attributes):
+        """Attach attributes, e.g. sizes or cache hits."""
+        self.attributes.update(attributes)
+
+    def record_usage(self, prompt_tokens, completion_tokens):
+        """
+        Attach token usage reported by the provider and its estimated cost.
+
+        Args:
+            prompt_tokens (int): Tokens in the request
+            completion_tokens (int): Tokens generated
+        """
+        prompt_tokens, completion_tokens = prompt_tokens or 0, completion_tokens or 0
+        self.attributes.update(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                               cost_usd=cost_usd(self.attributes.get("model"), prompt_tokens, completion_tokens))
+
+    def to_dict(self):
+        return {"name": self.name, "trace_id": self.trace_id, "span_id": self.span_id,
+                "start_time": self.start_time, "duration": self.duration, "attributes": dict(self.attributes)}
+
+
+class _NullSpan:
+    """Stand-in returned while telemetry is disabled; every operation is a no-op."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+    def record_usage(self, prompt_tokens, completion_tokens):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class SpanExporter:
+    """Receives finished spans. Exporters must be thread-safe and must not raise."""
+
+    def export(self, span):
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def flush(self):
+        """Write out anything buffered."""
+
+
+class LogExporter(SpanExporter):
+    """One log line per span through the standard logging module."""
+
+    def __init__(self, log=None):
+        self.log = log or logger
+
+    def export(self, span):
+        attributes = " ".join(f"{key}={value}" for key, value in span.attributes.items())
+        self.log.info("span=%s trace=%s duration_ms=%.1f %s", span.name, span.trace_id, span.duration * 1000,
+                      attributes)
+
+
+class PrometheusTextfileExporter(SpanExporter):
+    """
+    Aggregates spans into metrics written in the Prometheus text format.
+
+    The file is meant for node_exporter's textfile collector. It is replaced
+    atomically at most once per interval, so exporting a span is usually just
+    a few dictionary updates.
+    """
+
+    def __init__(self, path=DEFAULT_PROMETHEUS_PATH, interval=DEFAULT_PROMETHEUS_INTERVAL):
+        """
+        Initialize the exporter.
+
+        Args:
+            path (str): File to write
+            interval (float): Minimum seconds between writes
+        """
+        self.path = path
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._buckets = defaultdict(lambda: [0] * len(DURATION_BUCKETS))
+        self._count = defaultdict(int)
+        self._sum = defaultdict(float)
+        self._errors = defaultdict(int)
+        self._tokens = defaultdict(int)
+        self._cost = defaultdict(float)
+        self._written = 0.0
+
+    def export(self, span):
+        with self._lock:
+            stage = span.name
+            self._count[stage] += 1
+            self._sum[stage] += span.duration
+            buckets = self._buckets[stage]
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if span.duration <= bound:
+                    buckets[index] += 1
+            if "error" in span.attributes:
+                self._errors[stage] += 1
+            model = span.attributes.get("model")
+            if "prompt_tokens" in span.attributes:
+                self._tokens[(model, "prompt")] += span.attributes["prompt_tokens"]
+                self._tokens[(model, "completion")] += span.attributes["completion_tokens"]
+                self._cost[model] += span.attributes["cost_usd"]
+            due = time.monotonic() - self._written >= self.interval
+        if due:
+            self.flush()
+
+    def render(self):
+        """
+        Render the current metrics.
+
+        Returns:
+            str: Prometheus text exposition
+        """
+        lines = ["# HELP mock_ai_stage_duration_seconds Time spent in each interview stage.",
+                 "# TYPE mock_ai_stage_duration_seconds histogram"]
+        with self._lock:
+            for stage in sorted(self._count):
+                for bound, count in zip(DURATION_BUCKETS, self._buckets[stage]):
+                    lines.append(f'mock_ai_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'mock_ai_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} '
+                             f'{self._count[stage]}')
+                lines.append(f'mock_ai_stage_duration_seconds_sum{{stage="{stage}"}} {self._sum[stage]}')
+                lines.append(f'mock_ai_stage_duration_seconds_count{{stage="{stage}"}} {self._count[stage]}')
+            lines += ["# HELP mock_ai_stage_errors_total Stages that raised an error.",
+                      "# TYPE mock_ai_stage_errors_total counter"]
+            lines += [f'mock_ai_stage_errors_total{{stage="{stage}"}} {count}'
+                      for stage, count in sorted(self._errors.items())]
+            lines += ["# HELP mock_ai_model_tokens_total Tokens reported by the model providers.",
+                      "# TYPE mock_ai_model_tokens_total counter"]
+            lines += [f'mock_ai_model_tokens_total{{model="{model}",kind="{kind}"}} {count}'
+                      for (model, kind), count in sorted(self._tokens.items())]
+            lines += ["# HELP mock_ai_model_cost_usd_total Estimated spend on model calls.",
+                      "# TYPE mock_ai_model_cost_usd_total counter"]
+            lines += [f'mock_ai_model_cost_usd_total{{model="{model}"}} {cost}'
+                      for model, cost in sorted(self._cost.items())]
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        text = self.render()
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, self.path)
+        except OSError:
+            # Metrics are best effort; never fail the interview over them
+            return
+        self._written = time.monotonic()
+
+
+class OpenTelemetryExporter(SpanExporter):
+    """
+    Re-emits spans through the OpenTelemetry API (optional dependency).
+
+    Spans go to the globally configured tracer provider, so the usual OTEL_*
+    settings or opentelemetry-instrument decide where they are sent.
+    """
+
+    def __init__(self):
+        from opentelemetry import trace
+
+        self._tracer = trace.get_tracer("mock_ai")
+
+    def export(self, span):
+        attributes = {key: value for key, value in span.attributes.items() if value is not None}
+        attributes["mock_ai.trace_id"] = span.trace_id or ""
+        otel_span = self._tracer.start_span(span.name, start_time=int(span.start_time * 1e9), attributes=attributes)
+        if "error" in span.attributes:
+            from opentelemetry.trace import Status, StatusCode
+
+            otel_span.set_status(Status(StatusCode.ERROR, span.attributes["error"]))
+        otel_span.end(end_time=int(span.end_time * 1e9))
+
+
+SPAN_EXPORTERS = {
+    "log": LogExporter,
+    "prometheus": PrometheusTextfileExporter,
+    "otel": OpenTelemetryExporter,
+}
+
+
+def create_exporters(names=None):
+    """
+    Create exporters by name.
+
+    Args:
+        names (str, optional): Comma-separated names, defaults to TELEMETRY_EXPORTERS
+
+    Returns:
+        list: SpanExporter objects
+    """
+    names = TELEMETRY_EXPORTERS if names is None else names
+    exporters = []
+    for name in filter(None, (part.strip() for part in names.split(","))):
+        if name not in SPAN_EXPORTERS:
+            raise ValueError(f"Unknown telemetry exporter: {name}")
+        exporters.append(SPAN_EXPORTERS[name]())
+    return exporters
+
+
+class Tracer:
+    """
+    Creates spans and fans finished ones out to the exporters.
+
+    With no exporters and no timeline the tracer is disabled: span() returns
+    a shared no-op span, so instrumented code pays one attribute check.
+    """
+
+    def __init__(self, exporters=(), keep_timelines=False, timeline_spans=DEFAULT_TIMELINE_SPANS,
+                 max_timelines=DEFAULT_TIMELINES):
+        """
+        Initialize the tracer.
+
+        Args:
+            exporters (iterable): SpanExporter objects
+            keep_timelines (bool): Keep recent spans per trace for the debug panel
+            timeline_spans (int): Spans kept per trace
+            max_timelines (int): Traces kept, least recently updated dropped first
+        """
+        self.exporters = list(exporters)
+        self.keep_timelines = keep_timelines
+        self.timeline_spans = timeline_spans
+        self.max_timelines = max_timelines
+        self.enabled = bool(self.exporters) or keep_timelines
+        self._timelines = OrderedDict()
+        self._lock = threading.Lock()
+
+    def span(self, name, **attributes):
+        """
+        Start a span in the current trace.
+
+        Args:
+            name (str): Stage name, e.g. "llm" or "tts"
+            **attributes: Initial attributes
+
+        Returns:
+            Span: Context manager timing the stage (a no-op while disabled)
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, _current_trace.get(), attributes)
+
+    @contextlib.contextmanager
+    def trace(self, trace_id=None):
+        """
+        Group the spans started inside the block, including those on other threads
+        or on the shared loop that inherit this context.
+
+        Args:
+            trace_id (str, optional): Identifier to use, defaults to a new one
+
+        Yields:
+            str: The trace identifier
+        """
+        trace_id = trace_id or new_trace_id()
+        token = _current_trace.set(trace_id)
+        try:
+            yield trace_id
+        finally:
+            _current_trace.reset(token)
+
+    def _finish(self, span):
+        if self.keep_timelines and span.trace_id is not None:
+            with self._lock:
+                timeline = self._timelines.get(span.trace_id)
+                if timeline is None:
+                    timeline = self._timelines[span.trace_id] = deque(maxlen=self.timeline_spans)
+                    while len(self._timelines) > self.max_timelines:
+                        self._timelines.popitem(last=False)
+                else:
+                    self._timelines.move_to_end(span.trace_id)
+                timeline.append(span)
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception:
+                # A broken exporter must not break the interview
+                pass
+
+    def timeline(self, trace_id):
+        """
+        Get the recent spans of a trace, oldest first.
+
+        Returns:
+            list: Span objects
+        """
+        with self._lock:
+            return sorted(self._timelines.get(trace_id, ()), key=lambda span: span.start_time)
+
+    def flush(self):
+        for exporter in self.exporters:
+            try:
+                exporter.flush()
+            except Exception:
+                pass
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """
+    Get the process-wide tracer, configured from TELEMETRY_EXPORTERS and TELEMETRY_DEBUG.
+
+    Returns:
+        Tracer: The shared tracer
+    """
+    global _tracer
+    if _tracer is not None:
+        return _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            tracer = Tracer(create_exporters(), keep_timelines=TELEMETRY_DEBUG)
+            atexit.register(tracer.flush)
+            _tracer = tracer
+        return _tracer
@@ -0,0 +1,100 @@
+import re
+from dataclasses import asdict, dataclass, field
+
+# Legacy text format used before transcripts were structured
+LEGACY_BLOCK = re.compile(r"Q(\d+): (.*?)\n🗨 You: (.*?)\n🔄 Follow-Up: (.*?)\n🗨 You: (.*)", re.DOTALL)
+
+
+@dataclass
+class TranscriptEntry:
+    """One question turn: the question, the answers, the follow-up and its scoring."""
+
+    question_id: int
+    question: str
+    answer: str = ""
+    followup: str = ""
+    followup_answer: str = ""
+    # Seconds spent in each stage of the turn, e.g. {"answer": 12.3}
+    timings: dict = field(default_factory=dict)
+    score: int = None
+    feedback: str = None
+
+    @property
+    def combined_answer(self):
+        """The answer and the follow-up answer as one text for evaluation."""
+        return " ".join(part for part in (self.answer, self.followup_answer) if part)
+
+    @property
+    def is_scored(self):
+        return self.score is not None
+
+    def to_text(self):
+        """
+        Render the entry in the conversational transcript format.
+
+        Returns:
+            str: Multi-line transcript block
+        """
+        return (
+            f"Q{self.question_id}: {self.question}\n"
+            f"🗨 You: {self.answer}\n"
+            f"🔄 Follow-Up: {self.followup}\n"
+            f"🗨 You: {self.followup_answer}"
+        )
+
+    def to_dict(self):
+        """
+        Convert the entry to plain data for JSON storage.
+
+        Returns:
+            dict: Entry fields
+        """
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build an entry from plain data, ignoring unknown fields.
+
+        Args:
+            data (dict): Entry fields as produced by to_dict
+
+        Returns:
+            TranscriptEntry: The entry
+        """
+        known = {name: data[name] for name in cls.__dataclass_fields__ if name in data}
+        return cls(**known)
+
+    @classmethod
+    def from_text(cls, block):
+        """
+        Parse a transcript block in the legacy text format.
+
+        Args:
+            block (str): Block as rendered by to_text
+
+        Returns:
+            TranscriptEntry: The entry
+
+        Raises:
+            ValueError: If the block is not in the expected format
+        """
+        match = LEGACY_BLOCK.search(block)
+        if not match:
+            raise ValueError(f"Unrecognised transcript block: {block[:60]!r}")
+        question_id, question, answer, followup, followup_answer = match.groups()
+        return cls(int(question_id), question, answer, followup, followup_answer)
+
+
+def load_transcript(items):
+    """
+    Build transcript entries from stored data.
+
+    Args:
+        items (list): Entry dicts, or blocks in the legacy text format
+
+    Returns:
+        list: TranscriptEntry objects
+    """
+    return [TranscriptEntry.from_text(item) if isinstance(item, str) else TranscriptEntry.from_dict(item)
+            for item in items]
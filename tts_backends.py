@@ -0,0 +1,111 @@
+import math
+import os
+import struct
+import wave
+from io import BytesIO
+
+
+class TTSBackend:
+    """Base interface for text-to-speech engines that synthesize into memory."""
+
+    # Identifies the engine in cache keys, so engines never share entries
+    name = None
+    mime_type = "audio/mp3"
+
+    def synthesize(self, text, lang, voice):
+        """
+        Synthesize speech.
+
+        Args:
+            text (str): Text to speak
+            lang (str): Language code
+            voice (str): Voice / accent identifier
+
+        Returns:
+            bytes: Encoded audio
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def estimate_duration(self, audio):
+        """
+        Estimate the playback length of synthesized audio.
+
+        Args:
+            audio (bytes): Audio produced by synthesize
+
+        Returns:
+            float: Seconds
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate TTS via gTTS, written straight into a memory buffer."""
+
+    name = "gtts"
+    mime_type = "audio/mp3"
+    # gTTS returns constant-bitrate 32 kbit/s MP3
+    BITRATE = 32000
+
+    def synthesize(self, text, lang, voice):
+        from gtts import gTTS
+
+        buffer = BytesIO()
+        gTTS(text=text, lang=lang, tld=voice).write_to_fp(buffer)
+        return buffer.getvalue()
+
+    def estimate_duration(self, audio):
+        return len(audio) * 8 / self.BITRATE
+
+
+class OfflineTTSBackend(TTSBackend):
+    """
+    Local engine that renders a soft tone instead of speech.
+
+    Needs no network, so tests and benchmarks can drive the full speech path
+    deterministically. Duration scales with the number of words.
+    """
+
+    name = "offline"
+    mime_type = "audio/wav"
+
+    def __init__(self, seconds_per_word=0.3, sample_rate=16000):
+        self.seconds_per_word = seconds_per_word
+        self.sample_rate = sample_rate
+
+    def synthesize(self, text, lang, voice):
+        frames = int(max(1, len(text.split())) * self.seconds_per_word * self.sample_rate)
+        samples = (int(2000 * math.sin(2 * math.pi * 220 * i / self.sample_rate)) for i in range(frames))
+        buffer = BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(struct.pack(f"<{frames}h", *samples))
+        return buffer.getvalue()
+
+    def estimate_duration(self, audio):
+        with wave.open(BytesIO(audio), "rb") as wav:
+            return wav.getnframes() / wav.getframerate()
+
+
+TTS_BACKENDS = {
+    GTTSBackend.name: GTTSBackend,
+    OfflineTTSBackend.name: OfflineTTSBackend,
+}
+
+
+def create_tts_backend(name=None):
+    """
+    Create a TTS backend by name.
+
+    Args:
+        name (str, optional): Backend name, defaults to the TTS_BACKEND environment variable or "gtts"
+
+    Returns:
+        TTSBackend: The backend
+    """
+    name = name or os.getenv("TTS_BACKEND", GTTSBackend.name)
+    if name not in TTS_BACKENDS:
+        raise ValueError(f"Unknown TTS backend: {name}")
+    return TTS_BACKENDS[name]()
@@ -0,0 +1,293 @@
+import argparse
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from telemetry import get_tracer
+from tts_backends import TTS_BACKENDS, create_tts_backend
+
+DEFAULT_CACHE_DIR = os.getenv("TTS_CACHE_DIR", ".tts_cache")
+DEFAULT_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+DEFAULT_LANG = "en"
+# gTTS selects the accent through the Google Translate top-level domain
+DEFAULT_VOICE = "com"
+AUDIO_SUFFIX = ".audio"
+
+
+class AudioCache:
+    """
+    Disk-backed, size-bounded LRU cache of synthesized speech.
+
+    Entries are audio files named after a hash of engine, text, language and
+    voice, so fixed prompts are synthesized once and shared by every session
+    and worker process using the same cache directory. Synthesis happens in
+    memory; the disk copy is only written for later reuse.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, backend=None):
+        """
+        Initialize the cache, indexing files left by previous runs.
+
+        Args:
+            cache_dir (str): Directory holding the cached audio files
+            max_bytes (int): Maximum total size of the cached files
+            backend (TTSBackend, optional): Engine used on a miss, defaults to TTS_BACKEND / gTTS
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.backend = backend or create_tts_backend()
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        files = []
+        for entry in os.scandir(cache_dir):
+            if entry.is_file() and entry.name.endswith(AUDIO_SUFFIX):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-len(AUDIO_SUFFIX)], stat.st_size))
+        # Least recently used first
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def make_key(self, text, lang=DEFAULT_LANG, voice=DEFAULT_VOICE):
+        """
+        Build the cache key for an utterance.
+
+        Args:
+            text (str): Text to speak
+            lang (str): Language code
+            voice (str): Voice / accent identifier
+
+        Returns:
+            str: Hex digest identifying the audio
+        """
+        raw = f"{self.backend.name}\0{lang}\0{voice}\0{text}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}{AUDIO_SUFFIX}")
+
+    def get(self, text, lang=DEFAULT_LANG, voice=DEFAULT_VOICE):
+        """
+        Look up cached audio.
+
+        Returns:
+            str: Path of the cached audio file, or None on a miss
+        """
+        key = self.make_key(text, lang, voice)
+        path = self._path(key)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            if not os.path.exists(path):
+                # Removed by another process sharing the directory
+                self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        try:
+            # Persist recency so other processes and restarts keep the LRU order
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def put(self, text, data, lang=DEFAULT_LANG, voice=DEFAULT_VOICE):
+        """
+        Store synthesized audio.
+
+        Args:
+            text (str): Text that was spoken
+            data (bytes): Encoded audio
+            lang (str): Language code
+            voice (str): Voice / accent identifier
+
+        Returns:
+            str: Path of the cached audio file
+        """
+        key = self.make_key(text, lang, voice)
+        path = self._path(key)
+        # A unique name, so threads and other server processes writing the same key never share a temp file
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=f"{key}.", suffix=".tmp", delete=False) as f:
+            temp_path = f.name
+            try:
+                f.write(data)
+            except BaseException:
+                f.close()
+                os.remove(temp_path)
+                raise
+        os.replace(temp_path, path)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep):
+        # Oldest entries first
+        for key in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # Still open for playback (Windows); retry on a later eviction
+                continue
+            self._total_bytes -= self._entries.pop(key)
+
+    def get_audio(self, text, lang=DEFAULT_LANG, voice=DEFAULT_VOICE):
+        """
+        Look up cached audio and load it into memory.
+
+        Returns:
+            bytes: Encoded audio, or None on a miss
+        """
+        path = self.get(text, lang, voice)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            # Evicted by another process between lookup and read
+            return None
+
+    def get_or_synthesize(self, text, lang=DEFAULT_LANG, voice=DEFAULT_VOICE):
+        """
+        Return cached audio, synthesizing it on a miss.
+
+        Returns:
+            bytes: Encoded audio
+        """
+        with get_tracer().span("tts", backend=self.backend.name, chars=len(text)) as span:
+            audio = self.get_audio(text, lang, voice)
+            span.set(cached=audio is not None)
+            if audio is not None:
+                return audio
+            return self.synthesize(text, lang, voice)
+
+    def synthesize(self, text, lang=DEFAULT_LANG, voice=DEFAULT_VOICE):
+        """
+        Synthesize text in memory and store a copy for later reuse.
+
+        Returns:
+            bytes: Encoded audio
+        """
+        audio = self.backend.synthesize(text, lang, voice)
+        self.put(text, audio, lang, voice)
+        return audio
+
+    def get_stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Entry count, size and hit/miss counters
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+_audio_cache = None
+_audio_cache_lock = threading.Lock()
+
+
+def get_audio_cache():
+    """
+    Get the process-wide audio cache.
+
+    Returns:
+        AudioCache: The shared audio cache
+    """
+    global _audio_cache
+    with _audio_cache_lock:
+        if _audio_cache is None:
+            _audio_cache = AudioCache()
+        return _audio_cache
+
+
+def warm_up(texts, cache=None):
+    """
+    Pre-render audio for fixed prompts.
+
+    Args:
+        texts (iterable): Texts to synthesize
+        cache (AudioCache, optional): Cache to fill, defaults to the shared cache
+
+    Returns:
+        int: Number of texts that had to be synthesized
+    """
+    cache = cache or get_audio_cache()
+    synthesized = 0
+    for text in texts:
+        if cache.get(text) is None:
+            cache.synthesize(text)
+            synthesized += 1
+    return synthesized
+
+
+def bank_questions(bank, per_track=None):
+    """
+    List question texts from every track of a question bank.
+
+    Args:
+        bank (QuestionBank): Bank to read
+        per_track (int, optional): Questions per track at most, nearest the starting difficulty first;
+            None for all
+
+    Returns:
+        list: Question texts
+    """
+    from question_bank import DEFAULT_DIFFICULTY
+
+    texts = []
+    for track in bank.tracks():
+        index = bank.index(track)
+        # New candidates start at the default difficulty, so its questions are the likeliest to be asked first
+        positions = sorted(range(len(index)),
+                           key=lambda position: abs(index.difficulties[position] - DEFAULT_DIFFICULTY))
+        for position in positions[:per_track]:
+            texts.append(bank.get(index.ids[position]).text)
+    return texts
+
+
+def main():
+    from question_bank import create_question_bank
+
+    parser = argparse.ArgumentParser(description="Pre-render interview question audio into the TTS cache.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Cache directory")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES, help="Maximum cache size in bytes")
+    parser.add_argument("--backend", choices=sorted(TTS_BACKENDS), help="TTS engine, defaults to TTS_BACKEND / gtts")
+    parser.add_argument("--bank", help="Question bank (.jsonl or SQLite), defaults to QUESTION_BANK / built-in tracks")
+    parser.add_argument("--per-track", type=int,
+                        help="Questions per track at most, nearest the starting difficulty first; default all")
+    args = parser.parse_args()
+
+    cache = AudioCache(args.cache_dir, args.max_bytes, create_tts_backend(args.backend))
+    questions = bank_questions(create_question_bank(args.bank), args.per_track)
+    synthesized = warm_up(questions, cache)
+    print(f"Synthesized {synthesized} of {len(questions)} questions.", cache.get_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,63 @@
 import streamlit as st
 
+from evaluation import MAX_SCORE
+
+
+def render_app_styles():
+    """
+    Inject the global CSS for buttons, cards and the tier section.
+    """
+    st.markdown("""
+        <style>
+        .stButton>button {
+           display: flex;
+           align-items: center;
+           font-family: inherit;
+           cursor: pointer;
+           font-weight: 500;
+           font-size: 16px;
+           padding: 1.1em 4em 1.1em 3.5em;
+           color: white;
+           background: #A020F0;
+           background: linear-gradient(
+               0deg,
+               rgba(160, 32, 240, 1) 0%,
+               rgba(147, 112, 219, 1) 100%
+           );
+           border: none;
+           box-shadow: 0 0.7em 1.5em -0.5em #A020F098;
+           letter-spacing: 0.05em;
+           border-radius: 20em;
+           margin-top: 0.8em;
+        }
+        .stButton>button svg {
+          margin-right: 6px;
+        }
+        .stButton>button:hover {
+          color: white;
+          box-shadow: 0 0.5em 1.5em -0.5em #A020F098;
+        }
+        .stButton>button:active {
+          box-shadow: 0 0.3em 1em -0.5em #A020F098;
+        }
+        .card {
+            background: #ffffff;
+            padding: 1rem;
+            border-radius: 10px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+            margin-bottom: 1rem;
+        }
+        .tier-section {
+            background: rgba(160, 32, 240, 0.05);
+            padding: 1rem;
+            border-radius: 10px;
+            margin-bottom: 1.5rem;
+            border-left: 4px solid #A020F0;
+        }
+        </style>
+    """, unsafe_allow_html=True)
+
+
 def render_tier_toggle():
     """
     Render a toggle for selecting between Personal and Corporate tiers.
@@ -155,3 +213,48 @@ def display_model_info(model):
             <p><strong>Tier:</strong> {info['tier'].capitalize()}</p>
         </div>
     """, unsafe_allow_html=True)
+
+def render_debug_timeline(spans):
+    """
+    Display the stages of the last interview as a timeline table.
+
+    Args:
+        spans (list): telemetry.Span objects of one trace, oldest first
+    """
+    with st.expander("🛠 Debug: last session timeline", expanded=False):
+        if not spans:
+            st.caption("No stages recorded yet.")
+            return
+        origin = spans[0].start_time
+        st.dataframe([
+            {
+                "stage": span.name,
+                "start (ms)": round((span.start_time - origin) * 1000),
+                "duration (ms)": round(span.duration * 1000, 1),
+                "details": ", ".join(f"{key}={value}" for key, value in span.attributes.items())
+            }
+            for span in spans
+        ], use_container_width=True)
+        cost = sum(span.attributes.get("cost_usd", 0.0) for span in spans)
+        tokens = sum(span.attributes.get("prompt_tokens", 0) + span.attributes.get("completion_tokens", 0)
+                     for span in spans)
+        st.caption(f"{len(spans)} stages, {tokens} model tokens, ≈ ${cost:.4f}")
+
+def render_session_history(sessions):
+    """
+    List a candidate's earlier interviews.
+
+    Args:
+        sessions (list): Session dicts from a SessionStore, newest first
+    """
+    if not sessions:
+        st.caption("No saved interviews yet.")
+        return
+    from datetime import datetime
+
+    for session in sessions:
+        started = datetime.fromtimestamp(session["started_at"]).strftime("%Y-%m-%d %H:%M")
+        score = f"{session['overall_score']:.1f}/{MAX_SCORE}" if session["overall_score"] is not None else "not scored"
+        status = "" if session["finished_at"] else " (unfinished)"
+        st.markdown(f"**{started}** · {session['track']} · {session['model'] or ''} · "
+                    f"{session['turns']} questions · {score}{status}")
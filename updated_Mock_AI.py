@@ -1,213 +1,344 @@
 ﻿import streamlit as st
-import openai
-import speech_recognition as sr
-from gtts import gTTS
 import os
-import uuid
-import matplotlib.pyplot as plt
-import re
-from colorama import init
-import time
-from threading import Thread
+import asyncio
+from threading import Event, current_thread
 from dotenv import load_dotenv
-import pygame
-from uuid import uuid4
-import plotly.graph_objects as go
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# Heavy libraries (speech_recognition, pygame, matplotlib, plotly, provider SDKs)
+# are imported where they are first used, so the page renders before they load.
 
 # Import custom modules for model interface and UI components
 from model_interface import initialize_models
-from ui_components import render_tier_toggle, render_model_chooser, display_model_info
+from ui_components import (
+    render_app_styles, render_tier_toggle, render_model_chooser, display_model_info, render_debug_timeline,
+    render_session_history
+)
+from tts_cache import get_audio_cache
+from audio_playback import get_playback_service
+from evaluation import aggregate_evaluations, evaluate_entry
+from charts import gauge_figure, score_chart_png
+from speech_input import RecognitionError, SpeechTimeoutError, StreamingSpeechInput, create_recognizer_backend
+from speculation import SpeculationStats
+from interview_engine import (
+    AudioInputPort, AudioOutputPort, InterviewCheckpoint, InterviewListener, InterviewSession
+)
+from telemetry import TELEMETRY_DEBUG, get_tracer, new_trace_id
+from session_store import create_session_store
+from question_bank import create_question_bank, select_questions, warm_questions
+from adaptive_difficulty import AdaptiveQuestionPicker
 
-init(autoreset=True)
 st.set_page_config(layout="wide")
-st.markdown("""
-    <style>
-    .stButton>button {
-       display: flex;
-       align-items: center;
-       font-family: inherit;
-       cursor: pointer;
-       font-weight: 500;
-       font-size: 16px;
-       padding: 1.1em 4em 1.1em 3.5em;
-       color: white;
-       background: #A020F0;
-       background: linear-gradient(
-           0deg,
-           rgba(160, 32, 240, 1) 0%,
-           rgba(147, 112, 219, 1) 100%
-       );
-       border: none;
-       box-shadow: 0 0.7em 1.5em -0.5em #A020F098;
-       letter-spacing: 0.05em;
-       border-radius: 20em;
-       margin-top: 0.8em;
-    }
-    .stButton>button svg {
-      margin-right: 6px;
-    }
-    .stButton>button:hover {
-      color: white;
-      box-shadow: 0 0.5em 1.5em -0.5em #A020F098;
-    }
-    .stButton>button:active {
-      box-shadow: 0 0.3em 1em -0.5em #A020F098;
-    }
-    .card {
-        background: #ffffff;
-        padding: 1rem;
-        border-radius: 10px;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        margin-bottom: 1rem;
-    }
-    .tier-section {
-        background: rgba(160, 32, 240, 0.05);
-        padding: 1rem;
-        border-radius: 10px;
-        margin-bottom: 1.5rem;
-        border-left: 4px solid #A020F0;
-    }
-    </style>
-""", unsafe_allow_html=True)
+render_app_styles()
 load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# "server" plays speech on this machine, "browser" streams it to the page
+AUDIO_OUTPUT = os.getenv("AUDIO_OUTPUT", "server")
+# Draft follow-ups from partial transcripts while the candidate is still answering; only
+# recognizers that produce partials (Vosk, or Google with STT_PARTIAL_INTERVAL) can feed them
+SPECULATIVE_FOLLOWUP = (os.getenv("SPECULATIVE_FOLLOWUP", "1") == "1"
+                        and create_recognizer_backend().provides_partials)
+QUESTIONS_PER_INTERVIEW = int(os.getenv("QUESTIONS_PER_INTERVIEW", "3"))
+# Choose each next question from the candidate's scores instead of fixing them all at the start
+ADAPTIVE_DIFFICULTY = os.getenv("ADAPTIVE_DIFFICULTY", "1") == "1"
+# Also send slow scoring requests to the other models of the selected model's tier
+HEDGED_EVALUATION = os.getenv("HEDGED_EVALUATION", "0") == "1"
 static_gif_path = r"D:\projectx\PythoAAAAAAAAAAAAAAA\AI-talking-avatar.png"
 animated_gif_path = r"D:\projectx\PythoAAAAAAAAAAAAAAA\AI-talking-avatar.gif"
-recognizer = sr.Recognizer()
 
 # Initialize session state variables
-for key in ["interview_complete", "transcript", "evaluation_scores", "start_clicked", "paused", "mute", "greeted"]:
+for key in ["interview_complete", "transcript", "question_evaluations", "start_clicked", "paused", "mute"]:
     if key not in st.session_state:
-        st.session_state[key] = False if key in ["interview_complete", "start_clicked", "paused", "mute",
-                                                 "greeted"] else []
-
-# Initialize model registry
-if "model_registry" not in st.session_state:
-    st.session_state["model_registry"] = initialize_models()
-
-interview_tracks = {
-    "Data Scientist": [
-        "Explain overfitting in machine learning.",
-        "What is the difference between supervised and unsupervised learning?",
-        "How do you handle imbalanced datasets?",
-        "What is feature engineering?",
-        "Explain the bias-variance tradeoff."
-    ],
-    "Software Engineer": [
-        "What is your approach to debugging code?",
-        "Explain multithreading vs multiprocessing.",
-        "What is the concept of clean code?",
-        "How do you ensure code security?",
-        "Explain RESTful APIs."
-    ],
-}
-
-
-def speak_with_gif(text, gif_placeholder, animated_gif_path, static_gif_path):
+        st.session_state[key] = False if key in ["interview_complete", "start_clicked", "paused", "mute"] else []
+
+# Where the interview is, so a rerun resumes it instead of starting over
+if "checkpoint" not in st.session_state:
+    st.session_state["checkpoint"] = InterviewCheckpoint()
+if "speculation_stats" not in st.session_state:
+    st.session_state["speculation_stats"] = SpeculationStats()
+# Groups this session's telemetry spans for the debug panel
+if "trace_id" not in st.session_state:
+    st.session_state["trace_id"] = new_trace_id()
+
+@st.cache_resource
+def get_model_registry():
+    """
+    Get the process-wide model registry.
+
+    Models, their clients, connection pools and caches are created once and
+    shared by every session; each session only stores the name of the model
+    it selected.
+    """
+    return initialize_models()
+
+
+@st.cache_resource
+def get_session_store():
+    """
+    Get the process-wide store that keeps sessions, transcripts and scores after the tab closes.
+    """
+    return create_session_store()
+
+
+@st.cache_resource
+def get_question_bank():
+    """
+    Get the process-wide question bank; tracks are indexed on first use and shared by every session.
+    """
+    return create_question_bank()
+
+
+def get_selected_model():
+    """
+    Get the model selected in this session, or the registry default.
+    """
+    registry = get_model_registry()
+    selected = st.session_state.get("selected_model")
+    return registry.get_model(selected if selected in registry.models else None)
+
+
+def get_evaluator():
+    """
+    Get the model that scores this session's answers: the selected one, hedged when HEDGED_EVALUATION is on.
+    """
+    model = get_selected_model()
+    return get_model_registry().hedged(model.name) if HEDGED_EVALUATION else model
+
+
+async def run_blocking(func, *args):
+    """
+    Run a blocking call on a worker thread that can still draw Streamlit elements.
+    """
+    ctx = get_script_run_ctx()
+
+    def call():
+        add_script_run_ctx(current_thread(), ctx)
+        return func(*args)
+
+    return await asyncio.to_thread(call)
+
+
+def synthesize_speech(text):
+    """
+    Synthesize text to audio in memory, reusing cached audio for text heard before.
+
+    Returns:
+        bytes: Encoded audio
+    """
+    return get_audio_cache().get_or_synthesize(text)
+
+
+async def presynthesize_speech(text):
+    """
+    Synthesize text ahead of time so it can be played without waiting.
+
+    Returns:
+        bytes: Encoded audio, or None when muted or synthesis failed
+    """
+    if st.session_state["mute"]:
+        return None
+    try:
+        return await asyncio.to_thread(synthesize_speech, text)
+    except Exception:
+        # speak_with_gif synthesizes again and reports the error
+        return None
+
+
+async def speak_with_gif(text, gif_placeholder, animated_gif_path, static_gif_path, audio=None):
+    """
+    Speak text while showing the animated avatar.
+
+    Audio is played on the server through the shared playback service, or
+    sent to the browser with st.audio when AUDIO_OUTPUT is "browser".
+
+    Args:
+        text (str): Text to speak
+        gif_placeholder (st.empty): Placeholder for the avatar
+        animated_gif_path (str): Avatar shown while speaking
+        static_gif_path (str): Avatar shown otherwise
+        audio (bytes, optional): Pre-synthesized audio for the text
+    """
+    if st.session_state["mute"]:
+        return
     try:
-        if st.session_state["mute"]:
-            return
-        temp_audio_file = f"temp_speech_{uuid4().hex}.mp3"
-        tts = gTTS(text=text, lang='en')
-        tts.save(temp_audio_file)
-        pygame.mixer.init()
-        pygame.mixer.music.load(temp_audio_file)
-        pygame.mixer.music.play()
-        gif_placeholder.image(animated_gif_path, width=850)
-        while pygame.mixer.music.get_busy():
-            pygame.time.wait(100)
+        if audio is None:
+            audio = await asyncio.to_thread(synthesize_speech, text)
+        if AUDIO_OUTPUT == "browser":
+            tts_backend = get_audio_cache().backend
+            with get_tracer().span("playback", bytes=len(audio), browser=True):
+                st.audio(audio, format=tts_backend.mime_type, autoplay=True)
+                gif_placeholder.image(animated_gif_path, width=850)
+                # The browser gives no completion signal; wait out the clip so turns do not overlap
+                await asyncio.sleep(tts_backend.estimate_duration(audio))
+        else:
+            with get_tracer().span("playback", bytes=len(audio)):
+                played = get_playback_service().enqueue(audio, session=st.session_state["trace_id"])
+                gif_placeholder.image(animated_gif_path, width=850)
+                await asyncio.wrap_future(played)
     except Exception as e:
         st.error(f"❌ Error during playback: {e}")
     finally:
-        pygame.mixer.music.stop()
-        pygame.mixer.quit()
         gif_placeholder.image(static_gif_path, width=850)
-        try:
-            os.remove(temp_audio_file)
-        except PermissionError:
-            time.sleep(1)
-            os.remove(temp_audio_file)
 
 
-def get_speech_input():
-    with sr.Microphone() as source:
-        st.info("🎙 Listening... Please speak your answer.")
-        try:
-            audio = recognizer.listen(source, timeout=5, phrase_time_limit=15)
-            text = recognizer.recognize_google(audio)
-            st.success(f"✅ You : {text}")
-            return text
-        except sr.UnknownValueError:
-            st.error("❌ Could not understand the audio.")
-        except sr.RequestError as e:
-            st.error(f"❌ Error: {e}")
-        except sr.WaitTimeoutError:
-            st.error("❌ Listening timed out.")
-    return ""
-
-
-def chat_with_gpt(prompt):
+def get_speech_input(on_partial=None, stop=None):
     """
-    Generate a response using the currently selected model.
+    Listen for one answer, showing partial hypotheses while the candidate speaks.
+
+    Capture stops as soon as the end of speech is detected, so the caller can
+    start on the follow-up without waiting out a fixed pause.
+
+    Args:
+        on_partial (callable, optional): Also called with each partial hypothesis
+        stop (threading.Event, optional): Set to stop listening and release the microphone
+
+    Returns:
+        str: The recognized answer, or "" if nothing was understood or listening was stopped
     """
+    st.info("🎙 Listening... Please speak your answer.")
+    partial_placeholder = st.empty()
     try:
-        # Get the current model from the registry
-        model = st.session_state["model_registry"].get_model()
+        def show_partial(partial):
+            partial_placeholder.caption(f"🎙 {partial}…")
+            if on_partial is not None:
+                on_partial(partial)
+
+        text = StreamingSpeechInput().listen(
+            on_partial=show_partial,
+            on_speech_end=lambda: partial_placeholder.caption("⏳ Transcribing..."),
+            stop=stop
+        )
+        if stop is not None and stop.is_set():
+            return ""
+    except SpeechTimeoutError:
+        partial_placeholder.empty()
+        st.error("❌ Listening timed out.")
+        return ""
+    except RecognitionError as e:
+        partial_placeholder.empty()
+        st.error(f"❌ Error: {e}")
+        return ""
+    partial_placeholder.empty()
+    if not text:
+        st.error("❌ Could not understand the audio.")
+        return ""
+    st.success(f"✅ You : {text}")
+    return text
 
-        # Generate response using the selected model
-        system_message = "You are a professional interviewer. Avoid greetings and keep it focused."
-        response = model.generate_response(prompt, system_message)
-
-        return response
-    except Exception as e:
-        st.error(f"❌ Model Error: {e}")
-        return "Error generating response."
 
+def evaluate_answers():
+    """
+    Collect the per-question evaluations and aggregate them into the report.
 
-def generate_followup_with_feedback(user_response):
-    followup_prompt = f"""
-    Based on the following interview answer, generate a follow-up question with subtle, natural feedback included.
-    Do not explicitly state 'Follow-Up Question:' in your response. Keep it natural and conversational.
-    Answer: {user_response}
+    Entries scored in the background are already complete; any entry whose
+    background scoring failed or never ran is scored now.
     """
-    return chat_with_gpt(followup_prompt)
+    model = get_evaluator()
+    for future in st.session_state["question_evaluations"]:
+        try:
+            future.result()
+        except Exception:
+            # Retried below
+            pass
+    for entry in st.session_state["transcript"]:
+        if entry.is_scored:
+            continue
+        try:
+            evaluate_entry(model, entry)
+        except Exception as e:
+            st.error(f"❌ Could not score Q{entry.question_id}: {e}")
+            continue
+        get_session_store().record_evaluation(st.session_state["checkpoint"].session_id, entry)
+    return aggregate_evaluations(st.session_state["transcript"])
 
 
-def evaluate_answers():
-    evaluation_prompt = """
-    Evaluate the following interview transcript. Provide structured feedback in the exact format below:
+class StreamlitAudioInput(AudioInputPort):
+    """Microphone answers, with listening status and partial transcripts drawn on the page."""
+
+    async def listen(self, on_partial=None):
+        stop = Event()
+        try:
+            return await run_blocking(get_speech_input, on_partial, stop)
+        finally:
+            # Cancelled by a rerun or stop: the capture thread outlives this task, so tell it to close the microphone
+            stop.set()
+
+
+class StreamlitAudioOutput(AudioOutputPort):
+    """Speech with the talking avatar, honouring the mute button."""
+
+    def __init__(self, gif_placeholder):
+        self.gif_placeholder = gif_placeholder
+
+    async def prepare(self, text):
+        return await presynthesize_speech(text)
 
-    1. Question: <Question>
-       Answer: <User's Answer>
-       Score: <Score out of 10>
-       Feedback: <Brief one-line feedback>
+    async def speak(self, text, audio=None):
+        await speak_with_gif(text, self.gif_placeholder, animated_gif_path, static_gif_path, audio)
 
-    (as many questions as we have asked)
 
-    At the end, include:
-    Overall Feedback: <Summary of overall performance>
+class StreamlitInterviewListener(InterviewListener):
+    """Renders interview progress and keeps the session flags in st.session_state."""
+
+    def __init__(self):
+        self.followup_placeholder = None
+
+    def greeting(self, text):
+        st.info(f"🤖 AI : {text}")
+
+    def question_started(self, index, total):
+        st.progress((index + 1) / total)
+
+    def paused(self):
+        st.warning("⏸ Interview is paused. Click the pause button to resume.")
+
+    def question_asked(self, question):
+        st.markdown(f'<div class="card"><strong>🤖 AI:</strong> {question}</div>', unsafe_allow_html=True)
+
+    def followup_started(self):
+        self.followup_placeholder = st.empty()
+
+    def followup_partial(self, text):
+        self.followup_placeholder.markdown(f'<div class="card"><strong>🤖 AI:</strong> {text}▌</div>',
+                                           unsafe_allow_html=True)
+
+    def followup_asked(self, text):
+        if text:
+            self.followup_placeholder.markdown(f'<div class="card"><strong>🤖 AI:</strong> {text}</div>',
+                                               unsafe_allow_html=True)
+        else:
+            self.followup_placeholder.empty()
+
+    def error(self, message):
+        st.error(f"❌ {message}")
+
+    def farewell(self, text):
+        st.info(f"🤖 AI : {text}")
+        st.session_state["interview_complete"] = True
+
+
+def create_interview_session(username, track, questions, gif_placeholder):
+    """
+    Build the interview engine for this browser session, wired to Streamlit ports.
+
+    Returns:
+        InterviewSession: Session that records into st.session_state
     """
-    for i, entry in enumerate(st.session_state["transcript"]):
-        match = re.search(r"Q\d+: (.*?)\n🗨 You: (.*?)\n🔄 Follow-Up: (.*?)\n🗨 You: (.*)", entry, re.DOTALL)
-        if match:
-            question = match.group(1)
-            answer = match.group(2) + " " + match.group(4)
-            evaluation_prompt += f"\n{i + 1}. Question: {question}\nAnswer: {answer}\n"
-    evaluation = chat_with_gpt(evaluation_prompt)
-    scores = re.findall(r"Score:\s?(\d+)", evaluation)
-    return evaluation, [int(s) for s in scores] if scores else [0] * len(st.session_state["transcript"])
-
-
-def plot_evaluation_chart(scores):
-    fig, ax = plt.subplots(figsize=(5, 3))
-    questions = [f"Q{i + 1}" for i in range(len(scores))]
-    ax.bar(questions, scores, color="#8F00FF")
-    ax.set_title("Interview Evaluation Scores", fontsize=14)
-    ax.set_xlabel("Questions", fontsize=12)
-    ax.set_ylabel("Score (out of 10)", fontsize=12)
-    ax.set_ylim([0, 10])
-    plt.tight_layout()
-    st.pyplot(fig)
+    session = InterviewSession(
+        username, track, questions, get_selected_model(),
+        StreamlitAudioInput(), StreamlitAudioOutput(gif_placeholder), StreamlitInterviewListener(),
+        checkpoint=st.session_state["checkpoint"],
+        store=get_session_store(),
+        picker=st.session_state.get("picker"),
+        evaluator=get_evaluator(),
+        transcript=st.session_state["transcript"],
+        evaluations=st.session_state["question_evaluations"],
+        speculative=SPECULATIVE_FOLLOWUP,
+        speculation_stats=st.session_state["speculation_stats"],
+        trace_id=st.session_state["trace_id"]
+    )
+    if st.session_state["paused"]:
+        session.pause()
+    return session
 
 
 # Main application layout
@@ -221,17 +352,15 @@ with st.expander("🔧 Model Settings", expanded=True):
     selected_tier = render_tier_toggle()
 
     # Get models for the selected tier
-    tier_models = st.session_state["model_registry"].get_models_by_tier(selected_tier)
+    tier_models = get_model_registry().get_models_by_tier(selected_tier)
 
     # Render model chooser
     if tier_models:
-        selected_model_name = render_model_chooser(tier_models)
-
-        # Set the current model in the registry
-        st.session_state["model_registry"].set_current_model(selected_model_name)
+        # The chooser keeps the selection in this session's state, not in the shared registry
+        render_model_chooser(tier_models)
 
         # Display current model info
-        current_model = st.session_state["model_registry"].get_model()
+        current_model = get_selected_model()
         display_model_info(current_model)
     else:
         st.warning(f"No models available for {selected_tier} tier.")
@@ -250,16 +379,24 @@ with cols[1]:
 with cols[2]:
     end_call_btn = st.button("❌ END", key="end_call_btn")
 
+if TELEMETRY_DEBUG:
+    render_debug_timeline(get_tracer().timeline(st.session_state["trace_id"]))
+
 if pause_btn:
     st.session_state["paused"] = not st.session_state["paused"]
     st.info("⏸ Interview paused." if st.session_state["paused"] else "▶ Interview resumed.")
 if mute_btn:
     st.session_state["mute"] = not st.session_state["mute"]
+    if st.session_state["mute"]:
+        # Cut off this session's speech now; other sessions share the mixer and keep playing
+        get_playback_service().stop(st.session_state["trace_id"])
     st.info("🔇 Audio muted." if st.session_state["mute"] else "🔊 Audio unmuted.")
 if end_call_btn:
-    for key in ["interview_complete", "transcript", "evaluation_scores", "start_clicked", "paused", "mute", "greeted"]:
-        st.session_state[key] = False if key in ["interview_complete", "start_clicked", "paused", "mute",
-                                                 "greeted"] else []
+    for key in ["interview_complete", "transcript", "question_evaluations", "start_clicked", "paused", "mute"]:
+        st.session_state[key] = False if key in ["interview_complete", "start_clicked", "paused", "mute"] else []
+    st.session_state["checkpoint"] = InterviewCheckpoint()
+    st.session_state.pop("questions", None)
+    st.session_state.pop("picker", None)
     st.experimental_rerun()
 
 with st.sidebar:
@@ -267,57 +404,45 @@ with st.sidebar:
         st.title("🎓 AI Mock Interview Platform")
         if not st.session_state["start_clicked"]:
             username = st.text_input("Enter Your Name:", "")
-            track = st.selectbox("Select Your Interview Track:", list(interview_tracks.keys()))
+            track = st.selectbox("Select Your Interview Track:", get_question_bank().tracks())
             if st.button("Start Interview"):
                 if username.strip():
                     st.session_state["username"] = username
                     st.session_state["track"] = track
                     st.session_state["start_clicked"] = True
+                    # Either way, questions this candidate has already had are skipped
+                    if ADAPTIVE_DIFFICULTY:
+                        # The engine asks the picker for each later question while the previous turn ends
+                        picker = AdaptiveQuestionPicker.for_candidate(
+                            get_question_bank(), track, QUESTIONS_PER_INTERVIEW, username, get_session_store())
+                        # The first depends only on past sessions: choose it now, synthesize it during the greeting
+                        first = picker.next_question()
+                        warm_questions([first])
+                        st.session_state["picker"] = picker
+                        st.session_state["questions"] = [first.text]
+                    else:
+                        st.session_state["questions"] = [
+                            question.text for question in select_questions(
+                                get_question_bank(), track, QUESTIONS_PER_INTERVIEW, username, get_session_store())
+                        ]
+                    # A fresh timeline for the new interview
+                    st.session_state["trace_id"] = new_trace_id()
                 else:
                     st.error("Please enter your name before starting.")
         else:
             username = st.session_state["username"]
             track = st.session_state["track"]
-            questions = interview_tracks[track][:3]
-            total_questions = len(questions)
-            current_question_index = 0
-            if not st.session_state["greeted"]:
-                greeting = f"Hi, how are you, {username}? Welcome to the {track} interview."
-                st.info(f"🤖 AI : {greeting}")
-                speak_with_gif(greeting, gif_placeholder, animated_gif_path, static_gif_path)
-                st.session_state["greeted"] = True
+            questions = st.session_state["questions"]
             if not st.session_state["interview_complete"]:
-                for i, question in enumerate(questions):
-                    current_question_index = i
-                    progress = (current_question_index + 1) / total_questions
-                    st.progress(progress)
-                    while st.session_state["paused"]:
-                        st.warning("⏸ Interview is paused. Click the pause button to resume.")
-                        time.sleep(1)
-                    speak_with_gif(question, gif_placeholder, animated_gif_path, static_gif_path)
-                    st.markdown(f'<div class="card"><strong>🤖 AI:</strong> {question}</div>', unsafe_allow_html=True)
-                    user_response = get_speech_input()
-                    if user_response == "" and st.session_state["paused"]:
-                        continue
-                    followup = generate_followup_with_feedback(user_response)
-                    speak_with_gif(followup, gif_placeholder, animated_gif_path, static_gif_path)
-                    st.markdown(f'<div class="card"><strong>🤖 AI:</strong> {followup}</div>', unsafe_allow_html=True)
-                    followup_response = get_speech_input()
-                    if followup_response == "" and st.session_state["paused"]:
-                        continue
-                    block = (
-                        f"Q{i + 1}: {question}\n"
-                        f"🗨 You: {user_response}\n"
-                        f"🔄 Follow-Up: {followup}\n"
-                        f"🗨 You: {followup_response}"
-                    )
-                    st.session_state["transcript"].append(block)
-                farewell = f"It was nice meeting you, {username}. Goodbye!"
-                speak_with_gif(farewell, gif_placeholder, animated_gif_path, static_gif_path)
-                st.info(f"🤖 AI : {farewell}")
-                st.session_state["interview_complete"] = True
+                # Resumes from the checkpoint; while paused it returns at once and the next click reruns it
+                asyncio.run(create_interview_session(username, track, questions, gif_placeholder).run(
+                    stop_when_paused=True))
             if st.session_state["interview_complete"]:
                 st.success("✅ Interview complete! You can now proceed to evaluation.")
+                speculation_stats = st.session_state["speculation_stats"].get_stats()
+                if speculation_stats["turns"]:
+                    st.caption(f"⚡ Speculative follow-ups: {speculation_stats['hits']}/{speculation_stats['turns']} "
+                               f"reused, {speculation_stats['latency_saved_total']:.1f} s saved")
                 if st.button("Evaluate My Performance"):
                     with st.spinner("🔍 Evaluating your responses..."):
                         evaluation_report, scores = evaluate_answers()
@@ -325,46 +450,13 @@ with st.sidebar:
                     st.write(evaluation_report)
                     st.subheader("📊 Overall Evaluation")
                     overall_score = sum(scores) / len(scores) if scores else 0
-
-
-                    def get_color(value):
-                        if value <= 5:
-                            t = value / 5
-                            r = 255
-                            g = int(0 + 255 * t)
-                            b = 0
-                        else:
-                            t = (value - 5) / 5
-                            r = int(255 - 255 * t)
-                            g = 255
-                            b = 0
-                        return f"#{r:02X}{g:02X}{b:02X}"
-
-
-                    steps = []
-                    if overall_score > 0:
-                        delta = overall_score / 50
-                        start_val = 0
-                        while start_val < overall_score:
-                            end_val = min(start_val + delta, overall_score)
-                            mid = (start_val + end_val) / 2
-                            steps.append({"range": [start_val, end_val], "color": get_color(mid)})
-                            start_val = end_val
-                    steps.append({"range": [overall_score, 10], "color": "rgba(0,0,0,0)"})
-                    gauge_fig = go.Figure(go.Indicator(
-                        mode="gauge+number",
-                        value=overall_score,
-                        gauge={
-                            "axis": {"range": [0, 10], "tickmode": "array", "tickvals": [1.5, 5.5, 8.5],
-                                     "ticktext": ["Bad", "Average", "Good"]},
-                            "bar": {"color": "rgba(0,0,0,0)"},
-                            "steps": steps,
-                            "bgcolor": "rgba(128, 128, 128, 1)",
-                            "borderwidth": 0,
-                            "bordercolor": "rgba(0,0,0,0)"
-                        }
-                    ))
-                    gauge_fig.update_layout(width=300, height=250, margin=dict(l=20, r=20, t=50, b=20))
-                    st.plotly_chart(gauge_fig, use_container_width=False)
+                    # Charts are memoized on the scores, so reruns reuse them
+                    st.plotly_chart(gauge_figure(overall_score), use_container_width=False)
                     st.subheader("📊 Interview Evaluation Scores")
-                    plot_evaluation_chart(scores)
+                    st.image(score_chart_png(tuple(scores)))
+
+    if st.session_state.get("username"):
+        with st.expander("🗂 Past Interviews", expanded=False):
+            # Newest first, one page at a time; the store never loads the full history
+            past_sessions, _ = get_session_store().list_sessions(username=st.session_state["username"], limit=10)
+            render_session_history(past_sessions)